@@ -3,57 +3,391 @@ from __future__ import annotations
 import argparse
 import csv
 import logging
+from collections.abc import Callable, Iterable
+from contextlib import ExitStack
+from dataclasses import dataclass
 from pathlib import Path
 
+from legislative_analytics.application.map_merge import run_map, run_merge
+from legislative_analytics.application.out_of_core import (
+    parse_size,
+    plan_partitions,
+    run_partitioned,
+)
+from legislative_analytics.application.preview import (
+    DEFAULT_BLOCK_SIZE,
+    PreviewSettings,
+    run_preview,
+)
+from legislative_analytics.application.profiling import ProfileSession
+from legislative_analytics.application.report_delta import with_delta
+from legislative_analytics.repositories.caching_repositories import (
+    CachingBillRepository,
+    CachingLegislatorRepository,
+    CachingVoteRepository,
+    DimensionCache,
+)
+from legislative_analytics.repositories.compressed_io import find_input, is_compressed
 from legislative_analytics.repositories.csv_repositories import (
     CsvBillRepository,
     CsvLegislatorRepository,
     CsvVoteRepository,
     CsvVoteResultRepository,
 )
-from legislative_analytics.repositories.validating_vote_results import ValidatingVoteResultRepository
-from legislative_analytics.services.analytics_service import AnalyticsService
+from legislative_analytics.repositories.lookups import bill_maps, vote_id_to_bill_id
+from legislative_analytics.repositories.partial_aggregates import PartialAggregateError
+from legislative_analytics.repositories.report_state import ReportStateWriter
+from legislative_analytics.repositories.validating_vote_results import (
+    IngestionAborted,
+    IngestionLimits,
+    ValidatingVoteResultRepository,
+)
+from legislative_analytics.repositories.validation_rules import (
+    PositiveIdsRule,
+    UniqueVoteResultIdRule,
+    VoteResultRule,
+    VoteTypeRule,
+    ordered_rules,
+)
+from legislative_analytics.repositories.vote_index import build_vote_index
+from legislative_analytics.services.analytics_service import (
+    AnalyticsService,
+    BillVoteCount,
+    LegislatorVoteCount,
+)
+from legislative_analytics.services.report_diff import bill_row_hash, legislator_row_hash
+
+
+@dataclass(frozen=True, slots=True)
+class InputFiles:
+    """Resolved input paths (plain .csv or a .gz/.bz2/.xz variant)."""
+
+    legislators: Path
+    bills: Path
+    votes: Path
+    vote_results: Path
+
+
+_INPUT_NAMES = ("legislators.csv", "bills.csv", "votes.csv", "vote_results.csv")
+# --merge-partials only reads the dimension tables needed for names.
+_MERGE_INPUT_NAMES = ("legislators.csv", "bills.csv")
+
+
+_LEGISLATOR_FIELDS = ["id", "name", "num_supported_bills", "num_opposed_bills"]
+_BILL_FIELDS = ["id", "title", "supporter_count", "opposer_count", "primary_sponsor"]
+
+
+def _legislator_record(r: LegislatorVoteCount) -> dict[str, object]:
+    return {
+        "id": r.legislator_id,
+        "name": r.legislator_name,
+        "num_supported_bills": r.supported_bills,
+        "num_opposed_bills": r.opposed_bills,
+    }
+
+
+def _bill_record(r: BillVoteCount) -> dict[str, object]:
+    return {
+        "id": r.bill_id,
+        "title": r.bill_title,
+        "primary_sponsor": r.sponsor_name,
+        "supporter_count": r.supporters,
+        "opposer_count": r.opposers,
+    }
 
 
 def _write_legislator_report(*, out_path: Path, rows) -> None:
     out_path.parent.mkdir(parents=True, exist_ok=True)
     with out_path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(
-            f,
-            fieldnames=["id", "name",
-                        "num_supported_bills", "num_opposed_bills"],
-        )
+        writer = csv.DictWriter(f, fieldnames=_LEGISLATOR_FIELDS)
         writer.writeheader()
         for r in rows:
-            writer.writerow(
-                {
-                    "id": r.legislator_id,
-                    "name": r.legislator_name,
-                    "num_supported_bills": r.supported_bills,
-                    "num_opposed_bills": r.opposed_bills,
-                }
-            )
+            writer.writerow(_legislator_record(r))
 
 
 def _write_bill_report(*, out_path: Path, rows) -> None:
     out_path.parent.mkdir(parents=True, exist_ok=True)
     with out_path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(
-            f,
-            fieldnames=["id", "title", "supporter_count",
-                        "opposer_count", "primary_sponsor"],
-        )
+        writer = csv.DictWriter(f, fieldnames=_BILL_FIELDS)
         writer.writeheader()
         for r in rows:
-            writer.writerow(
-                {
-                    "id": r.bill_id,
-                    "title": r.bill_title,
-                    "primary_sponsor": r.sponsor_name,
-                    "supporter_count": r.supporters,
-                    "opposer_count": r.opposers,
-                }
+            writer.writerow(_bill_record(r))
+
+
+def _no_checkpoint(label: str) -> None:
+    return None
+
+
+def _limits(args: argparse.Namespace) -> IngestionLimits:
+    return IngestionLimits(
+        max_rejects=args.max_rejects,
+        max_reject_ratio=args.max_reject_ratio,
+        warmup_rows=args.reject_warmup_rows,
+        max_double_votes=args.max_double_votes,
+    )
+
+
+def _run_pipeline(
+    args: argparse.Namespace,
+    inputs: InputFiles,
+    *,
+    checkpoint: Callable[[str], None] = _no_checkpoint,
+) -> None:
+    limits = _limits(args)
+    legislator_out = args.legislator_report or (
+        args.out_dir / "legislators_support_oppose.csv")
+    bill_out = args.bill_report or (args.out_dir / "bills_support_oppose.csv")
+
+    with ExitStack() as stack:
+        state = (
+            stack.enter_context(ReportStateWriter(args.diff_state))
+            if args.diff_state is not None
+            else None
+        )
+
+        def write_legislators(rows: Iterable[LegislatorVoteCount]) -> None:
+            if state is not None:
+                rows = with_delta(
+                    rows,
+                    section="legislators",
+                    previous_state=args.diff_state,
+                    state=state,
+                    delta_path=legislator_out.with_suffix(".delta.csv"),
+                    fieldnames=_LEGISLATOR_FIELDS,
+                    id_of=lambda r: r.legislator_id,
+                    row_hash=legislator_row_hash,
+                    to_record=_legislator_record,
+                )
+            _write_legislator_report(out_path=legislator_out, rows=rows)
+
+        def write_bills(rows: Iterable[BillVoteCount]) -> None:
+            if state is not None:
+                rows = with_delta(
+                    rows,
+                    section="bills",
+                    previous_state=args.diff_state,
+                    state=state,
+                    delta_path=bill_out.with_suffix(".delta.csv"),
+                    fieldnames=_BILL_FIELDS,
+                    id_of=lambda r: r.bill_id,
+                    row_hash=bill_row_hash,
+                    to_record=_bill_record,
+                )
+            _write_bill_report(out_path=bill_out, rows=rows)
+
+        _compute_and_write(
+            args,
+            inputs,
+            limits=limits,
+            write_legislators=write_legislators,
+            write_bills=write_bills,
+            checkpoint=checkpoint,
+        )
+
+
+def _build_rules(args: argparse.Namespace) -> tuple[VoteResultRule, ...]:
+    extra: list[VoteResultRule] = []
+    if args.allowed_vote_types is not None:
+        extra.append(VoteTypeRule(args.allowed_vote_types))
+    if args.require_positive_ids:
+        extra.append(PositiveIdsRule())
+    if args.reject_duplicate_ids:
+        extra.append(UniqueVoteResultIdRule())
+    return ordered_rules(extra)
+
+
+def _compute_and_write(
+    args: argparse.Namespace,
+    inputs: InputFiles,
+    *,
+    limits: IngestionLimits,
+    write_legislators: Callable[[Iterable[LegislatorVoteCount]], None],
+    write_bills: Callable[[Iterable[BillVoteCount]], None],
+    checkpoint: Callable[[str], None],
+) -> None:
+    if args.merge_partials is not None:
+        run_merge(
+            legislators_csv=inputs.legislators,
+            bills_csv=inputs.bills,
+            partials=args.merge_partials,
+            write_legislators=write_legislators,
+            write_bills=write_bills,
+        )
+        return
+
+    if args.memory_limit is not None:
+        partitions = plan_partitions(inputs.vote_results, args.memory_limit)
+        if partitions > 1:
+            run_partitioned(
+                legislators_csv=inputs.legislators,
+                bills_csv=inputs.bills,
+                votes_csv=inputs.votes,
+                vote_results_csv=inputs.vote_results,
+                partitions=partitions,
+                limits=limits,
+                rules=_build_rules(args),
+                write_legislators=write_legislators,
+                write_bills=write_bills,
+                tmp_dir=args.tmp_dir,
             )
+            return
+
+    # The validator and the service share the lookup maps: each table is parsed once.
+    cache = DimensionCache()
+    legislators_repo = CachingLegislatorRepository(
+        CsvLegislatorRepository(inputs.legislators), cache
+    )
+    bills_repo = CachingBillRepository(CsvBillRepository(inputs.bills), cache)
+    votes_repo = CachingVoteRepository(CsvVoteRepository(inputs.votes), cache)
+    raw_vote_results_repo = CsvVoteResultRepository(inputs.vote_results)
+
+    validating_vote_results_repo = ValidatingVoteResultRepository(
+        inner=raw_vote_results_repo,
+        legislators=legislators_repo,
+        votes=votes_repo,
+        limits=limits,
+        rules=_build_rules(args),
+        dead_letter=args.dead_letter,
+    )
+
+    service = AnalyticsService(
+        legislators=legislators_repo,
+        bills=bills_repo,
+        votes=votes_repo,
+        vote_results=validating_vote_results_repo,
+    )
+
+    if args.top is not None:
+        legislator_rows, bill_rows = service.compute_top_reports(
+            args.top, by=args.rank_by or "support"
+        )
+    else:
+        legislator_rows, bill_rows = service.compute_support_oppose_reports()
+
+    checkpoint("after-aggregation")
+
+    write_legislators(legislator_rows)
+    write_bills(bill_rows)
+
+
+def _build_index(args: argparse.Namespace, inputs: InputFiles) -> None:
+    """Index the validated vote_results (same rules/limits as a report run); no reports."""
+    cache = DimensionCache()
+    legislators_repo = CachingLegislatorRepository(
+        CsvLegislatorRepository(inputs.legislators), cache
+    )
+    votes_repo = CachingVoteRepository(CsvVoteRepository(inputs.votes), cache)
+    bill_title_by_id, _ = bill_maps(CachingBillRepository(CsvBillRepository(inputs.bills), cache))
+    vote_results = ValidatingVoteResultRepository(
+        inner=CsvVoteResultRepository(inputs.vote_results),
+        legislators=legislators_repo,
+        votes=votes_repo,
+        limits=_limits(args),
+        rules=_build_rules(args),
+        dead_letter=args.dead_letter,
+    )
+    build_vote_index(
+        args.build_index,
+        vote_results=vote_results.iter_vote_results(),
+        vote_to_bill=vote_id_to_bill_id(votes_repo),
+        bill_ids=bill_title_by_id.keys(),
+        source=inputs.vote_results,
+    )
+
+
+def _run_map(args: argparse.Namespace, inputs: InputFiles) -> None:
+    start, end = args.byte_range or (0, None)
+    run_map(
+        legislators_csv=inputs.legislators,
+        votes_csv=inputs.votes,
+        vote_results_csv=inputs.vote_results,
+        out_path=args.map_partial,
+        shard=args.shard_index,
+        start=start,
+        end=end,
+        limits=_limits(args),
+        rules=_build_rules(args),
+    )
+
+
+def _run_preview(args: argparse.Namespace, inputs: InputFiles) -> None:
+    legislator_out = args.legislator_report or (args.out_dir / "legislators_support_oppose.csv")
+    bill_out = args.bill_report or (args.out_dir / "bills_support_oppose.csv")
+    run_preview(
+        legislators_csv=inputs.legislators,
+        bills_csv=inputs.bills,
+        votes_csv=inputs.votes,
+        vote_results_csv=inputs.vote_results,
+        settings=PreviewSettings(
+            fraction=args.preview,
+            block_size=args.preview_block_size,
+            seed=args.preview_seed,
+            confidence=args.preview_confidence,
+        ),
+        legislator_out=legislator_out.with_suffix(".preview.csv"),
+        bill_out=bill_out.with_suffix(".preview.csv"),
+        summary_out=args.out_dir / "preview_summary.csv",
+        rules=_build_rules(args),
+    )
+
+
+def _int_list_arg(value: str) -> list[int]:
+    try:
+        return [int(v) for v in value.split(",") if v.strip()]
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"expected comma-separated integers: {value!r}") from exc
+
+
+def _non_negative_int_arg(value: str) -> int:
+    try:
+        n = int(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"expected an integer: {value!r}") from exc
+    if n < 0:
+        raise argparse.ArgumentTypeError(f"must be >= 0: {value!r}")
+    return n
+
+
+def _positive_int_arg(value: str) -> int:
+    n = _non_negative_int_arg(value)
+    if n == 0:
+        raise argparse.ArgumentTypeError(f"must be >= 1: {value!r}")
+    return n
+
+
+def _ratio_arg(value: str) -> float:
+    try:
+        ratio = float(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"expected a number: {value!r}") from exc
+    if not 0 <= ratio <= 1:
+        raise argparse.ArgumentTypeError(f"must be between 0 and 1: {value!r}")
+    return ratio
+
+
+def _size_arg(value: str) -> int:
+    try:
+        size = parse_size(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from exc
+    if size <= 0:
+        raise argparse.ArgumentTypeError(f"size must be positive: {value!r}")
+    return size
+
+
+def _byte_range_arg(value: str) -> tuple[int, int | None]:
+    """"START:END" (sizes like 64M allowed); an empty END means end of file."""
+    start_s, sep, end_s = value.partition(":")
+    try:
+        if not sep:
+            raise ValueError(value)
+        start = parse_size(start_s) if start_s.strip() else 0
+        end = parse_size(end_s) if end_s.strip() else None
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"expected START:END byte offsets: {value!r}") from exc
+    if start < 0 or (end is not None and end <= start):
+        raise argparse.ArgumentTypeError(f"empty or negative byte range: {value!r}")
+    return start, end
 
 
 def build_arg_parser() -> argparse.ArgumentParser:
@@ -63,7 +397,10 @@ def build_arg_parser() -> argparse.ArgumentParser:
         "--data-dir",
         type=Path,
         default=Path("data"),
-        help="Directory containing legislators.csv, bills.csv, votes.csv, vote_results.csv",
+        help=(
+            "Directory containing legislators.csv, bills.csv, votes.csv, vote_results.csv "
+            "(each may also be .csv.gz, .csv.bz2 or .csv.xz)"
+        ),
     )
     p.add_argument(
         "--out-dir",
@@ -83,6 +420,203 @@ def build_arg_parser() -> argparse.ArgumentParser:
         default=None,
         help="Override path for bill report CSV",
     )
+    p.add_argument(
+        "--top",
+        type=int,
+        default=None,
+        metavar="K",
+        help=(
+            "Only write the K highest-ranked rows of each report "
+            "(default: every row, ordered by id)"
+        ),
+    )
+    p.add_argument(
+        "--rank-by",
+        choices=["support", "oppose"],
+        default=None,
+        help="Counter used by --top to rank legislators and bills. Default: support",
+    )
+    p.add_argument(
+        "--max-rejects",
+        type=_non_negative_int_arg,
+        default=None,
+        help="Abort ingestion once more than N vote_results rows were rejected",
+    )
+    p.add_argument(
+        "--max-reject-ratio",
+        type=_ratio_arg,
+        default=None,
+        metavar="R",
+        help="Abort ingestion once the rejected/processed ratio exceeds R (0..1), after warm-up",
+    )
+    p.add_argument(
+        "--reject-warmup-rows",
+        type=_non_negative_int_arg,
+        default=1000,
+        help="Rows to process before --max-reject-ratio is enforced. Default: 1000",
+    )
+    p.add_argument(
+        "--max-double-votes",
+        type=_non_negative_int_arg,
+        default=None,
+        help="Abort ingestion once more than N double votes were rejected",
+    )
+    p.add_argument(
+        "--reject-duplicate-ids",
+        action="store_true",
+        help="Reject vote_results rows whose id was already seen",
+    )
+    p.add_argument(
+        "--allowed-vote-types",
+        type=_int_list_arg,
+        default=None,
+        metavar="N,N,...",
+        help="Reject vote_results rows whose vote_type is not listed (e.g. 0,1,2)",
+    )
+    p.add_argument(
+        "--require-positive-ids",
+        action="store_true",
+        help="Reject vote_results rows with a non-positive id, legislator_id or vote_id",
+    )
+    p.add_argument(
+        "--dead-letter",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help="Write every rejected vote_results row (and the rule that rejected it) to this CSV",
+    )
+    p.add_argument(
+        "--memory-limit",
+        type=_size_arg,
+        default=None,
+        metavar="SIZE",
+        help=(
+            "Memory budget for aggregation state (e.g. 512M, 2G). When the input would exceed it, "
+            "vote_results are hash-partitioned by bill_id into temporary files and merged"
+        ),
+    )
+    p.add_argument(
+        "--tmp-dir",
+        type=Path,
+        default=None,
+        help="Directory for --memory-limit partition files. Default: system temp dir",
+    )
+    p.add_argument(
+        "--diff-state",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help=(
+            "Binary snapshot of the previous run. Compares the new reports against it, writes "
+            "*.delta.csv files with only added/removed/changed rows, then updates the snapshot"
+        ),
+    )
+    p.add_argument(
+        "--build-index",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help=(
+            "Instead of writing reports, write an mmap-able inverted index of the validated "
+            "vote_results (grouped by legislator_id and by bill_id) to PATH"
+        ),
+    )
+    p.add_argument(
+        "--map-partial",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help=(
+            "Map step of a multi-node run: validate this node's shard of vote_results "
+            "(--byte-range, or the whole file) and write a partial aggregate to PATH instead "
+            "of reports"
+        ),
+    )
+    p.add_argument(
+        "--byte-range",
+        type=_byte_range_arg,
+        default=None,
+        metavar="START:END",
+        help=(
+            "Byte range of vote_results.csv for --map-partial; lines are owned by the range "
+            "holding their first byte"
+        ),
+    )
+    p.add_argument(
+        "--shard-index",
+        type=int,
+        default=0,
+        help=(
+            "Position of this vote_results shard file among all shards (file order), for "
+            "--map-partial. Leave at 0 when splitting one file with --byte-range. Default: 0"
+        ),
+    )
+    p.add_argument(
+        "--merge-partials",
+        type=Path,
+        nargs="+",
+        default=None,
+        metavar="PATH",
+        help=(
+            "Merge step: combine partial aggregates (resolving double votes across shards) and "
+            "write the reports. Only legislators.csv and bills.csv are read from --data-dir"
+        ),
+    )
+    p.add_argument(
+        "--preview",
+        type=float,
+        default=None,
+        metavar="FRACTION",
+        help=(
+            "Approximate preview: read a random FRACTION (0-1] of fixed-size byte blocks of "
+            "vote_results.csv and write *.preview.csv reports with estimated counts, confidence "
+            "intervals and preview_summary.csv (estimated rejection rate)"
+        ),
+    )
+    p.add_argument(
+        "--preview-block-size",
+        type=_size_arg,
+        default=DEFAULT_BLOCK_SIZE,
+        metavar="SIZE",
+        help="Byte size of the blocks sampled by --preview. Default: 1M",
+    )
+    p.add_argument(
+        "--preview-seed",
+        type=int,
+        default=None,
+        help="Random seed for --preview block selection (default: a different sample each run)",
+    )
+    p.add_argument(
+        "--preview-confidence",
+        type=float,
+        default=0.95,
+        help="Confidence level of the --preview intervals. Default: 0.95",
+    )
+    p.add_argument(
+        "--profile",
+        action="store_true",
+        help=(
+            "Profile the run (cProfile + stack sampling) and write run.pstats, run.collapsed "
+            "and stages.txt to --profile-dir"
+        ),
+    )
+    p.add_argument(
+        "--profile-alloc-depth",
+        type=_positive_int_arg,
+        default=None,
+        metavar="N",
+        help=(
+            "With --profile, also trace allocations (tracemalloc, N frames per allocation) "
+            "and write allocations.txt plus per-stage memory. Slow: several times the "
+            "plain run time, more with larger N"
+        ),
+    )
+    p.add_argument(
+        "--profile-dir",
+        type=Path,
+        default=None,
+        help="Directory for --profile outputs. Default: <out-dir>/profile",
+    )
     p.add_argument(
         "--log-level",
         type=str,
@@ -105,43 +639,112 @@ def main(argv: list[str] | None = None) -> int:
     if not args.data_dir.is_dir():
         raise SystemExit(f"Data directory is not a directory: {args.data_dir}")
 
-    legislators_csv = args.data_dir / "legislators.csv"
-    bills_csv = args.data_dir / "bills.csv"
-    votes_csv = args.data_dir / "votes.csv"
-    vote_results_csv = args.data_dir / "vote_results.csv"
-
-    missing = [p for p in (legislators_csv, bills_csv,
-                           votes_csv, vote_results_csv) if not p.exists()]
+    required = _MERGE_INPUT_NAMES if args.merge_partials is not None else _INPUT_NAMES
+    resolved = {name: find_input(args.data_dir, name) for name in _INPUT_NAMES}
+    missing = [args.data_dir / name for name in required if resolved[name] is None]
     if missing:
         missing_str = ", ".join(str(p) for p in missing)
         raise SystemExit(f"Missing required input file(s): {missing_str}")
+    # Inputs the mode does not read may be absent; they are never opened.
+    inputs = InputFiles(*(resolved[name] or args.data_dir / name for name in _INPUT_NAMES))
 
-    legislators_repo = CsvLegislatorRepository(legislators_csv)
-    bills_repo = CsvBillRepository(bills_csv)
-    votes_repo = CsvVoteRepository(votes_csv)
-    raw_vote_results_repo = CsvVoteResultRepository(vote_results_csv)
+    if args.top is not None and args.top <= 0:
+        raise SystemExit(f"--top must be a positive integer: {args.top}")
+    if args.rank_by is not None and args.top is None:
+        raise SystemExit("--rank-by requires --top")
+    if args.profile_alloc_depth is not None and not args.profile:
+        raise SystemExit("--profile-alloc-depth requires --profile")
+    if args.top is not None and args.memory_limit is not None:
+        raise SystemExit("--top cannot be combined with --memory-limit")
+    if args.dead_letter is not None and args.memory_limit is not None:
+        raise SystemExit("--dead-letter cannot be combined with --memory-limit")
+    if args.reject_duplicate_ids and args.memory_limit is not None:
+        # Partitions are validated independently; ids repeated across partitions would pass.
+        raise SystemExit("--reject-duplicate-ids cannot be combined with --memory-limit")
+    if args.top is not None and args.diff_state is not None:
+        raise SystemExit(
+            "--top cannot be combined with --diff-state (diffs need id-ordered reports)"
+        )
 
-    validating_vote_results_repo = ValidatingVoteResultRepository(
-        inner=raw_vote_results_repo,
-        legislators=legislators_repo,
-        votes=votes_repo,
-    )
+    if args.build_index is not None and (
+        args.top is not None
+        or args.memory_limit is not None
+        or args.diff_state is not None
+        or args.profile
+    ):
+        raise SystemExit(
+            "--build-index cannot be combined with --top, --memory-limit, --diff-state "
+            "or --profile"
+        )
 
-    service = AnalyticsService(
-        legislators=legislators_repo,
-        bills=bills_repo,
-        votes=votes_repo,
-        vote_results=validating_vote_results_repo,
-    )
+    if args.map_partial is not None:
+        if any(
+            v is not None
+            for v in (args.top, args.memory_limit, args.diff_state, args.build_index,
+                      args.preview, args.dead_letter, args.merge_partials)
+        ) or args.profile:
+            raise SystemExit(
+                "--map-partial cannot be combined with --top, --memory-limit, --diff-state, "
+                "--build-index, --preview, --dead-letter, --merge-partials or --profile"
+            )
+        if args.reject_duplicate_ids:
+            raise SystemExit(
+                "--reject-duplicate-ids cannot be checked across shards (--map-partial)"
+            )
+        if args.byte_range is not None and is_compressed(inputs.vote_results):
+            raise SystemExit("--byte-range needs a seekable, uncompressed vote_results.csv")
+    elif args.byte_range is not None:
+        raise SystemExit("--byte-range requires --map-partial")
+    if args.merge_partials is not None:
+        absent = [str(p) for p in args.merge_partials if not p.is_file()]
+        if absent:
+            raise SystemExit(f"Partial aggregate file(s) not found: {', '.join(absent)}")
+    if args.merge_partials is not None and any(
+        v is not None for v in (args.top, args.memory_limit, args.build_index, args.preview)
+    ):
+        raise SystemExit(
+            "--merge-partials cannot be combined with --top, --memory-limit, --build-index "
+            "or --preview"
+        )
 
-    legislator_out = args.legislator_report or (
-        args.out_dir / "legislators_support_oppose.csv")
-    bill_out = args.bill_report or (args.out_dir / "bills_support_oppose.csv")
+    if args.preview is not None:
+        if not 0 < args.preview <= 1:
+            raise SystemExit(f"--preview must be in (0, 1]: {args.preview}")
+        if not 0 < args.preview_confidence < 1:
+            raise SystemExit(f"--preview-confidence must be in (0, 1): {args.preview_confidence}")
+        if is_compressed(inputs.vote_results):
+            raise SystemExit("--preview needs a seekable, uncompressed vote_results.csv")
+        if any(
+            v is not None
+            for v in (
+                args.top, args.memory_limit, args.diff_state, args.build_index, args.dead_letter
+            )
+        ) or args.profile:
+            raise SystemExit(
+                "--preview cannot be combined with --top, --memory-limit, --diff-state, "
+                "--build-index, --dead-letter or --profile"
+            )
 
-    _write_legislator_report(out_path=legislator_out,
-                             rows=service.compute_legislator_support_oppose())
-    _write_bill_report(out_path=bill_out,
-                       rows=service.compute_bill_support_oppose())
+    try:
+        if args.build_index is not None:
+            _build_index(args, inputs)
+        elif args.map_partial is not None:
+            _run_map(args, inputs)
+        elif args.preview is not None:
+            _run_preview(args, inputs)
+        elif args.profile:
+            with ProfileSession(
+                args.profile_dir or (args.out_dir / "profile"),
+                traceback_depth=args.profile_alloc_depth,
+            ) as session:
+                _run_pipeline(args, inputs, checkpoint=session.checkpoint)
+        else:
+            _run_pipeline(args, inputs)
+    except IngestionAborted as exc:
+        # No reports are written: partial counts would look like valid output.
+        raise SystemExit(f"Ingestion aborted: {exc}") from exc
+    except PartialAggregateError as exc:
+        raise SystemExit(f"Cannot merge partials: {exc}") from exc
 
     return 0
 
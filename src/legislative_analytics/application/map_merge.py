@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from pathlib import Path
+
+from legislative_analytics.domain.entities import OPPOSE, SUPPORT, VoteResult
+from legislative_analytics.repositories.compressed_io import is_compressed
+from legislative_analytics.repositories.csv_repositories import (
+    CsvBillRepository,
+    CsvLegislatorRepository,
+    CsvVoteRepository,
+    CsvVoteResultRepository,
+)
+from legislative_analytics.repositories.lookups import (
+    bill_maps,
+    legislator_name_by_id,
+    vote_id_to_bill_id,
+)
+from legislative_analytics.repositories.partial_aggregates import (
+    PairVote,
+    PartialAggregateError,
+    PartialAggregateReader,
+    PartialMeta,
+    write_partial,
+)
+from legislative_analytics.repositories.sampled_vote_results import iter_positioned_vote_results
+from legislative_analytics.repositories.validating_vote_results import (
+    IngestionLimits,
+    TaggedVoteResults,
+    ValidatingVoteResultRepository,
+)
+from legislative_analytics.repositories.validation_rules import (
+    NoDoubleVoteRule,
+    UniqueVoteResultIdRule,
+    VoteResultRule,
+    default_rules,
+)
+from legislative_analytics.services.analytics_service import (
+    BillVoteCount,
+    LegislatorVoteCount,
+    sponsor_name,
+)
+
+# Multi-node map/merge.
+#
+# map:   one process per shard (a byte range of vote_results.csv, or a whole shard
+#        file) validates its rows and writes a partial aggregate: support/oppose
+#        counters per legislator and per bill, plus the first accepted vote of every
+#        (legislator, bill) pair with its position (shard, byte offset).
+# merge: sums the counters and k-way merges the sorted pair lists. When a pair was
+#        accepted by several shards, the earliest position wins (the vote the
+#        single-process run keeps) and the later ones are subtracted as double votes.
+
+logger = logging.getLogger("legislative_analytics.map_merge")
+
+
+def _bump(counters: dict[int, list[int]], key: int, vote_type: int) -> None:
+    counts = counters.get(key)
+    if counts is None:
+        counts = counters[key] = [0, 0]
+    if vote_type == SUPPORT:
+        counts[0] += 1
+    elif vote_type == OPPOSE:
+        counts[1] += 1
+
+
+def _sorted_counters(counters: dict[int, list[int]]) -> Iterator[tuple[int, int, int]]:
+    return ((key, s, o) for key, (s, o) in sorted(counters.items()))
+
+
+def run_map(
+    *,
+    legislators_csv: Path,
+    votes_csv: Path,
+    vote_results_csv: Path,
+    out_path: Path,
+    shard: int = 0,
+    start: int = 0,
+    end: int | None = None,
+    limits: IngestionLimits | None = None,
+    rules: tuple[VoteResultRule, ...] | None = None,
+) -> PartialMeta:
+    """
+    Validate the rows of `vote_results_csv` starting in [start, end) and write their
+    partial aggregate to `out_path`. Rows are positioned by byte offset (by row number
+    for a whole compressed shard, which cannot be split).
+    """
+    limits = limits or IngestionLimits()
+    rules = rules or default_rules()
+    if any(isinstance(r, UniqueVoteResultIdRule) for r in rules):
+        raise ValueError("Duplicate vote_result ids cannot be detected across shards")
+    if not any(isinstance(r, NoDoubleVoteRule) for r in rules):
+        raise ValueError("map needs the double-vote rule to build its pair list")
+
+    rows: Iterable[tuple[int, VoteResult]]
+    size: int | None = None
+    if is_compressed(vote_results_csv):
+        if start != 0 or end is not None:
+            raise ValueError(f"Byte ranges need a seekable, uncompressed file: {vote_results_csv}")
+        rows = enumerate(CsvVoteResultRepository(vote_results_csv).iter_vote_results())
+    else:
+        size = vote_results_csv.stat().st_size
+        rows = iter_positioned_vote_results(vote_results_csv, start, end)
+
+    votes = CsvVoteRepository(votes_csv)
+    positioned = TaggedVoteResults(rows)
+    validated = ValidatingVoteResultRepository(
+        inner=positioned,
+        legislators=CsvLegislatorRepository(legislators_csv),
+        votes=votes,
+        limits=limits,
+        rules=rules,
+    )
+    vote_to_bill = vote_id_to_bill_id(votes)
+
+    legislator_counts: dict[int, list[int]] = {}
+    bill_counts: dict[int, list[int]] = {}
+    pairs: list[PairVote] = []
+    for vr in validated.iter_vote_results():
+        # Accepted rows always have a known vote (KnownVoteRule runs first).
+        bill_id = vote_to_bill[vr.vote_id]
+        _bump(legislator_counts, vr.legislator_id, vr.vote_type)
+        _bump(bill_counts, bill_id, vr.vote_type)
+        pairs.append((vr.legislator_id, bill_id, shard, positioned.tag_of(vr), vr.vote_type))
+    pairs.sort()
+
+    meta = PartialMeta(
+        shard=shard,
+        start=start,
+        end=end,
+        processed=positioned.processed,
+        accepted=len(pairs),
+        rejected=positioned.processed - len(pairs),
+        size=size,
+    )
+    write_partial(
+        out_path,
+        meta=meta,
+        legislators=_sorted_counters(legislator_counts),
+        bills=_sorted_counters(bill_counts),
+        pairs=pairs,
+    )
+    logger.info(
+        "map.written",
+        extra={"path": str(out_path), "shard": shard, "start": start, "end": end,
+               "processed": meta.processed, "accepted": meta.accepted},
+    )
+    return meta
+
+
+def _check_coverage(readers: Sequence[PartialAggregateReader]) -> None:
+    """
+    The byte ranges of each shard must tile [0, size) of its vote_results.csv: an
+    overlap would count rows twice and a gap (a missing partial) would drop them.
+    """
+    by_shard = sorted(readers, key=lambda r: (r.meta.shard, r.meta.start))
+    for shard, group in itertools.groupby(by_shard, key=lambda r: r.meta.shard):
+        parts = list(group)
+        sizes = {r.meta.size for r in parts}
+        if len(sizes) > 1:
+            raise PartialAggregateError(
+                f"Partials of shard {shard} were mapped from files of different sizes: "
+                + ", ".join(str(r.path) for r in parts)
+            )
+        (size,) = sizes
+        covered: int | None = 0  # None once a range ran to EOF
+        for previous, r in zip([None, *parts], parts, strict=False):
+            if covered is None or r.meta.start < covered:
+                raise PartialAggregateError(
+                    f"Partials overlap (shard {shard}): "
+                    f"{previous.path if previous else ''} and {r.path}"
+                )
+            if r.meta.start > covered:
+                raise PartialAggregateError(
+                    f"Missing partial for bytes [{covered}, {r.meta.start}) of shard {shard}"
+                )
+            covered = r.meta.end
+        if covered is not None and (size is None or covered < size):
+            end = "EOF" if size is None else size
+            raise PartialAggregateError(
+                f"Missing partial for bytes [{covered}, {end}) of shard {shard}"
+            )
+
+
+def _sum_counters(streams: Iterable[Iterator[tuple[int, ...]]]) -> dict[int, list[int]]:
+    totals: dict[int, list[int]] = {}
+    for stream in streams:
+        for key, s, o in stream:
+            counts = totals.get(key)
+            if counts is None:
+                totals[key] = [s, o]
+            else:
+                counts[0] += s
+                counts[1] += o
+    return totals
+
+
+def _unbump(counters: dict[int, list[int]], key: int, vote_type: int) -> None:
+    if vote_type == SUPPORT:
+        counters[key][0] -= 1
+    elif vote_type == OPPOSE:
+        counters[key][1] -= 1
+
+
+def run_merge(
+    *,
+    legislators_csv: Path,
+    bills_csv: Path,
+    partials: Sequence[Path],
+    write_legislators: Callable[[Iterable[LegislatorVoteCount]], None],
+    write_bills: Callable[[Iterable[BillVoteCount]], None],
+) -> int:
+    """
+    Combine partial aggregates into the two final reports. Returns the number of
+    double votes found across shards (already removed from the counts).
+    """
+    readers = [PartialAggregateReader(p) for p in partials]
+    _check_coverage(readers)
+
+    legislator_counts = _sum_counters(r.iter_legislators() for r in readers)
+    bill_counts = _sum_counters(r.iter_bills() for r in readers)
+
+    cross_shard = 0
+    merged = heapq.merge(*(r.iter_pairs() for r in readers))
+    for _, group in itertools.groupby(merged, key=lambda p: (p[0], p[1])):
+        next(group)  # earliest vote of the pair: kept
+        # Resumes the same group iterator (it is not consumed twice) to visit the repeats.
+        for legislator_id, bill_id, _shard, _offset, vote_type in group:  # noqa: B031
+            cross_shard += 1
+            _unbump(legislator_counts, legislator_id, vote_type)
+            _unbump(bill_counts, bill_id, vote_type)
+
+    names = legislator_name_by_id(CsvLegislatorRepository(legislators_csv))
+    titles, sponsors = bill_maps(CsvBillRepository(bills_csv))
+    zero = [0, 0]
+
+    def legislator_rows() -> Iterator[LegislatorVoteCount]:
+        for leg_id in sorted(names):
+            support, oppose = legislator_counts.get(leg_id, zero)
+            yield LegislatorVoteCount(
+                legislator_id=leg_id,
+                legislator_name=names[leg_id],
+                supported_bills=support,
+                opposed_bills=oppose,
+            )
+
+    def bill_rows() -> Iterator[BillVoteCount]:
+        for bill_id in sorted(titles):
+            support, oppose = bill_counts.get(bill_id, zero)
+            yield BillVoteCount(
+                bill_id=bill_id,
+                bill_title=titles[bill_id],
+                sponsor_name=sponsor_name(bill_id, sponsors, names),
+                supporters=support,
+                opposers=oppose,
+            )
+
+    write_legislators(legislator_rows())
+    write_bills(bill_rows())
+    logger.info(
+        "merge.exit",
+        extra={
+            "partials": len(readers),
+            "processed": sum(r.meta.processed for r in readers),
+            "rejected": sum(r.meta.rejected for r in readers) + cross_shard,
+            "cross_shard_double_votes": cross_shard,
+        },
+    )
+    return cross_shard
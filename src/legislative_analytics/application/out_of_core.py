@@ -0,0 +1,478 @@
+from __future__ import annotations
+
+import csv
+import heapq
+import itertools
+import logging
+import math
+import re
+import tempfile
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from contextlib import ExitStack
+from pathlib import Path
+
+from legislative_analytics.domain.entities import Vote
+from legislative_analytics.repositories.caching_repositories import (
+    CachingLegislatorRepository,
+    DimensionCache,
+)
+from legislative_analytics.repositories.compressed_io import is_compressed, open_csv
+from legislative_analytics.repositories.csv_repositories import (
+    CsvBillRepository,
+    CsvLegislatorRepository,
+    CsvVoteRepository,
+    CsvVoteResultRepository,
+    parse_vote_result,
+)
+from legislative_analytics.repositories.interfaces import ILegislatorRepository, IVoteRepository
+from legislative_analytics.repositories.sorted_runs import reduce_runs
+from legislative_analytics.repositories.validating_vote_results import (
+    IngestionLimits,
+    IngestionTotals,
+    TaggedVoteResults,
+    ValidatingVoteResultRepository,
+)
+from legislative_analytics.repositories.validation_rules import (
+    KnownVoteRule,
+    NoDoubleVoteRule,
+    UniqueVoteResultIdRule,
+    VoteResultRule,
+    default_rules,
+)
+from legislative_analytics.services.analytics_service import (
+    AnalyticsService,
+    BillVoteCount,
+    LegislatorVoteCount,
+)
+
+logger = logging.getLogger("legislative_analytics.out_of_core")
+
+# Rough in-memory cost of the per-row state (double-vote set entry + dict slots)
+# relative to the row's size in vote_results.csv. Deliberately pessimistic.
+STATE_BYTES_PER_INPUT_BYTE = 8
+# Typical size ratio of plain to compressed vote_results (numeric CSVs compress well).
+COMPRESSED_EXPANSION = 5
+# Upper bound on partition/run files open at once (scatter fan-out, merge fan-in);
+# wider scatters and merges take extra passes instead. Well under `ulimit -n`.
+MAX_OPEN_FILES = 64
+
+_VOTE_FIELDS = ["id", "bill_id"]
+_VOTE_RESULT_FIELDS = ["id", "legislator_id", "vote_id", "vote_type"]
+# Input row number: the double-vote rule keeps the *first* vote in file order,
+# and the join step interleaves rows, so each bill partition is re-sorted by it.
+_SEQ = "_seq"
+_BILL_FIELDS = ["id", "title", "sponsor_id"]
+_LEGISLATOR_RUN_FIELDS = ["id", "supported", "opposed"]
+_BILL_RUN_FIELDS = ["id", "title", "sponsor_name", "supporters", "opposers"]
+
+_SIZE_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([kmgt]?)i?b?\s*$", re.IGNORECASE)
+_SIZE_UNITS = {"": 1, "k": 1024, "m": 1024**2, "g": 1024**3, "t": 1024**4}
+
+
+def parse_size(value: str) -> int:
+    """'512M', '2g', '1.5GiB', '1048576' -> bytes."""
+    m = _SIZE_RE.match(value)
+    if m is None:
+        raise ValueError(f"Invalid size: {value!r}")
+    return int(float(m.group(1)) * _SIZE_UNITS[m.group(2).lower()])
+
+
+def plan_partitions(vote_results_csv: Path, memory_limit: int) -> int:
+    """
+    Number of bill_id partitions needed to keep per-partition state under `memory_limit`.
+    Not capped: scatter and merge keep at most `MAX_OPEN_FILES` files open at any count.
+    """
+    estimate = vote_results_csv.stat().st_size * STATE_BYTES_PER_INPUT_BYTE
+    if is_compressed(vote_results_csv):
+        estimate *= COMPRESSED_EXPANSION
+    return max(1, math.ceil(estimate / memory_limit))
+
+
+def _scatter(
+    rows: Iterable[dict[str, str]],
+    *,
+    paths: list[Path],
+    fieldnames: list[str],
+    key: str,
+) -> None:
+    """Append every row to `paths[int(row[key]) % len(paths)]`."""
+    partitions = len(paths)
+    _scatter_bounded(
+        rows,
+        paths=paths,
+        fieldnames=fieldnames,
+        key=key,
+        index=lambda row: int(row[key]) % partitions,
+        depth=0,
+    )
+
+
+def _scatter_bounded(
+    rows: Iterable[dict[str, str]],
+    *,
+    paths: list[Path],
+    fieldnames: list[str],
+    key: str,
+    index: Callable[[dict[str, str]], int],
+    depth: int,
+) -> None:
+    """
+    With more than `MAX_OPEN_FILES` targets, rows are first spilled to one file per
+    group of consecutive targets, then each spill file is scattered over its group.
+    """
+    if len(paths) <= MAX_OPEN_FILES:
+        with ExitStack() as stack:
+            writers = []
+            for p in paths:
+                f = stack.enter_context(p.open("a", newline="", encoding="utf-8"))
+                w = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
+                if f.tell() == 0:
+                    w.writeheader()
+                writers.append(w)
+            for row in rows:
+                writers[index(row)].writerow(row)
+        return
+
+    span = math.ceil(len(paths) / MAX_OPEN_FILES)
+    groups = [paths[i : i + span] for i in range(0, len(paths), span)]
+    spills = [group[0].with_name(f"{group[0].name}.spill{depth}") for group in groups]
+    _scatter_bounded(
+        rows,
+        paths=spills,
+        # The routing key must survive the spill even when it is not an output column.
+        fieldnames=fieldnames if key in fieldnames else [*fieldnames, key],
+        key=key,
+        index=lambda row: index(row) // span,
+        depth=depth + 1,
+    )
+    for j, (group, spill) in enumerate(zip(groups, spills, strict=True)):
+        _scatter_bounded(
+            _read_csv(spill),
+            paths=group,
+            fieldnames=fieldnames,
+            key=key,
+            index=_offset(index, -j * span),
+            depth=depth + 1,
+        )
+        spill.unlink()
+
+
+def _offset(
+    index: Callable[[dict[str, str]], int], delta: int
+) -> Callable[[dict[str, str]], int]:
+    return lambda row: index(row) + delta
+
+
+def _read_csv(path: Path) -> Iterator[dict[str, str]]:
+    with open_csv(path) as f:
+        yield from csv.DictReader(f)
+
+
+def _numbered(rows: Iterable[dict[str, str]]) -> Iterator[dict[str, str]]:
+    for seq, row in enumerate(rows):
+        row[_SEQ] = str(seq)
+        yield row
+
+
+def _restore_input_order(path: Path) -> None:
+    """Sort one bill partition back into input order (bounded by the partition size)."""
+    rows = sorted(_read_csv(path), key=lambda r: int(r[_SEQ]))
+    with path.open("w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=_VOTE_RESULT_FIELDS, extrasaction="ignore")
+        w.writeheader()
+        w.writerows(rows)
+
+
+def _route_by_bill(
+    rows: Iterable[dict[str, str]], vote_to_bill: Mapping[int, int]
+) -> Iterator[dict[str, str]]:
+    for row in rows:
+        bill_id = vote_to_bill.get(int(row["vote_id"]))
+        row["_route"] = str(bill_id if bill_id is not None else int(row["vote_id"]))
+        yield row
+
+
+class _NoVotes(IVoteRepository):
+    """The scatter-time validator runs no rule that needs the `vote_id -> bill_id` map."""
+
+    def iter_votes(self) -> Iterable[Vote]:
+        return ()
+
+
+def _split_rules(
+    rules: Sequence[VoteResultRule],
+) -> tuple[tuple[VoteResultRule, ...], tuple[VoteResultRule, ...]]:
+    """
+    (scatter rules, partition rules). The per-row rules ahead of the first dedupe rule run
+    while vote_results are scattered, except `KnownVoteRule`: it needs the votes table, so
+    it stays with the dedupe rules in the bill partitions (unknown vote_ids still reach
+    one). A row failing both it and a scatter rule is therefore named by the latter.
+    """
+    dedupe = next(
+        (
+            i
+            for i, rule in enumerate(rules)
+            if isinstance(rule, (NoDoubleVoteRule, UniqueVoteResultIdRule))
+        ),
+        len(rules),
+    )
+    per_row = rules[:dedupe]
+    scatter = tuple(r for r in per_row if not isinstance(r, KnownVoteRule))
+    known_votes = tuple(r for r in per_row if isinstance(r, KnownVoteRule))
+    return scatter, (*known_votes, *rules[dedupe:])
+
+
+def _validated_rows(
+    rows: Iterable[dict[str, str]],
+    *,
+    legislators: ILegislatorRepository,
+    rules: tuple[VoteResultRule, ...],
+    limits: IngestionLimits,
+    totals: IngestionTotals,
+) -> Iterator[dict[str, str]]:
+    """Rows accepted by the regular validator (so the circuit breakers trip mid-scatter)."""
+    tagged = TaggedVoteResults((row, parse_vote_result(row)) for row in rows)
+    validated = ValidatingVoteResultRepository(
+        inner=tagged,
+        legislators=legislators,
+        votes=_NoVotes(),
+        limits=limits,
+        rules=rules,
+        shared_totals=totals,
+    )
+    for vr in validated.iter_vote_results():
+        yield tagged.tag_of(vr)
+
+
+def _partition_inputs(
+    *,
+    bills_csv: Path,
+    votes_csv: Path,
+    vote_results: Iterable[dict[str, str]],
+    work: Path,
+    partitions: int,
+) -> None:
+    """
+    Two-level grace hash partitioning, so no step needs the full `vote_id -> bill_id` map:
+    1. votes and vote_results are scattered by vote_id (join partitions)
+    2. each join partition resolves bill_id with its own slice of votes and re-scatters
+       votes + vote_results by bill_id (bill partitions); bills go straight to bill partitions.
+    Rows whose vote_id is unknown are routed by vote_id so the validator still rejects them.
+    vote_results go first: they are validated while scattered, and an abort should come
+    before anything else is written.
+    """
+    join_votes = [work / f"join-{i}.votes.csv" for i in range(partitions)]
+    join_results = [work / f"join-{i}.vote_results.csv" for i in range(partitions)]
+    bill_votes = [work / f"bill-{i}.votes.csv" for i in range(partitions)]
+    bill_results = [work / f"bill-{i}.vote_results.csv" for i in range(partitions)]
+    bill_bills = [work / f"bill-{i}.bills.csv" for i in range(partitions)]
+
+    _scatter(
+        vote_results,
+        paths=join_results,
+        fieldnames=[*_VOTE_RESULT_FIELDS, _SEQ],
+        key="vote_id",
+    )
+    _scatter(_read_csv(bills_csv), paths=bill_bills, fieldnames=_BILL_FIELDS, key="id")
+    _scatter(_read_csv(votes_csv), paths=join_votes, fieldnames=_VOTE_FIELDS, key="id")
+    _scatter(_read_csv(votes_csv), paths=bill_votes, fieldnames=_VOTE_FIELDS, key="bill_id")
+    # Every partition file gets its header here, even when it receives no rows.
+    _scatter((), paths=bill_results, fieldnames=[*_VOTE_RESULT_FIELDS, _SEQ], key="vote_id")
+
+    for i in range(partitions):
+        vote_to_bill = {int(r["id"]): int(r["bill_id"]) for r in _read_csv(join_votes[i])}
+        _scatter(
+            _route_by_bill(_read_csv(join_results[i]), vote_to_bill),
+            paths=bill_results,
+            fieldnames=[*_VOTE_RESULT_FIELDS, _SEQ],
+            key="_route",
+        )
+        join_votes[i].unlink()
+        join_results[i].unlink()
+
+    for path in bill_results:
+        _restore_input_order(path)
+
+
+def _write_run(path: Path, fieldnames: list[str], rows: Iterable[Iterable[object]]) -> None:
+    with path.open("w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(fieldnames)
+        w.writerows(rows)
+
+
+def _read_run(path: Path) -> Iterator[list[str]]:
+    with path.open(newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        next(reader)
+        yield from reader
+
+
+def _read_counts(path: Path) -> Iterator[tuple[int, int, int]]:
+    return ((int(r[0]), int(r[1]), int(r[2])) for r in _read_run(path))
+
+
+def _sum_counts(runs: Iterable[Iterable[tuple[int, int, int]]]) -> Iterator[tuple[int, int, int]]:
+    """k-way merge of (id, supported, opposed) runs sorted by id, summing equal ids."""
+    merged = heapq.merge(*runs, key=lambda t: t[0])
+    for leg_id, group in itertools.groupby(merged, key=lambda t: t[0]):
+        support = oppose = 0
+        for _, s, o in group:
+            support += s
+            oppose += o
+        yield leg_id, support, oppose
+
+
+def _interleave_bill_runs(runs: Iterable[Iterable[list[str]]]) -> Iterator[list[str]]:
+    """Bills are disjoint across partitions, so merging bill runs only interleaves them."""
+    return heapq.merge(*runs, key=lambda r: int(r[0]))
+
+
+def _run_merger(
+    fieldnames: list[str], merge: Callable[[list[Path]], Iterable[Sequence[object]]]
+) -> Callable[[list[Path], Path], None]:
+    return lambda group, out: _write_run(out, fieldnames, merge(group))
+
+
+def _merge_legislator_runs(
+    legislators: CachingLegislatorRepository, runs: list[Path]
+) -> Iterator[LegislatorVoteCount]:
+    """External merge of per-partition partial counts (sorted by id), summing equal ids."""
+    runs = reduce_runs(
+        runs,
+        fan_in=MAX_OPEN_FILES,
+        merge=_run_merger(
+            _LEGISLATOR_RUN_FIELDS, lambda group: _sum_counts(_read_counts(p) for p in group)
+        ),
+    )
+    names = legislators.legislator_name_by_id()
+    # A zero run guarantees legislators with no votes in any partition still appear.
+    zero_run = ((leg_id, 0, 0) for leg_id in sorted(names))
+    for leg_id, support, oppose in _sum_counts([zero_run, *(_read_counts(p) for p in runs)]):
+        yield LegislatorVoteCount(
+            legislator_id=leg_id,
+            legislator_name=names[leg_id],
+            supported_bills=support,
+            opposed_bills=oppose,
+        )
+
+
+def _merge_bill_runs(runs: list[Path]) -> Iterator[BillVoteCount]:
+    runs = reduce_runs(
+        runs,
+        fan_in=MAX_OPEN_FILES,
+        merge=_run_merger(
+            _BILL_RUN_FIELDS, lambda group: _interleave_bill_runs(_read_run(p) for p in group)
+        ),
+    )
+    for r in _interleave_bill_runs(_read_run(p) for p in runs):
+        yield BillVoteCount(
+            bill_id=int(r[0]),
+            bill_title=r[1],
+            sponsor_name=r[2],
+            supporters=int(r[3]),
+            opposers=int(r[4]),
+        )
+
+
+def run_partitioned(
+    *,
+    legislators_csv: Path,
+    bills_csv: Path,
+    votes_csv: Path,
+    vote_results_csv: Path,
+    partitions: int,
+    limits: IngestionLimits,
+    write_legislators: Callable[[Iterable[LegislatorVoteCount]], None],
+    write_bills: Callable[[Iterable[BillVoteCount]], None],
+    rules: tuple[VoteResultRule, ...] | None = None,
+    tmp_dir: Path | None = None,
+) -> None:
+    """
+    Memory-bounded run: every bill partition is validated and aggregated on its own by the
+    regular `ValidatingVoteResultRepository` + `AnalyticsService`, and the id-ordered partial
+    reports are combined with an external k-way merge.
+
+    Only the legislators table stays fully in memory (it is needed by every partition for
+    the unknown-legislator check and sponsor names, and is the smallest dimension).
+    Circuit-breaker limits apply to the whole input: every validator shares one
+    `IngestionTotals`. Rules that need to see every row (`UniqueVoteResultIdRule`) are
+    rejected: ids repeated across partitions would pass.
+    """
+    rules = rules or default_rules()
+    if any(isinstance(r, UniqueVoteResultIdRule) for r in rules):
+        raise ValueError("Duplicate vote_result ids cannot be detected across bill partitions")
+    scatter_rules, partition_rules = _split_rules(rules)
+    totals = IngestionTotals()
+    logger.info(
+        "out_of_core.entry",
+        extra={"partitions": partitions, "vote_results": str(vote_results_csv)},
+    )
+    legislators = CachingLegislatorRepository(
+        CsvLegislatorRepository(legislators_csv), DimensionCache(max_entries=2)
+    )
+
+    with tempfile.TemporaryDirectory(prefix="legislative-ooc-", dir=tmp_dir) as tmp:
+        work = Path(tmp)
+        _partition_inputs(
+            bills_csv=bills_csv,
+            votes_csv=votes_csv,
+            vote_results=_validated_rows(
+                _numbered(_read_csv(vote_results_csv)),
+                legislators=legislators,
+                rules=scatter_rules,
+                limits=limits,
+                totals=totals,
+            ),
+            work=work,
+            partitions=partitions,
+        )
+
+        legislator_runs: list[Path] = []
+        bill_runs: list[Path] = []
+        for i in range(partitions):
+            votes = CsvVoteRepository(work / f"bill-{i}.votes.csv")
+            service = AnalyticsService(
+                legislators=legislators,
+                bills=CsvBillRepository(work / f"bill-{i}.bills.csv"),
+                votes=votes,
+                vote_results=ValidatingVoteResultRepository(
+                    inner=CsvVoteResultRepository(work / f"bill-{i}.vote_results.csv"),
+                    legislators=legislators,
+                    votes=votes,
+                    limits=limits,
+                    rules=partition_rules,
+                    shared_totals=totals,
+                    counts_rows=False,
+                ),
+            )
+
+            legislator_rows, bill_rows = service.compute_support_oppose_reports()
+            legislator_run = work / f"run-{i}.legislators.csv"
+            _write_run(
+                legislator_run,
+                _LEGISLATOR_RUN_FIELDS,
+                (
+                    (r.legislator_id, r.supported_bills, r.opposed_bills)
+                    for r in legislator_rows
+                    if r.supported_bills or r.opposed_bills
+                ),
+            )
+            bill_run = work / f"run-{i}.bills.csv"
+            _write_run(
+                bill_run,
+                _BILL_RUN_FIELDS,
+                (
+                    (r.bill_id, r.bill_title, r.sponsor_name, r.supporters, r.opposers)
+                    for r in bill_rows
+                ),
+            )
+            legislator_runs.append(legislator_run)
+            bill_runs.append(bill_run)
+            for name in ("votes", "bills", "vote_results"):
+                (work / f"bill-{i}.{name}.csv").unlink()
+
+        write_legislators(_merge_legislator_runs(legislators, legislator_runs))
+        write_bills(_merge_bill_runs(bill_runs))
+
+    logger.info("out_of_core.exit", extra={"partitions": partitions})
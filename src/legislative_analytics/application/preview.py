@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import csv
+import logging
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+from legislative_analytics.domain.entities import VoteResult
+from legislative_analytics.repositories.caching_repositories import (
+    CachingBillRepository,
+    CachingLegislatorRepository,
+    CachingVoteRepository,
+    DimensionCache,
+)
+from legislative_analytics.repositories.csv_repositories import (
+    CsvBillRepository,
+    CsvLegislatorRepository,
+    CsvVoteRepository,
+)
+from legislative_analytics.repositories.interfaces import IVoteResultRepository
+from legislative_analytics.repositories.lookups import bill_maps, legislator_name_by_id
+from legislative_analytics.repositories.sampled_vote_results import (
+    BlockSampledVoteResultRepository,
+    sample_blocks,
+)
+from legislative_analytics.repositories.validating_vote_results import (
+    ValidatingVoteResultRepository,
+)
+from legislative_analytics.repositories.validation_rules import VoteResultRule, default_rules
+from legislative_analytics.services.aggregation import GroupByResult
+from legislative_analytics.services.analytics_service import (
+    BILL_SUPPORT_OPPOSE,
+    LEGISLATOR_SUPPORT_OPPOSE,
+    AnalyticsService,
+    sponsor_name,
+)
+from legislative_analytics.services.estimation import (
+    Estimate,
+    Moments,
+    estimate_ratio,
+    estimate_total,
+    z_score,
+)
+
+logger = logging.getLogger("legislative_analytics.preview")
+
+DEFAULT_BLOCK_SIZE = 1 << 20
+
+_LEGISLATOR_FIELDS = [
+    "id",
+    "name",
+    "num_supported_bills",
+    "num_supported_bills_low",
+    "num_supported_bills_high",
+    "num_opposed_bills",
+    "num_opposed_bills_low",
+    "num_opposed_bills_high",
+]
+_BILL_FIELDS = [
+    "id",
+    "title",
+    "supporter_count",
+    "supporter_count_low",
+    "supporter_count_high",
+    "opposer_count",
+    "opposer_count_low",
+    "opposer_count_high",
+    "primary_sponsor",
+]
+_SUMMARY_FIELDS = ["metric", "estimate", "low", "high"]
+
+
+@dataclass(frozen=True, slots=True)
+class PreviewSettings:
+    fraction: float
+    block_size: int = DEFAULT_BLOCK_SIZE
+    seed: int | None = None
+    confidence: float = 0.95
+
+
+@dataclass(frozen=True, slots=True)
+class PreviewSummary:
+    sampled_blocks: int
+    total_blocks: int
+    vote_results: Estimate
+    rejected: Estimate
+    rejection_rate: Estimate
+
+
+class _Counting(IVoteResultRepository):
+    def __init__(self, inner: IVoteResultRepository) -> None:
+        self._inner = inner
+        self.rows = 0
+
+    def iter_vote_results(self) -> Iterable[VoteResult]:
+        for vr in self._inner.iter_vote_results():
+            self.rows += 1
+            yield vr
+
+
+class _BlockMoments:
+    """
+    Running per-entity sums and sums of squares of the block (support, oppose) counts.
+    Only entities with votes in a block are stored: a 0 sample adds nothing to either sum.
+    """
+
+    def __init__(self) -> None:
+        # entity id -> [support sum, support sum of squares, oppose sum, oppose sum of squares]
+        self._sums: dict[int, list[int]] = {}
+
+    def add_block(self, result: GroupByResult) -> None:
+        columns = result.columns
+        for entity_id, support, oppose in zip(
+            result.keys, columns["support"], columns["oppose"], strict=True
+        ):
+            if not (support or oppose):
+                continue
+            acc = self._sums.get(entity_id)
+            if acc is None:
+                acc = self._sums[entity_id] = [0, 0, 0, 0]
+            acc[0] += support
+            acc[1] += support * support
+            acc[2] += oppose
+            acc[3] += oppose * oppose
+
+    def moments(self, entity_id: int, blocks: int) -> tuple[Moments, Moments]:
+        s, s_sq, o, o_sq = self._sums.get(entity_id, (0, 0, 0, 0))
+        return Moments(blocks, s, s_sq), Moments(blocks, o, o_sq)
+
+
+def _fmt(e: Estimate) -> tuple[str, str, str]:
+    return f"{e.value:.1f}", f"{e.low:.1f}", f"{e.high:.1f}"
+
+
+def _write_csv(path: Path, fieldnames: list[str], rows: Iterable[Sequence[object]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
+        writer.writerows(rows)
+
+
+def run_preview(
+    *,
+    legislators_csv: Path,
+    bills_csv: Path,
+    votes_csv: Path,
+    vote_results_csv: Path,
+    settings: PreviewSettings,
+    legislator_out: Path,
+    bill_out: Path,
+    summary_out: Path,
+    rules: tuple[VoteResultRule, ...] | None = None,
+) -> PreviewSummary:
+    """
+    Approximate reports from a random sample of byte-range blocks of vote_results.csv.
+
+    Every sampled block goes through the regular validator and the report joins, and
+    its per-entity counts are one cluster sample: totals are estimated as
+    blocks * mean(block counts), with normal-approximation confidence intervals.
+    Only running per-entity moments are kept across blocks (see `_BlockMoments`).
+    Double votes are only detected within a block, so estimates lean slightly high
+    on inputs with many cross-block double votes.
+    """
+    starts, total_blocks = sample_blocks(
+        vote_results_csv,
+        block_size=settings.block_size,
+        fraction=settings.fraction,
+        seed=settings.seed,
+    )
+    z = z_score(settings.confidence)
+    logger.info(
+        "preview.entry",
+        extra={
+            "sampled_blocks": len(starts),
+            "total_blocks": total_blocks,
+            "block_size": settings.block_size,
+        },
+    )
+
+    cache = DimensionCache(max_entries=8)
+    legislators = CachingLegislatorRepository(CsvLegislatorRepository(legislators_csv), cache)
+    bills = CachingBillRepository(CsvBillRepository(bills_csv), cache)
+    votes = CachingVoteRepository(CsvVoteRepository(votes_csv), cache)
+    names = legislator_name_by_id(legislators)
+    titles, sponsors = bill_maps(bills)
+
+    processed: list[int] = []
+    rejected: list[int] = []
+    by_legislator = _BlockMoments()
+    by_bill = _BlockMoments()
+
+    for start in starts:
+        raw = _Counting(
+            BlockSampledVoteResultRepository(vote_results_csv, (start,), settings.block_size)
+        )
+        accepted = _Counting(
+            ValidatingVoteResultRepository(
+                inner=raw,
+                legislators=legislators,
+                votes=votes,
+                rules=rules or default_rules(),
+            )
+        )
+        # The exact reports' specs and joins, over one block (lookups come from the cache).
+        service = AnalyticsService(
+            legislators=legislators, bills=bills, votes=votes, vote_results=accepted
+        )
+        results = service.aggregate(LEGISLATOR_SUPPORT_OPPOSE, BILL_SUPPORT_OPPOSE)
+
+        processed.append(raw.rows)
+        rejected.append(raw.rows - accepted.rows)
+        by_legislator.add_block(results[LEGISLATOR_SUPPORT_OPPOSE.name])
+        by_bill.add_block(results[BILL_SUPPORT_OPPOSE.name])
+
+    blocks = len(starts)
+
+    def total(moments: Moments) -> Estimate:
+        return estimate_total(moments, population=total_blocks, z=z)
+
+    def totals(acc: _BlockMoments, entity_id: int) -> tuple[str, ...]:
+        support, oppose = acc.moments(entity_id, blocks)
+        return (*_fmt(total(support)), *_fmt(total(oppose)))
+
+    _write_csv(
+        legislator_out,
+        _LEGISLATOR_FIELDS,
+        ((leg_id, names[leg_id], *totals(by_legislator, leg_id)) for leg_id in sorted(names)),
+    )
+    _write_csv(
+        bill_out,
+        _BILL_FIELDS,
+        (
+            (
+                bill_id,
+                titles[bill_id],
+                *totals(by_bill, bill_id),
+                sponsor_name(bill_id, sponsors, names),
+            )
+            for bill_id in sorted(titles)
+        ),
+    )
+
+    summary = PreviewSummary(
+        sampled_blocks=len(starts),
+        total_blocks=total_blocks,
+        vote_results=total(Moments.of(processed)),
+        rejected=total(Moments.of(rejected)),
+        rejection_rate=estimate_ratio(rejected, processed, population=total_blocks, z=z),
+    )
+    rate = summary.rejection_rate
+    _write_csv(
+        summary_out,
+        _SUMMARY_FIELDS,
+        [
+            ("vote_results", *_fmt(summary.vote_results)),
+            ("rejected", *_fmt(summary.rejected)),
+            ("rejection_rate", f"{rate.value:.4f}", f"{rate.low:.4f}", f"{rate.high:.4f}"),
+        ],
+    )
+    logger.info(
+        "preview.exit",
+        extra={
+            "sampled_blocks": summary.sampled_blocks,
+            "total_blocks": summary.total_blocks,
+            "rejection_rate": round(rate.value, 4),
+        },
+    )
+    return summary
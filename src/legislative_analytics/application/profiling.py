@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import cProfile
+import logging
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from pathlib import Path
+from types import FrameType, TracebackType
+
+logger = logging.getLogger("legislative_analytics.profiling")
+
+# Pipeline stages, identified by the module that owns the frame.
+_STAGE_BY_MODULE: dict[str, str] = {
+    "csv_repositories.py": "repositories",
+    "caching_repositories.py": "repositories",
+    "compressed_io.py": "repositories",
+    "lookups.py": "repositories",
+    "string_table.py": "repositories",
+    "validating_vote_results.py": "validator",
+    "validation_rules.py": "validator",
+    "analytics_service.py": "service",
+    "aggregation.py": "service",
+    "batch_queries.py": "service",
+    # --memory-limit: scattering the inputs into partitions and merging the runs.
+    "out_of_core.py": "partitioning",
+}
+
+_OTHER_STAGE = "other"
+
+
+def stage_for(filename: str, funcname: str) -> str | None:
+    """Map a code location to a pipeline stage, or None if it belongs to no stage."""
+    name = Path(filename).name
+    stage = _STAGE_BY_MODULE.get(name)
+    if stage is not None:
+        return stage
+    if name == "main.py" and funcname.startswith("_write_"):
+        return "writers"
+    return None
+
+
+def _frame_label(frame: FrameType) -> str:
+    return f"{Path(frame.f_code.co_filename).stem}:{frame.f_code.co_name}"
+
+
+class _StackSampler:
+    """
+    Periodically samples the stack of one thread.
+
+    cProfile only keeps caller/callee pairs, so full stacks (for flamegraphs) and
+    inclusive per-stage attribution come from these samples. A sample is charged
+    to the innermost stage frame on the stack: `csv.DictReader` time under a CSV
+    repository counts as "repositories", logger calls under the validator as
+    "validator", and so on.
+    """
+
+    def __init__(self, *, thread_id: int, interval: float) -> None:
+        self._thread_id = thread_id
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+        self.stacks: Counter[str] = Counter()
+        self.stages: Counter[str] = Counter()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                continue
+            labels: list[str] = []
+            stage: str | None = None
+            f: FrameType | None = frame
+            while f is not None:
+                labels.append(_frame_label(f))
+                if stage is None:
+                    stage = stage_for(f.f_code.co_filename, f.f_code.co_name)
+                f = f.f_back
+            self.stacks[";".join(reversed(labels))] += 1
+            self.stages[stage or _OTHER_STAGE] += 1
+
+
+class ProfileSession:
+    """
+    Wraps a run in cProfile (+ a stack sampler) and writes:
+    - `run.pstats`: cProfile dump (`python -m pstats run.pstats`)
+    - `run.collapsed`: collapsed stacks for flamegraph.pl / speedscope
+    - `stages.txt`: per-stage CPU share (and memory held per stage when traced)
+    - `allocations.txt`: top allocation sites, only with `traceback_depth`
+
+    Allocation tracing is opt-in: tracemalloc slows the run several times over
+    (more with deeper tracebacks), so it only runs when `traceback_depth` is set.
+    Per-stage memory needs a depth that reaches the stage frames above the
+    allocating call.
+    """
+
+    def __init__(
+        self,
+        out_dir: Path,
+        *,
+        sample_interval: float = 0.005,
+        traceback_depth: int | None = None,
+        top_allocations: int = 25,
+    ) -> None:
+        self._out_dir = out_dir
+        self._sample_interval = sample_interval
+        self._traceback_depth = traceback_depth
+        self._top_allocations = top_allocations
+        self._profiler = cProfile.Profile()
+        self._sampler: _StackSampler | None = None
+        self._snapshot: tracemalloc.Snapshot | None = None
+        self._snapshot_label = "exit"
+        self._started_at = 0.0
+        self._elapsed = 0.0
+        self._peak_bytes = 0
+
+    def __enter__(self) -> ProfileSession:
+        if self._traceback_depth is not None:
+            tracemalloc.start(self._traceback_depth)
+        self._sampler = _StackSampler(
+            thread_id=threading.get_ident(), interval=self._sample_interval
+        )
+        self._sampler.start()
+        self._started_at = time.perf_counter()
+        self._profiler.enable()
+        return self
+
+    def checkpoint(self, label: str) -> None:
+        """
+        Take the allocation snapshot now, while the pipeline's data is still alive.
+        The last checkpoint wins; without one, the snapshot is taken on exit.
+        """
+        if self._traceback_depth is None:
+            return
+        self._snapshot = tracemalloc.take_snapshot()
+        self._snapshot_label = label
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self._profiler.disable()
+        self._elapsed = time.perf_counter() - self._started_at
+        assert self._sampler is not None
+        self._sampler.stop()
+        if self._traceback_depth is not None:
+            if self._snapshot is None:
+                self._snapshot = tracemalloc.take_snapshot()
+            _, self._peak_bytes = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        self._write_reports()
+
+    def _write_reports(self) -> None:
+        assert self._sampler is not None
+        self._out_dir.mkdir(parents=True, exist_ok=True)
+
+        pstats_path = self._out_dir / "run.pstats"
+        self._profiler.dump_stats(str(pstats_path))
+
+        collapsed_path = self._out_dir / "run.collapsed"
+        with collapsed_path.open("w", encoding="utf-8") as f:
+            for stack, count in sorted(self._sampler.stacks.items()):
+                f.write(f"{stack} {count}\n")
+
+        snapshot = None
+        if self._snapshot is not None:
+            snapshot = self._snapshot.filter_traces(
+                [tracemalloc.Filter(False, tracemalloc.__file__)]
+            )
+            self._write_allocation_report(self._out_dir / "allocations.txt", snapshot)
+        self._write_stage_report(self._out_dir / "stages.txt", snapshot)
+
+        logger.info(
+            "profile.written",
+            extra={
+                "out_dir": str(self._out_dir),
+                "elapsed_seconds": round(self._elapsed, 3),
+                "peak_traced_bytes": self._peak_bytes,
+            },
+        )
+
+    def _stage_bytes(self, snapshot: tracemalloc.Snapshot) -> Counter[str]:
+        by_stage: Counter[str] = Counter()
+        for stat in snapshot.statistics("traceback"):
+            stage: str | None = None
+            # Frames are ordered oldest -> most recent; charge the innermost stage.
+            for frame in reversed(stat.traceback):
+                stage = stage_for(frame.filename, "")
+                if stage is not None:
+                    break
+            by_stage[stage or _OTHER_STAGE] += stat.size
+        return by_stage
+
+    def _write_stage_report(self, path: Path, snapshot: tracemalloc.Snapshot | None) -> None:
+        assert self._sampler is not None
+        stages = self._sampler.stages
+        total_samples = sum(stages.values())
+        by_stage_bytes = self._stage_bytes(snapshot) if snapshot is not None else None
+
+        own_time: defaultdict[str, float] = defaultdict(float)
+        for entry in self._profiler.getstats():
+            # `inlinetime` is pstats' tottime. Builtins carry a str label instead of code
+            # and own no stage: their time is charged to the stage of each caller.
+            if isinstance(entry.code, str):
+                continue
+            stage = stage_for(entry.code.co_filename, entry.code.co_name) or _OTHER_STAGE
+            own_time[stage] += entry.inlinetime
+            for call in entry.calls or ():
+                if isinstance(call.code, str):
+                    own_time[stage] += call.inlinetime
+
+        names = ["repositories", "validator", "service", "partitioning", "writers", _OTHER_STAGE]
+        with path.open("w", encoding="utf-8") as f:
+            f.write(f"wall_seconds {self._elapsed:.3f}\n")
+            if by_stage_bytes is None:
+                f.write("allocation tracing off\n")
+            else:
+                f.write(f"peak_traced_bytes {self._peak_bytes}\n")
+            f.write(f"samples {total_samples} (every {self._sample_interval * 1000:.1f} ms)\n")
+            if by_stage_bytes is not None:
+                f.write(f"memory_snapshot {self._snapshot_label}\n")
+            f.write("\n")
+            f.write(
+                f"{'stage':<14}{'samples':>10}{'cpu_share':>11}"
+                f"{'own_seconds':>13}{'held_bytes':>14}\n"
+            )
+            for name in names:
+                share = stages[name] / total_samples if total_samples else 0.0
+                held = "-" if by_stage_bytes is None else by_stage_bytes[name]
+                f.write(
+                    f"{name:<14}{stages[name]:>10}{share:>10.1%} "
+                    f"{own_time[name]:>12.3f}{held:>14}\n"
+                )
+
+    def _write_allocation_report(self, path: Path, snapshot: tracemalloc.Snapshot) -> None:
+        with path.open("w", encoding="utf-8") as f:
+            f.write(f"top {self._top_allocations} allocation sites at '{self._snapshot_label}'\n")
+            f.write(f"peak_traced_bytes {self._peak_bytes}\n\n")
+            for stat in snapshot.statistics("lineno")[: self._top_allocations]:
+                frame = stat.traceback[0]
+                stage = stage_for(frame.filename, "") or _OTHER_STAGE
+                f.write(
+                    f"{stat.size:>12} B {stat.count:>9} blocks  [{stage}] "
+                    f"{frame.filename}:{frame.lineno}\n"
+                )
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import csv
+import logging
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+from typing import TypeVar
+
+from legislative_analytics.repositories.report_state import ReportStateWriter, iter_report_state
+from legislative_analytics.services.report_diff import StreamingDiff
+
+T = TypeVar("T")
+
+logger = logging.getLogger("legislative_analytics.diff")
+
+
+def with_delta(
+    rows: Iterable[T],
+    *,
+    section: str,
+    previous_state: Path,
+    state: ReportStateWriter,
+    delta_path: Path,
+    fieldnames: list[str],
+    id_of: Callable[[T], int],
+    row_hash: Callable[[T], int],
+    to_record: Callable[[T], dict[str, object]],
+) -> Iterator[T]:
+    """
+    Pass `rows` (ascending id) through unchanged while, in the same pass:
+    - diffing them against `section` of the previous snapshot,
+    - writing added/changed rows (full content) and removed rows (id only) to `delta_path`,
+    - recording the new (id, hash) pairs in `state`.
+    """
+    diff = StreamingDiff(iter_report_state(previous_state, section))
+    state.begin_section(section)
+    counts = {"added": 0, "removed": 0, "changed": 0}
+
+    delta_path.parent.mkdir(parents=True, exist_ok=True)
+    with delta_path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=["change", *fieldnames])
+        writer.writeheader()
+
+        for row in rows:
+            entity_id = id_of(row)
+            h = row_hash(row)
+            state.add(entity_id, h)
+            for change in diff.push(entity_id, h):
+                counts[change.kind] += 1
+                if change.kind == "removed":
+                    writer.writerow({"change": "removed", "id": change.entity_id})
+                else:
+                    writer.writerow({"change": change.kind, **to_record(row)})
+            yield row
+
+        for change in diff.finish():
+            counts[change.kind] += 1
+            writer.writerow({"change": "removed", "id": change.entity_id})
+
+    logger.info("diff.written", extra={"section": section, "delta": str(delta_path), **counts})
@@ -2,6 +2,10 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+# The `VoteResult.vote_type` values the reports count; any other value is ignored.
+SUPPORT = 1
+OPPOSE = 2
+
 
 @dataclass(frozen=True, slots=True)
 class Legislator:
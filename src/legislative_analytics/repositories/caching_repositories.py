@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import itertools
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Protocol, TypeVar
+
+from legislative_analytics.domain.entities import Bill, Legislator, Vote
+from legislative_analytics.repositories.interfaces import (
+    IBillLookup,
+    IBillRepository,
+    ILegislatorLookup,
+    ILegislatorRepository,
+    IVoteLookup,
+    IVoteRepository,
+)
+from legislative_analytics.repositories.lookups import encode_bills
+from legislative_analytics.repositories.string_table import EncodedStrings
+
+T = TypeVar("T")
+
+# Per-item overhead of a dict slot (hash, key and value pointers, sparse index) on
+# 64-bit CPython; used by the size estimate below.
+_DICT_SLOT_BYTES = 40
+_SIZE_SAMPLE = 64
+
+
+class _FileBacked(Protocol):
+    @property
+    def csv_path(self) -> Path: ...
+
+
+@dataclass(frozen=True, slots=True)
+class FileFingerprint:
+    """Identity of a file's content as far as the cache is concerned."""
+
+    path: Path
+    size: int
+    mtime_ns: int
+
+    @classmethod
+    def of(cls, path: Path) -> FileFingerprint:
+        st = path.stat()
+        return cls(path=path.resolve(), size=st.st_size, mtime_ns=st.st_mtime_ns)
+
+
+@dataclass(frozen=True, slots=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    nbytes: int
+
+
+def _flat_size(obj: object) -> int:
+    size = sys.getsizeof(obj)
+    for name in getattr(type(obj), "__slots__", ()):
+        size += sys.getsizeof(getattr(obj, name, None))
+    return size
+
+
+def _item_size(obj: object) -> int:
+    # Nested containers (e.g. a tuple of lookup maps) are estimated, not flat-sized.
+    if isinstance(obj, (Mapping, tuple, list)) or hasattr(obj, "nbytes"):
+        return approx_nbytes(obj)
+    return _flat_size(obj)
+
+
+def approx_nbytes(value: object) -> int:
+    """
+    Approximate memory held by a cached value. Containers are estimated from a
+    sample of their items (a fixed cost per entry, not a deep walk of millions of
+    objects); values exposing `nbytes` (e.g. `EncodedStrings`) report it themselves.
+    """
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    if isinstance(value, Mapping):
+        pairs = list(itertools.islice(value.items(), _SIZE_SAMPLE))
+        per_item = (
+            sum(_flat_size(k) + _flat_size(v) for k, v in pairs) / len(pairs) if pairs else 0
+        )
+        return sys.getsizeof({}) + int(len(value) * (per_item + _DICT_SLOT_BYTES))
+    if isinstance(value, (tuple, list)):
+        sample = value[:_SIZE_SAMPLE]
+        per_item = sum(_item_size(v) for v in sample) / len(sample) if sample else 0
+        return sys.getsizeof(value) + int(len(value) * per_item)
+    return sys.getsizeof(value)
+
+
+class DimensionCache:
+    """
+    Process-wide LRU cache for parsed dimension tables and derived maps.
+
+    Entries are keyed by (file fingerprint, kind), so a file that changes on disk
+    (size or mtime) is re-parsed on next access and its stale entries are dropped.
+    Cached values are immutable (tuples / read-only mappings) because they are
+    shared between every caller.
+
+    The cache is bounded by `max_bytes` (approximate memory of the cached values,
+    see `approx_nbytes`) and by `max_entries`; least recently used entries are
+    evicted until both hold. A value larger than `max_bytes` on its own is returned
+    but not cached.
+    """
+
+    def __init__(self, *, max_entries: int = 32, max_bytes: int | None = None) -> None:
+        if max_entries <= 0:
+            raise ValueError(f"max_entries must be positive: {max_entries}")
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError(f"max_bytes must be positive: {max_bytes}")
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[tuple[FileFingerprint, str], tuple[Any, int]] = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get_or_load(self, path: Path, kind: str, loader: Callable[[], T]) -> T:
+        fp = FileFingerprint.of(path)
+        key = (fp, kind)
+        with self._lock:
+            if key in self._entries:
+                self._hits += 1
+                self._entries.move_to_end(key)
+                value: T = self._entries[key][0]
+                return value
+            self._misses += 1
+
+        # Parse outside the lock: loading can take a while and other files shouldn't wait.
+        value = loader()
+        if FileFingerprint.of(path) != fp:
+            # Replaced while parsing: the value may mix both versions; don't cache it.
+            return value
+        nbytes = approx_nbytes(value)
+
+        with self._lock:
+            for stale in [k for k in self._entries if k[0].path == fp.path and k[0] != fp]:
+                self._drop(stale)
+            if self._max_bytes is not None and nbytes > self._max_bytes:
+                return value
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (value, nbytes)
+            self._nbytes += nbytes
+            while len(self._entries) > self._max_entries or (
+                self._max_bytes is not None and self._nbytes > self._max_bytes
+            ):
+                self._drop(next(iter(self._entries)))
+                self._evictions += 1
+        return value
+
+    def _drop(self, key: tuple[FileFingerprint, str]) -> None:
+        _, nbytes = self._entries.pop(key)
+        self._nbytes -= nbytes
+
+    def invalidate(self, path: Path | None = None) -> int:
+        """Drop every entry for `path` (or everything when None). Returns the number dropped."""
+        with self._lock:
+            if path is None:
+                dropped = len(self._entries)
+                self._entries.clear()
+                self._nbytes = 0
+                return dropped
+            resolved = path.resolve()
+            keys = [k for k in self._entries if k[0].path == resolved]
+            for k in keys:
+                self._drop(k)
+            return len(keys)
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                nbytes=self._nbytes,
+            )
+
+
+class _FileBackedLegislatorRepository(_FileBacked, ILegislatorRepository, Protocol): ...
+
+
+class _FileBackedBillRepository(_FileBacked, IBillRepository, Protocol): ...
+
+
+class _FileBackedVoteRepository(_FileBacked, IVoteRepository, Protocol): ...
+
+
+@dataclass(frozen=True, slots=True)
+class CachingLegislatorRepository(ILegislatorRepository, ILegislatorLookup):
+    inner: _FileBackedLegislatorRepository
+    cache: DimensionCache = field(compare=False)
+
+    def _rows(self) -> tuple[Legislator, ...]:
+        return self.cache.get_or_load(
+            self.inner.csv_path, "legislators", lambda: tuple(self.inner.iter_legislators())
+        )
+
+    def iter_legislators(self) -> Iterable[Legislator]:
+        return iter(self._rows())
+
+    def legislator_name_by_id(self) -> Mapping[int, str]:
+        return self.cache.get_or_load(
+            self.inner.csv_path,
+            "legislator_name_by_id",
+            lambda: EncodedStrings.from_items(
+                (leg.id, leg.name) for leg in self.inner.iter_legislators()
+            ),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class CachingBillRepository(IBillRepository, IBillLookup):
+    inner: _FileBackedBillRepository
+    cache: DimensionCache = field(compare=False)
+
+    def _rows(self) -> tuple[Bill, ...]:
+        return self.cache.get_or_load(
+            self.inner.csv_path, "bills", lambda: tuple(self.inner.iter_bills())
+        )
+
+    def iter_bills(self) -> Iterable[Bill]:
+        return iter(self._rows())
+
+    def _maps(self) -> tuple[EncodedStrings, Mapping[int, int | None]]:
+        def load() -> tuple[EncodedStrings, Mapping[int, int | None]]:
+            titles, sponsors = encode_bills(self.inner.iter_bills())
+            return titles, MappingProxyType(sponsors)
+
+        # Titles and sponsors come from one parse of bills.csv.
+        return self.cache.get_or_load(self.inner.csv_path, "bill_maps", load)
+
+    def bill_title_by_id(self) -> Mapping[int, str]:
+        return self._maps()[0]
+
+    def bill_sponsor_id_by_id(self) -> Mapping[int, int | None]:
+        return self._maps()[1]
+
+
+@dataclass(frozen=True, slots=True)
+class CachingVoteRepository(IVoteRepository, IVoteLookup):
+    inner: _FileBackedVoteRepository
+    cache: DimensionCache = field(compare=False)
+
+    def _rows(self) -> tuple[Vote, ...]:
+        return self.cache.get_or_load(
+            self.inner.csv_path, "votes", lambda: tuple(self.inner.iter_votes())
+        )
+
+    def iter_votes(self) -> Iterable[Vote]:
+        return iter(self._rows())
+
+    def vote_id_to_bill_id(self) -> Mapping[int, int]:
+        return self.cache.get_or_load(
+            self.inner.csv_path,
+            "vote_id_to_bill_id",
+            lambda: MappingProxyType({v.id: v.bill_id for v in self.inner.iter_votes()}),
+        )
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import bz2
+import gzip
+import io
+import lzma
+import queue
+import threading
+from collections.abc import Callable
+from contextlib import closing
+from pathlib import Path
+from typing import Protocol, TextIO
+
+
+class _ByteReader(Protocol):
+    """What the decompressor needs from gzip/bz2/lzma file objects."""
+
+    def read(self, size: int = -1, /) -> bytes: ...
+
+    def close(self) -> None: ...
+
+
+_OPENERS: dict[str, Callable[[Path], _ByteReader]] = {
+    ".gz": lambda p: gzip.open(p, "rb"),
+    ".bz2": lambda p: bz2.open(p, "rb"),
+    ".xz": lambda p: lzma.open(p, "rb"),
+}
+
+# Lookup order when several variants of the same input exist.
+COMPRESSED_SUFFIXES = tuple(_OPENERS)
+
+_CHUNK_SIZE = 1 << 20
+# Decompressed chunks buffered ahead of the parser (bounds memory to ~depth * chunk).
+_QUEUE_DEPTH = 8
+_PUT_TIMEOUT = 0.1
+
+
+def find_input(data_dir: Path, name: str) -> Path | None:
+    """`name` (e.g. "votes.csv") or its first existing .gz/.bz2/.xz variant."""
+    plain = data_dir / name
+    if plain.exists():
+        return plain
+    for suffix in COMPRESSED_SUFFIXES:
+        candidate = data_dir / f"{name}{suffix}"
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def is_compressed(path: Path) -> bool:
+    return path.suffix in _OPENERS
+
+
+class _ThreadedDecompressor(io.RawIOBase):
+    """
+    Raw byte stream whose decompression runs on a background thread.
+
+    zlib/bz2/lzma release the GIL while inflating, so the producer thread
+    decompresses the next chunks while the consumer thread is busy in csv parsing
+    and entity construction: decompression overlaps ingestion instead of adding to it.
+    """
+
+    def __init__(self, path: Path, opener: Callable[[Path], _ByteReader]) -> None:
+        super().__init__()
+        self._queue: queue.Queue[bytes | BaseException | None] = queue.Queue(maxsize=_QUEUE_DEPTH)
+        self._stop = threading.Event()
+        self._chunk = b""
+        self._pos = 0
+        self._eof = False
+        self._thread = threading.Thread(
+            target=self._pump, args=(path, opener), name=f"decompress-{path.name}", daemon=True
+        )
+        self._thread.start()
+
+    def _put(self, item: bytes | BaseException | None) -> None:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=_PUT_TIMEOUT)
+                return
+            except queue.Full:
+                continue
+
+    def _pump(self, path: Path, opener: Callable[[Path], _ByteReader]) -> None:
+        try:
+            with closing(opener(path)) as f:
+                while not self._stop.is_set():
+                    chunk = f.read(_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    self._put(chunk)
+        except BaseException as exc:  # surfaced to the reading thread
+            self._put(exc)
+        finally:
+            self._put(None)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b: memoryview | bytearray) -> int:  # type: ignore[override]
+        while self._pos >= len(self._chunk):
+            if self._eof:
+                return 0
+            item = self._queue.get()
+            if item is None:
+                self._eof = True
+                return 0
+            if isinstance(item, BaseException):
+                self._eof = True
+                raise item
+            self._chunk, self._pos = item, 0
+        n = min(len(b), len(self._chunk) - self._pos)
+        b[:n] = self._chunk[self._pos : self._pos + n]
+        self._pos += n
+        return n
+
+    def close(self) -> None:
+        if not self.closed:
+            self._stop.set()
+            # Unblock a producer waiting on a full queue, then wait for it.
+            while self._thread.is_alive():
+                try:
+                    self._queue.get(timeout=_PUT_TIMEOUT)
+                except queue.Empty:
+                    pass
+            self._thread.join()
+        super().close()
+
+
+def open_csv(path: Path) -> TextIO:
+    """Open a CSV for reading as text, stream-decompressing .gz/.bz2/.xz on a background thread."""
+    opener = _OPENERS.get(path.suffix)
+    if opener is None:
+        return path.open(newline="", encoding="utf-8")
+    raw = _ThreadedDecompressor(path, opener)
+    return io.TextIOWrapper(
+        io.BufferedReader(raw, buffer_size=_CHUNK_SIZE), encoding="utf-8", newline=""
+    )
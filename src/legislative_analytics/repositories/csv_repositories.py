@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 import csv
-from collections.abc import Iterable
+from collections.abc import Iterable, Mapping
 from dataclasses import dataclass
 from pathlib import Path
 
 from legislative_analytics.domain.entities import Bill, Legislator, Vote, VoteResult
+from legislative_analytics.repositories.compressed_io import open_csv
 from legislative_analytics.repositories.interfaces import (
     IBillRepository,
     ILegislatorRepository,
@@ -25,12 +26,21 @@ def _parse_optional_int(value: str) -> int | None:
     return int(v)
 
 
+def parse_vote_result(row: Mapping[str, str]) -> VoteResult:
+    return VoteResult(
+        id=_parse_int(row["id"]),
+        legislator_id=_parse_int(row["legislator_id"]),
+        vote_id=_parse_int(row["vote_id"]),
+        vote_type=_parse_int(row["vote_type"]),
+    )
+
+
 @dataclass(frozen=True, slots=True)
 class CsvLegislatorRepository(ILegislatorRepository):
     csv_path: Path
 
     def iter_legislators(self) -> Iterable[Legislator]:
-        with self.csv_path.open(newline="", encoding="utf-8") as f:
+        with open_csv(self.csv_path) as f:
             reader = csv.DictReader(f)
             for row in reader:
                 yield Legislator(
@@ -44,7 +54,7 @@ class CsvBillRepository(IBillRepository):
     csv_path: Path
 
     def iter_bills(self) -> Iterable[Bill]:
-        with self.csv_path.open(newline="", encoding="utf-8") as f:
+        with open_csv(self.csv_path) as f:
             reader = csv.DictReader(f)
             for row in reader:
                 yield Bill(
@@ -59,7 +69,7 @@ class CsvVoteRepository(IVoteRepository):
     csv_path: Path
 
     def iter_votes(self) -> Iterable[Vote]:
-        with self.csv_path.open(newline="", encoding="utf-8") as f:
+        with open_csv(self.csv_path) as f:
             reader = csv.DictReader(f)
             for row in reader:
                 yield Vote(
@@ -73,14 +83,9 @@ class CsvVoteResultRepository(IVoteResultRepository):
     csv_path: Path
 
     def iter_vote_results(self) -> Iterable[VoteResult]:
-        with self.csv_path.open(newline="", encoding="utf-8") as f:
+        with open_csv(self.csv_path) as f:
             reader = csv.DictReader(f)
             for row in reader:
-                yield VoteResult(
-                    id=_parse_int(row["id"]),
-                    legislator_id=_parse_int(row["legislator_id"]),
-                    vote_id=_parse_int(row["vote_id"]),
-                    vote_type=_parse_int(row["vote_type"]),
-                )
+                yield parse_vote_result(row)
 
 
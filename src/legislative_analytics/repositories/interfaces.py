@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
-from typing import Protocol
+from collections.abc import Iterable, Mapping
+from typing import Protocol, runtime_checkable
 
 from legislative_analytics.domain.entities import Bill, Legislator, Vote, VoteResult
 
@@ -22,3 +22,22 @@ class IVoteResultRepository(Protocol):
     def iter_vote_results(self) -> Iterable[VoteResult]: ...
 
 
+# Optional capabilities: repositories that can serve prebuilt lookup maps
+# (e.g. from a cache) so callers don't rebuild them with a full iteration.
+
+
+@runtime_checkable
+class ILegislatorLookup(Protocol):
+    def legislator_name_by_id(self) -> Mapping[int, str]: ...
+
+
+@runtime_checkable
+class IBillLookup(Protocol):
+    def bill_title_by_id(self) -> Mapping[int, str]: ...
+
+    def bill_sponsor_id_by_id(self) -> Mapping[int, int | None]: ...
+
+
+@runtime_checkable
+class IVoteLookup(Protocol):
+    def vote_id_to_bill_id(self) -> Mapping[int, int]: ...
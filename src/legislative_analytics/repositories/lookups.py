@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Mapping
+
+from legislative_analytics.domain.entities import Bill
+from legislative_analytics.repositories.interfaces import (
+    IBillLookup,
+    IBillRepository,
+    ILegislatorLookup,
+    ILegislatorRepository,
+    IVoteLookup,
+    IVoteRepository,
+)
+from legislative_analytics.repositories.string_table import EncodedStrings
+
+# Lookup maps used by the validator and the service. Repositories exposing the
+# matching *Lookup capability (e.g. the caching decorators) serve them directly;
+# anything else is iterated once. Names and titles are dictionary-encoded
+# (`EncodedStrings`): one UTF-8 buffer, decoded per lookup.
+
+
+def legislator_name_by_id(repo: ILegislatorRepository) -> Mapping[int, str]:
+    if isinstance(repo, ILegislatorLookup):
+        return repo.legislator_name_by_id()
+    return EncodedStrings.from_items((leg.id, leg.name) for leg in repo.iter_legislators())
+
+
+def vote_id_to_bill_id(repo: IVoteRepository) -> Mapping[int, int]:
+    if isinstance(repo, IVoteLookup):
+        return repo.vote_id_to_bill_id()
+    return {v.id: v.bill_id for v in repo.iter_votes()}
+
+
+def bill_maps(repo: IBillRepository) -> tuple[Mapping[int, str], Mapping[int, int | None]]:
+    """(bill_title_by_id, bill_sponsor_id_by_id)"""
+    if isinstance(repo, IBillLookup):
+        return repo.bill_title_by_id(), repo.bill_sponsor_id_by_id()
+    return encode_bills(repo.iter_bills())
+
+
+def encode_bills(bills: Iterable[Bill]) -> tuple[EncodedStrings, dict[int, int | None]]:
+    """
+    (bill_title_by_id, bill_sponsor_id_by_id) from one pass: titles are streamed into
+    the encoder while the sponsor map is filled alongside, so no title list is built.
+    """
+    sponsors: dict[int, int | None] = {}
+
+    def titles() -> Iterator[tuple[int, str]]:
+        for bill in bills:
+            sponsors[bill.id] = bill.sponsor_id
+            yield bill.id, bill.title
+
+    return EncodedStrings.from_items(titles()), sponsors
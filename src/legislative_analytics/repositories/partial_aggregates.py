@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import json
+import os
+import struct
+from collections.abc import Iterable, Iterator
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+# Partial aggregate of one vote_results shard, written by the map step and
+# combined by the merge step.
+#
+# Layout (little-endian):
+#   magic b"LAPART01"
+#   u32 metadata length | metadata (utf-8 JSON, see `PartialMeta`)
+#   u64 count | legislator rows   i64 legislator_id | i64 support | i64 oppose   (ascending id)
+#   u64 count | bill rows         i64 bill_id | i64 support | i64 oppose         (ascending id)
+#   u64 count | pair rows         i64 legislator_id | i64 bill_id | i64 shard | i64 offset
+#                                 | i64 vote_type
+#                                 (ascending; one row per (legislator, bill): the first
+#                                  accepted vote of the shard, for the double-vote check)
+
+MAGIC = b"LAPART01"
+_META_LEN = struct.Struct("<I")
+_COUNT = struct.Struct("<Q")
+COUNTER = struct.Struct("<qqq")
+PAIR = struct.Struct("<qqqqq")
+_ROWS_PER_READ = 4096
+
+Counter = tuple[int, int, int]
+# (legislator_id, bill_id, shard, offset, vote_type): tuple order is the merge order,
+# so the earliest vote of a pair (lowest shard, then offset) sorts first.
+PairVote = tuple[int, int, int, int, int]
+
+
+class PartialAggregateError(ValueError):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class PartialMeta:
+    # Orders shards of a split input; offsets are only compared within one shard.
+    shard: int
+    # Byte range of vote_results.csv covered by the partial ([start, end), end None = EOF).
+    start: int
+    end: int | None
+    processed: int
+    accepted: int
+    rejected: int
+    # Size of the shard's vote_results.csv, so the merge can check that the byte ranges
+    # of a shard cover [0, size). None for a compressed shard, which is mapped whole.
+    size: int | None = None
+
+
+def write_partial(
+    path: Path,
+    *,
+    meta: PartialMeta,
+    legislators: Iterable[Counter],
+    bills: Iterable[Counter],
+    pairs: Iterable[PairVote],
+) -> None:
+    """Write a partial atomically (tmp file + replace). Rows must already be sorted."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    encoded = json.dumps(asdict(meta), sort_keys=True).encode("utf-8")
+    try:
+        with tmp_path.open("wb") as f:
+            f.write(MAGIC)
+            f.write(_META_LEN.pack(len(encoded)))
+            f.write(encoded)
+            for rows, record in ((legislators, COUNTER), (bills, COUNTER), (pairs, PAIR)):
+                _write_section(f, rows, record)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _write_section(f: BinaryIO, rows: Iterable[tuple[int, ...]], record: struct.Struct) -> None:
+    count_offset = f.tell()
+    f.write(_COUNT.pack(0))  # patched below
+    count = 0
+    for row in rows:
+        f.write(record.pack(*row))
+        count += 1
+    end = f.tell()
+    f.seek(count_offset)
+    f.write(_COUNT.pack(count))
+    f.seek(end)
+
+
+class PartialAggregateReader:
+    """Streams the sections of a partial; each iterator opens its own file handle."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with path.open("rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise PartialAggregateError(f"Not a partial aggregate file: {path}")
+            (meta_len,) = _META_LEN.unpack(f.read(_META_LEN.size))
+            self.meta = PartialMeta(**json.loads(f.read(meta_len).decode("utf-8")))
+            self._sections: list[tuple[int, int]] = []
+            for record in (COUNTER, COUNTER, PAIR):
+                head = f.read(_COUNT.size)
+                if len(head) != _COUNT.size:
+                    raise PartialAggregateError(f"Truncated partial aggregate file: {path}")
+                (count,) = _COUNT.unpack(head)
+                self._sections.append((f.tell(), count))
+                f.seek(count * record.size, os.SEEK_CUR)
+            if f.tell() != os.fstat(f.fileno()).st_size:
+                raise PartialAggregateError(f"Truncated or corrupt partial aggregate file: {path}")
+
+    def _iter(self, section: int, record: struct.Struct) -> Iterator[tuple[int, ...]]:
+        offset, count = self._sections[section]
+        with self.path.open("rb") as f:
+            f.seek(offset)
+            remaining = count
+            while remaining:
+                n = min(remaining, _ROWS_PER_READ)
+                yield from record.iter_unpack(f.read(n * record.size))
+                remaining -= n
+
+    def iter_legislators(self) -> Iterator[tuple[int, ...]]:
+        return self._iter(0, COUNTER)
+
+    def iter_bills(self) -> Iterator[tuple[int, ...]]:
+        return self._iter(1, COUNTER)
+
+    def iter_pairs(self) -> Iterator[tuple[int, ...]]:
+        return self._iter(2, PAIR)
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import os
+import struct
+from collections.abc import Iterator
+from pathlib import Path
+from types import TracebackType
+from typing import BinaryIO
+
+# Compact binary snapshot of a previous run's reports, used by diff mode.
+#
+# Layout (little-endian):
+#   magic b"LASTATE1"
+#   section*: u16 name length | name (utf-8) | u64 row count | rows
+#   row: i64 entity id | u64 content hash          (16 bytes, ascending id)
+#
+# Only ids + hashes are stored: enough to tell added/removed/changed rows apart
+# without re-parsing the previous CSVs.
+
+MAGIC = b"LASTATE1"
+_SECTION_HEAD = struct.Struct("<H")
+_COUNT = struct.Struct("<Q")
+_ROW = struct.Struct("<qQ")
+_ROWS_PER_READ = 4096
+
+
+class ReportStateError(ValueError):
+    pass
+
+
+class ReportStateWriter:
+    """
+    Streams sections of (id, hash) rows to `path`. The file is written next to the
+    target and atomically moved into place on a clean exit, so a failed run never
+    clobbers the previous snapshot.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._tmp_path = path.with_name(path.name + ".tmp")
+        self._f: BinaryIO | None = None
+        self._count_offset: int | None = None
+        self._count = 0
+
+    def __enter__(self) -> ReportStateWriter:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._f = self._tmp_path.open("wb")
+        self._f.write(MAGIC)
+        return self
+
+    def begin_section(self, name: str) -> None:
+        f = self._require_open()
+        self._end_section()
+        encoded = name.encode("utf-8")
+        f.write(_SECTION_HEAD.pack(len(encoded)))
+        f.write(encoded)
+        self._count_offset = f.tell()
+        f.write(_COUNT.pack(0))  # patched in _end_section
+        self._count = 0
+
+    def add(self, entity_id: int, content_hash: int) -> None:
+        if self._count_offset is None:
+            raise ReportStateError("add() called before begin_section()")
+        self._require_open().write(_ROW.pack(entity_id, content_hash))
+        self._count += 1
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        f = self._require_open()
+        if exc_type is None:
+            self._end_section()
+        f.close()
+        self._f = None
+        if exc_type is None:
+            os.replace(self._tmp_path, self._path)
+        else:
+            self._tmp_path.unlink(missing_ok=True)
+
+    def _end_section(self) -> None:
+        if self._count_offset is None:
+            return
+        f = self._require_open()
+        end = f.tell()
+        f.seek(self._count_offset)
+        f.write(_COUNT.pack(self._count))
+        f.seek(end)
+        self._count_offset = None
+
+    def _require_open(self) -> BinaryIO:
+        if self._f is None:
+            raise ReportStateError("ReportStateWriter is not open")
+        return self._f
+
+
+def iter_report_state(path: Path, section: str) -> Iterator[tuple[int, int]]:
+    """
+    Stream (id, hash) rows of one section. A missing file or section yields nothing
+    (first run: every row is "added").
+    """
+    if not path.exists():
+        return
+    with path.open("rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ReportStateError(f"Not a report state file: {path}")
+        while True:
+            head = f.read(_SECTION_HEAD.size)
+            if not head:
+                return
+            (name_len,) = _SECTION_HEAD.unpack(head)
+            name = f.read(name_len).decode("utf-8")
+            (count,) = _COUNT.unpack(f.read(_COUNT.size))
+            if name != section:
+                f.seek(count * _ROW.size, os.SEEK_CUR)
+                continue
+            remaining = count
+            while remaining:
+                n = min(remaining, _ROWS_PER_READ)
+                buf = f.read(n * _ROW.size)
+                if len(buf) != n * _ROW.size:
+                    raise ReportStateError(f"Truncated report state file: {path}")
+                yield from _ROW.iter_unpack(buf)
+                remaining -= n
+            return
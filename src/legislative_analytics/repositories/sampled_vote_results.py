@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import csv
+import math
+import random
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+from legislative_analytics.domain.entities import VoteResult
+from legislative_analytics.repositories.compressed_io import is_compressed
+from legislative_analytics.repositories.csv_repositories import parse_vote_result
+from legislative_analytics.repositories.interfaces import IVoteResultRepository
+
+# Byte-range reads of vote_results.csv (preview blocks, map shards).
+#
+# A line belongs to the range holding its first byte, so adjacent ranges cover
+# every line exactly once and reading a range is a seek + readlines: no prefix of
+# the file is scanned. The file is cut into fixed-size ranges ("blocks") for sampling.
+
+_LINES_PER_PARSE = 4096
+
+
+def block_count(size: int, block_size: int) -> int:
+    return max(1, -(-size // block_size))
+
+
+def sample_blocks(
+    csv_path: Path, *, block_size: int, fraction: float, seed: int | None = None
+) -> tuple[list[int], int]:
+    """
+    Pick ceil(fraction * blocks) distinct blocks uniformly at random (at least 2
+    when the file has 2+ blocks, so a variance can be estimated). Returns the
+    ascending block start offsets and the total number of blocks.
+    """
+    if not 0 < fraction <= 1:
+        raise ValueError(f"fraction must be in (0, 1]: {fraction}")
+    if is_compressed(csv_path):
+        raise ValueError(f"Block sampling needs a seekable, uncompressed file: {csv_path}")
+    total = block_count(csv_path.stat().st_size, block_size)
+    k = min(total, max(2, math.ceil(round(fraction * total, 9))))
+    picked = random.Random(seed).sample(range(total), k)
+    return sorted(b * block_size for b in picked), total
+
+
+def iter_positioned_vote_results(
+    csv_path: Path, start: int = 0, end: int | None = None
+) -> Iterator[tuple[int, VoteResult]]:
+    """
+    (byte offset of the line, row) for every line of `csv_path` that starts in
+    [start, end) (`end=None`: to the end of file). Offsets are comparable across
+    ranges of the same file.
+    """
+    with csv_path.open("rb") as f:
+        header_line = f.readline()
+        data_start = f.tell()
+        fieldnames = next(csv.reader([header_line.decode("utf-8")]))
+        if start <= data_start:
+            f.seek(data_start)
+        else:
+            # Finish the line owning byte `start - 1`; the next line starts in this range.
+            f.seek(start - 1)
+            f.readline()
+        offsets: list[int] = []
+        lines: list[str] = []
+        while end is None or f.tell() < end:
+            offset = f.tell()
+            line = f.readline()
+            if not line:
+                break
+            offsets.append(offset)
+            lines.append(line.decode("utf-8"))
+            if len(lines) == _LINES_PER_PARSE:
+                yield from _parse(offsets, lines, fieldnames)
+                offsets, lines = [], []
+        yield from _parse(offsets, lines, fieldnames)
+
+
+def _parse(
+    offsets: list[int], lines: list[str], fieldnames: list[str]
+) -> Iterator[tuple[int, VoteResult]]:
+    rows = csv.DictReader(lines, fieldnames=fieldnames)
+    return zip(offsets, map(parse_vote_result, rows), strict=True)
+
+
+@dataclass(frozen=True, slots=True)
+class BlockSampledVoteResultRepository(IVoteResultRepository):
+    """vote_results.csv restricted to the lines owned by the blocks at `block_starts`."""
+
+    csv_path: Path
+    block_starts: Sequence[int]
+    block_size: int
+
+    def iter_vote_results(self) -> Iterable[VoteResult]:
+        for start in self.block_starts:
+            end = start + self.block_size
+            for _, vr in iter_positioned_vote_results(self.csv_path, start, end):
+                yield vr
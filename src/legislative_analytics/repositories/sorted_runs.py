@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from pathlib import Path
+
+
+def reduce_runs(
+    runs: list[Path], *, fan_in: int, merge: Callable[[list[Path], Path], None]
+) -> list[Path]:
+    """
+    Merge sorted run files in passes of at most `fan_in` files (consecutive, so stable)
+    until the final merge can open every remaining run at once.
+    `merge(group, out)` writes the merge of `group` to `out`; merged runs are deleted.
+    """
+    depth = 0
+    while len(runs) > fan_in:
+        merged: list[Path] = []
+        for j in range(0, len(runs), fan_in):
+            group = runs[j : j + fan_in]
+            out = group[0].with_name(f"merge{depth}-{j}.{group[0].name}")
+            merge(group, out)
+            for path in group:
+                path.unlink()
+            merged.append(out)
+        runs = merged
+        depth += 1
+    return runs
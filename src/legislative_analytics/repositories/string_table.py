@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator, Mapping
+from itertools import pairwise
+
+# Dictionary-encoded strings for dimension tables (legislator names, bill titles).
+#
+# Every string lives in one contiguous UTF-8 buffer; `offsets[i]:offsets[i + 1]` is
+# the string of dense ordinal i (entities in ascending id order). Strings are only
+# decoded when read, so building a table costs one buffer instead of one str object
+# per entity, and report rows decode exactly the names they write.
+
+
+class StringTable:
+    __slots__ = ("_buffer", "_offsets")
+
+    def __init__(self, buffer: bytes | bytearray, offsets: array[int]) -> None:
+        if len(offsets) == 0 or offsets[0] != 0 or offsets[-1] != len(buffer):
+            raise ValueError("offsets must start at 0 and end at len(buffer)")
+        # A view pins a bytearray's size, so builders can hand theirs over uncopied.
+        self._buffer = memoryview(buffer)
+        self._offsets = offsets
+
+    @classmethod
+    def from_strings(cls, strings: Iterable[str]) -> StringTable:
+        buffer = bytearray()
+        offsets = array("q", [0])
+        for s in strings:
+            buffer += s.encode("utf-8")
+            offsets.append(len(buffer))
+        return cls(buffer, offsets)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, ordinal: int) -> str:
+        if not 0 <= ordinal < len(self):
+            raise IndexError(ordinal)
+        return str(self._buffer[self._offsets[ordinal] : self._offsets[ordinal + 1]], "utf-8")
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._buffer) + self._offsets.itemsize * len(self._offsets)
+
+
+class EncodedStrings(Mapping[int, str]):
+    """
+    Read-only id -> string map over a `StringTable`. Ids are kept ascending in an
+    `array("q")`, so an id's dense ordinal is its position there (binary search) and
+    no per-entity Python objects are held besides the decoded strings handed out.
+    """
+
+    __slots__ = ("_ids", "table")
+
+    def __init__(self, ids: Iterable[int], table: StringTable) -> None:
+        self._ids = array("q", ids)
+        if len(self._ids) != len(table):
+            raise ValueError("ids and strings must have the same length")
+        if any(a >= b for a, b in pairwise(self._ids)):
+            raise ValueError("ids must be unique and ascending")
+        self.table = table
+
+    @classmethod
+    def from_items(cls, items: Iterable[tuple[int, str]]) -> EncodedStrings:
+        """Like `dict(items)` (a repeated id keeps its last string), encoded in id order."""
+        ids = array("q")
+        buffer = bytearray()
+        offsets = array("q", [0])
+        for entity_id, s in items:
+            ids.append(entity_id)
+            buffer += s.encode("utf-8")
+            offsets.append(len(buffer))
+        if all(a < b for a, b in pairwise(ids)):
+            return cls(ids, StringTable(buffer, offsets))
+
+        # Out of order or repeated ids: re-encode in id order, keeping the last string.
+        order = sorted(range(len(ids)), key=ids.__getitem__)
+        kept = [i for i, j in pairwise([*order, -1]) if j == -1 or ids[i] != ids[j]]
+        view = memoryview(buffer)
+        sorted_buffer = bytearray()
+        sorted_offsets = array("q", [0])
+        for i in kept:
+            sorted_buffer += view[offsets[i] : offsets[i + 1]]
+            sorted_offsets.append(len(sorted_buffer))
+        view.release()
+        return cls((ids[i] for i in kept), StringTable(sorted_buffer, sorted_offsets))
+
+    @property
+    def nbytes(self) -> int:
+        return self.table.nbytes + self._ids.itemsize * len(self._ids)
+
+    def ordinal(self, entity_id: int) -> int:
+        i = bisect_left(self._ids, entity_id)
+        if i == len(self._ids) or self._ids[i] != entity_id:
+            raise KeyError(entity_id)
+        return i
+
+    def __getitem__(self, entity_id: int) -> str:
+        return self.table[self.ordinal(entity_id)]
+
+    def __contains__(self, entity_id: object) -> bool:
+        if not isinstance(entity_id, int):
+            return False
+        i = bisect_left(self._ids, entity_id)
+        return i != len(self._ids) and self._ids[i] == entity_id
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import logging
+from collections import deque
 from collections.abc import Iterable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Generic, TypeVar
 
 from legislative_analytics.domain.entities import VoteResult
 from legislative_analytics.repositories.interfaces import (
@@ -10,14 +13,78 @@ from legislative_analytics.repositories.interfaces import (
     IVoteRepository,
     IVoteResultRepository,
 )
+from legislative_analytics.repositories.lookups import legislator_name_by_id, vote_id_to_bill_id
+from legislative_analytics.repositories.validation_rules import (
+    DEFAULT_BATCH_SIZE,
+    RuleContext,
+    RuleEngine,
+    VoteResultRule,
+    default_rules,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class IngestionLimits:
+    """
+    Circuit breakers: stop the scan as soon as the input is clearly corrupt
+    (e.g. a shifted column making every legislator_id unknown).
+    `None` disables a limit.
+    """
+
+    max_rejects: int | None = None
+    max_reject_ratio: float | None = None
+    # The ratio is only checked once this many rows were processed.
+    warmup_rows: int = 1000
+    max_double_votes: int | None = None
+
+    def __post_init__(self) -> None:
+        for name in ("max_rejects", "warmup_rows", "max_double_votes"):
+            value = getattr(self, name)
+            if value is not None and value < 0:
+                raise ValueError(f"{name} must be >= 0: {value}")
+        if self.max_reject_ratio is not None and not 0 <= self.max_reject_ratio <= 1:
+            raise ValueError(f"max_reject_ratio must be between 0 and 1: {self.max_reject_ratio}")
+
+
+@dataclass(frozen=True, slots=True)
+class IngestionSummary:
+    processed: int
+    accepted: int
+    rejected: int
+    rejected_by_reason: dict[str, int]
+
+
+@dataclass(slots=True)
+class IngestionTotals:
+    """
+    Running counts shared by the validators of one logical input split over several
+    scans (e.g. `--memory-limit` partitions), so the circuit breakers see the whole
+    input instead of each scan on its own.
+    """
+
+    processed: int = 0
+    rejected_by_reason: dict[str, int] = field(default_factory=dict)
+
+
+class IngestionAborted(RuntimeError):
+    def __init__(self, reason: str, summary: IngestionSummary) -> None:
+        super().__init__(
+            f"{reason} after {summary.processed} rows "
+            f"(accepted={summary.accepted}, rejected={summary.rejected}, "
+            f"by_reason={summary.rejected_by_reason})"
+        )
+        self.reason = reason
+        self.summary = summary
 
 
 @dataclass(frozen=True, slots=True)
 class ValidatingVoteResultRepository(IVoteResultRepository):
     """
     Defensive Data Ingestion:
-    - Enforces referential integrity and business rules in-memory
+    - Enforces referential integrity and business rules in-memory, via the batched
+      `RuleEngine` (see `validation_rules.py`)
     - Logs failures and skips invalid records (fail fast and loud, but don't crash)
+    - Aborts with `IngestionAborted` once a configured `IngestionLimits` is exceeded
     """
 
     inner: IVoteResultRepository
@@ -25,97 +92,138 @@ class ValidatingVoteResultRepository(IVoteResultRepository):
     votes: IVoteRepository
     logger: logging.Logger = logging.getLogger(
         "legislative_analytics.ingestion")
+    limits: IngestionLimits = IngestionLimits()
+    # Checks run in this order; the first failing rule names the rejection.
+    rules: tuple[VoteResultRule, ...] = field(default_factory=default_rules)
+    batch_size: int = DEFAULT_BATCH_SIZE
+    # Optional CSV receiving every rejected row + the rule that rejected it.
+    dead_letter: Path | None = None
+    # Limits are checked against these totals (plus this scan) when set.
+    shared_totals: IngestionTotals | None = None
+    # False when an earlier validator sharing `shared_totals` already counted these
+    # rows as processed: only this scan's rejections are added.
+    counts_rows: bool = True
+
+    def _check_limits(self, *, processed: int, rejected_by_reason: dict[str, int]) -> None:
+        limits = self.limits
+        rejected = sum(rejected_by_reason.values())
+        accepted = processed - rejected
+        reason: str | None = None
+        if limits.max_rejects is not None and rejected > limits.max_rejects:
+            reason = f"rejected rows exceeded {limits.max_rejects}"
+        elif (
+            limits.max_reject_ratio is not None
+            and processed >= limits.warmup_rows
+            and rejected / processed > limits.max_reject_ratio
+        ):
+            reason = (
+                f"reject ratio {rejected / processed:.2%} "
+                f"exceeded {limits.max_reject_ratio:.2%}"
+            )
+        elif (
+            limits.max_double_votes is not None
+            and rejected_by_reason.get("double_vote", 0) > limits.max_double_votes
+        ):
+            reason = f"double votes exceeded {limits.max_double_votes}"
+        if reason is None:
+            return
+
+        summary = IngestionSummary(
+            processed=processed,
+            accepted=accepted,
+            rejected=rejected,
+            rejected_by_reason=dict(rejected_by_reason),
+        )
+        self.logger.error(
+            "ingestion.abort",
+            extra={
+                "component": "ValidatingVoteResultRepository",
+                "reason": reason,
+                "processed": processed,
+                "accepted": accepted,
+                "rejected": rejected,
+            },
+        )
+        raise IngestionAborted(reason, summary)
 
     def iter_vote_results(self) -> Iterable[VoteResult]:
         self.logger.info("ingestion.entry", extra={
                          "component": "ValidatingVoteResultRepository"})
 
-        legislator_ids = {l.id for l in self.legislators.iter_legislators()}
-        vote_id_to_bill_id = {v.id: v.bill_id for v in self.votes.iter_votes()}
-
-        seen_legislator_bill: set[tuple[int, int]] = set()
+        ctx = RuleContext(
+            legislator_ids=legislator_name_by_id(self.legislators).keys(),
+            vote_to_bill=vote_id_to_bill_id(self.votes),
+        )
+        engine = RuleEngine(self.rules, batch_size=self.batch_size, dead_letter=self.dead_letter)
+        log_levels = {rule.name: rule.log_level for rule in self.rules}
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        shared = self.shared_totals or IngestionTotals()
+        # Rows already counted by earlier scans sharing `shared_totals`.
+        base_processed = shared.processed if self.counts_rows else 0
+        # Rejects only trip the ratio breaker once warm-up is over: check it when warm-up
+        # ends even if that row is accepted (and again at the end of the scan).
+        ratio_check_at = (
+            self.limits.warmup_rows - base_processed
+            if self.limits.max_reject_ratio is not None and self.counts_rows
+            else -1
+        )
 
         processed = 0
         accepted = 0
         rejected = 0
+        rejected_by_reason = {rule.name: 0 for rule in self.rules}
 
-        for vr in self.inner.iter_vote_results():
-            processed += 1
-            self.logger.debug(
-                "ingestion.validation.start",
-                extra={
-                    "vote_result_id": vr.id,
-                    "legislator_id": vr.legislator_id,
-                    "vote_id": vr.vote_id,
-                },
+        def check_limits() -> None:
+            totals = dict(shared.rejected_by_reason)
+            for name, count in rejected_by_reason.items():
+                totals[name] = totals.get(name, 0) + count
+            self._check_limits(
+                processed=shared.processed + (processed if self.counts_rows else 0),
+                rejected_by_reason=totals,
             )
 
-            # Extra safety: vote_id must exist to identify bill_id.
-            bill_id = vote_id_to_bill_id.get(vr.vote_id)
-            if bill_id is None:
-                rejected += 1
-                self.logger.warning(
-                    "ingestion.validation.fail.missing_vote_id",
-                    extra={
-                        "vote_result_id": vr.id,
-                        "vote_id": vr.vote_id,
-                    },
-                )
-                continue
-
-            # Check 1: legislator_id exists
-            if vr.legislator_id not in legislator_ids:
-                rejected += 1
-                self.logger.warning(
-                    "ingestion.validation.fail.unknown_legislator",
-                    extra={
-                        "vote_result_id": vr.id,
-                        "legislator_id": vr.legislator_id,
-                        "bill_id": bill_id,
-                        "vote_id": vr.vote_id,
-                    },
-                )
-                continue
-
-            # Check 2: no double-voting per bill
-            key = (vr.legislator_id, bill_id)
-            if key in seen_legislator_bill:
-                rejected += 1
-                self.logger.error(
-                    "ingestion.validation.fail.double_vote",
-                    extra={
-                        "vote_result_id": vr.id,
-                        "legislator_id": vr.legislator_id,
-                        "bill_id": bill_id,
-                        "vote_id": vr.vote_id,
-                    },
-                )
-                continue
-
-            seen_legislator_bill.add(key)
-            accepted += 1
-            self.logger.debug(
-                "ingestion.validation.ok",
-                extra={
-                    "vote_result_id": vr.id,
-                    "legislator_id": vr.legislator_id,
-                    "bill_id": bill_id,
-                    "vote_id": vr.vote_id,
-                },
-            )
+        with engine:
+            for batch, reasons in engine.run(self.inner.iter_vote_results(), ctx):
+                for vr, bill_id, reason in zip(batch.rows, batch.bill_id, reasons, strict=True):
+                    processed += 1
+                    row_extra = (
+                        {
+                            "vote_result_id": vr.id,
+                            "legislator_id": vr.legislator_id,
+                            "bill_id": bill_id,
+                            "vote_id": vr.vote_id,
+                        }
+                        if debug or reason is not None
+                        else None
+                    )
+                    if debug:
+                        self.logger.debug("ingestion.validation.start", extra=row_extra)
 
-            # "Persistence" in this pipeline is yielding to downstream processing.
-            self.logger.debug(
-                "ingestion.persistence.emit",
-                extra={
-                    "vote_result_id": vr.id,
-                    "legislator_id": vr.legislator_id,
-                    "bill_id": bill_id,
-                    "vote_id": vr.vote_id,
-                },
-            )
-            yield vr
+                    if reason is not None:
+                        rejected += 1
+                        rejected_by_reason[reason] += 1
+                        self.logger.log(
+                            log_levels[reason],
+                            f"ingestion.validation.fail.{reason}",
+                            extra=row_extra,
+                        )
+                        check_limits()
+                        continue
 
+                    accepted += 1
+                    if processed == ratio_check_at:
+                        check_limits()
+                    if debug:
+                        self.logger.debug("ingestion.validation.ok", extra=row_extra)
+                        # "Persistence" in this pipeline is yielding to downstream processing.
+                        self.logger.debug("ingestion.persistence.emit", extra=row_extra)
+                    yield vr
+
+        check_limits()
+        if self.counts_rows:
+            shared.processed += processed
+        for name, count in rejected_by_reason.items():
+            shared.rejected_by_reason[name] = shared.rejected_by_reason.get(name, 0) + count
         self.logger.info(
             "ingestion.exit",
             extra={
@@ -123,5 +231,33 @@ class ValidatingVoteResultRepository(IVoteResultRepository):
                 "processed": processed,
                 "accepted": accepted,
                 "rejected": rejected,
+                "rejected_by_reason": rejected_by_reason,
             },
         )
+
+
+T = TypeVar("T")
+
+
+class TaggedVoteResults(IVoteResultRepository, Generic[T]):
+    """
+    Feeds tagged rows to the validator and recovers the tag of each row it accepts
+    (the validator keeps order, so pending rows are matched by identity).
+    """
+
+    def __init__(self, rows: Iterable[tuple[T, VoteResult]]) -> None:
+        self._rows = rows
+        self._pending: deque[tuple[T, VoteResult]] = deque()
+        self.processed = 0
+
+    def iter_vote_results(self) -> Iterable[VoteResult]:
+        for tag, vr in self._rows:
+            self.processed += 1
+            self._pending.append((tag, vr))
+            yield vr
+
+    def tag_of(self, accepted: VoteResult) -> T:
+        while True:
+            tag, vr = self._pending.popleft()
+            if vr is accepted:
+                return tag
@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+import csv
+import logging
+from collections.abc import Callable, Collection, Hashable, Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from itertools import islice
+from operator import itemgetter
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Protocol, TextIO, TypeVar
+
+from legislative_analytics.domain.entities import VoteResult
+
+# Column-batch validation for vote_results.
+#
+# Rows are validated a batch at a time: each rule sees the batch as columns and
+# returns the positions it rejects. Predicates are written as whole-column
+# operations (`map` over a column with a set's `__contains__`, first-occurrence
+# dedupe via a reversed dict build) so the per-row work runs in C instead of
+# in per-row Python branches.
+
+DEFAULT_BATCH_SIZE = 4096
+
+V = TypeVar("V")
+
+_DEAD_LETTER_FIELDS = ["id", "legislator_id", "vote_id", "vote_type", "rule"]
+
+
+@dataclass(slots=True)
+class VoteResultBatch:
+    rows: list[VoteResult]
+    id: list[int]
+    legislator_id: list[int]
+    vote_id: list[int]
+    vote_type: list[int]
+    # None when vote_id is not in votes.csv.
+    bill_id: list[int | None]
+
+    @classmethod
+    def from_rows(cls, rows: list[VoteResult], vote_to_bill: Mapping[int, int]) -> VoteResultBatch:
+        vote_id = [vr.vote_id for vr in rows]
+        return cls(
+            rows=rows,
+            id=[vr.id for vr in rows],
+            legislator_id=[vr.legislator_id for vr in rows],
+            vote_id=vote_id,
+            vote_type=[vr.vote_type for vr in rows],
+            bill_id=list(map(vote_to_bill.get, vote_id)),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class RuleContext:
+    legislator_ids: Collection[int]
+    vote_to_bill: Mapping[int, int]
+
+
+def _gather(column: Sequence[V], positions: list[int]) -> list[V]:
+    if not positions:
+        return []
+    if len(positions) == 1:
+        return [column[positions[0]]]
+    return list(itemgetter(*positions)(column))
+
+
+def _reject_not_in(column: list[V], positions: list[int], allowed: Collection[object]) -> list[int]:
+    """Positions whose value is not in `allowed` (vectorized `isin`)."""
+    ok = map(allowed.__contains__, _gather(column, positions))
+    return [p for p, keep in zip(positions, ok, strict=True) if not keep]
+
+
+def _reject_repeats(
+    keys: Sequence[Hashable], positions: list[int], seen: set[object]
+) -> list[int]:
+    """
+    Keep the first occurrence of each key (in row order) unless it was seen in an
+    earlier batch; reject every other position. Updates `seen`.
+    """
+    # Building from the reversed sequence leaves each key mapped to its first position.
+    first_pos = dict(zip(reversed(keys), reversed(positions), strict=True))
+    kept = {p for k, p in first_pos.items() if k not in seen}
+    seen.update(first_pos.keys())
+    return [p for p in positions if p not in kept]
+
+
+# Receives the positions still alive after earlier rules (ascending) and returns the
+# ones it rejects.
+RuleCheck = Callable[[VoteResultBatch, list[int]], list[int]]
+
+
+class VoteResultRule(Protocol):
+    """
+    A validation rule, declared once and evaluated per batch.
+
+    `start` is called at the beginning of every scan and returns that scan's check.
+    Per-scan state (e.g. the keys seen so far) lives in the returned check, never on
+    the rule, so concurrent scans sharing a rule do not interfere.
+    """
+
+    name: str
+    log_level: int
+
+    def start(self, ctx: RuleContext) -> RuleCheck: ...
+
+
+class KnownVoteRule:
+    """vote_id must exist in votes.csv (needed to resolve bill_id)."""
+
+    name = "missing_vote_id"
+    log_level = logging.WARNING
+
+    def start(self, ctx: RuleContext) -> RuleCheck:
+        return self.check
+
+    def check(self, batch: VoteResultBatch, positions: list[int]) -> list[int]:
+        return [p for p in positions if batch.bill_id[p] is None]
+
+
+class KnownLegislatorRule:
+    name = "unknown_legislator"
+    log_level = logging.WARNING
+
+    def start(self, ctx: RuleContext) -> RuleCheck:
+        legislator_ids = ctx.legislator_ids
+
+        def check(batch: VoteResultBatch, positions: list[int]) -> list[int]:
+            return _reject_not_in(batch.legislator_id, positions, legislator_ids)
+
+        return check
+
+
+class NoDoubleVoteRule:
+    """A legislator votes at most once per bill (even across different vote_ids)."""
+
+    name = "double_vote"
+    log_level = logging.ERROR
+
+    def start(self, ctx: RuleContext) -> RuleCheck:
+        seen: set[object] = set()
+
+        def check(batch: VoteResultBatch, positions: list[int]) -> list[int]:
+            keys = list(
+                zip(
+                    _gather(batch.legislator_id, positions),
+                    _gather(batch.bill_id, positions),
+                    strict=True,
+                )
+            )
+            return _reject_repeats(keys, positions, seen)
+
+        return check
+
+
+class UniqueVoteResultIdRule:
+    name = "duplicate_vote_result_id"
+    log_level = logging.ERROR
+
+    def start(self, ctx: RuleContext) -> RuleCheck:
+        seen: set[object] = set()
+
+        def check(batch: VoteResultBatch, positions: list[int]) -> list[int]:
+            return _reject_repeats(_gather(batch.id, positions), positions, seen)
+
+        return check
+
+
+class VoteTypeRule:
+    name = "vote_type_out_of_range"
+    log_level = logging.WARNING
+
+    def __init__(self, allowed: Iterable[int]) -> None:
+        self._allowed = frozenset(allowed)
+
+    def start(self, ctx: RuleContext) -> RuleCheck:
+        return self.check
+
+    def check(self, batch: VoteResultBatch, positions: list[int]) -> list[int]:
+        return _reject_not_in(batch.vote_type, positions, self._allowed)
+
+
+class PositiveIdsRule:
+    """id, legislator_id and vote_id must be positive integers."""
+
+    name = "non_positive_id"
+    log_level = logging.WARNING
+
+    def start(self, ctx: RuleContext) -> RuleCheck:
+        return self.check
+
+    def check(self, batch: VoteResultBatch, positions: list[int]) -> list[int]:
+        ids = _gather(batch.id, positions)
+        legislators = _gather(batch.legislator_id, positions)
+        votes = _gather(batch.vote_id, positions)
+        return [
+            p
+            for p, a, b, c in zip(positions, ids, legislators, votes, strict=True)
+            if min(a, b, c) <= 0
+        ]
+
+
+def default_rules() -> tuple[VoteResultRule, ...]:
+    """The original checks, in their original precedence."""
+    return (KnownVoteRule(), KnownLegislatorRule(), NoDoubleVoteRule())
+
+
+def ordered_rules(extra: Iterable[VoteResultRule]) -> tuple[VoteResultRule, ...]:
+    """
+    Default rules plus `extra`. Stateless extras run before the stateful dedupe rules,
+    so a row rejected for e.g. its vote_type never "uses up" its (legislator, bill) slot.
+    """
+    extra = tuple(extra)
+    stateless = [r for r in extra if not isinstance(r, (UniqueVoteResultIdRule, NoDoubleVoteRule))]
+    unique_ids = [r for r in extra if isinstance(r, UniqueVoteResultIdRule)]
+    return (KnownVoteRule(), KnownLegislatorRule(), *stateless, *unique_ids, NoDoubleVoteRule())
+
+
+class RuleEngine:
+    """
+    Runs `rules` (in declared order) over batches of vote_results.
+
+    `run` yields each batch with a parallel list of rejection reasons (None = accepted).
+    Rejected rows are appended to the optional dead-letter CSV in bulk, once per batch.
+    """
+
+    def __init__(
+        self,
+        rules: Iterable[VoteResultRule],
+        *,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        dead_letter: Path | None = None,
+    ) -> None:
+        self.rules = tuple(rules)
+        self.batch_size = batch_size
+        self.rejected: dict[str, int] = {rule.name: 0 for rule in self.rules}
+        self._dead_letter_path = dead_letter
+        self._dead_letter_file: TextIO | None = None
+        self._dead_letter: Any = None  # csv writer
+
+    def __enter__(self) -> RuleEngine:
+        if self._dead_letter_path is not None:
+            self._dead_letter_path.parent.mkdir(parents=True, exist_ok=True)
+            self._dead_letter_file = self._dead_letter_path.open("w", newline="", encoding="utf-8")
+            self._dead_letter = csv.writer(self._dead_letter_file)
+            self._dead_letter.writerow(_DEAD_LETTER_FIELDS)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if self._dead_letter_file is not None:
+            self._dead_letter_file.close()
+            self._dead_letter_file = None
+            self._dead_letter = None
+
+    def evaluate(
+        self, batch: VoteResultBatch, checks: Sequence[tuple[str, RuleCheck]]
+    ) -> list[str | None]:
+        reasons: list[str | None] = [None] * len(batch.rows)
+        alive = list(range(len(batch.rows)))
+        for name, check in checks:
+            if not alive:
+                break
+            rejected = check(batch, alive)
+            if not rejected:
+                continue
+            self.rejected[name] += len(rejected)
+            for p in rejected:
+                reasons[p] = name
+            dropped = set(rejected)
+            alive = [p for p in alive if p not in dropped]
+        return reasons
+
+    def run(
+        self, rows: Iterable[VoteResult], ctx: RuleContext
+    ) -> Iterator[tuple[VoteResultBatch, list[str | None]]]:
+        # This scan's checks: their state dies with the generator.
+        checks = [(rule.name, rule.start(ctx)) for rule in self.rules]
+        it = iter(rows)
+        while chunk := list(islice(it, self.batch_size)):
+            batch = VoteResultBatch.from_rows(chunk, ctx.vote_to_bill)
+            reasons = self.evaluate(batch, checks)
+            if self._dead_letter is not None:
+                self._dead_letter.writerows(
+                    (vr.id, vr.legislator_id, vr.vote_id, vr.vote_type, reason)
+                    for vr, reason in zip(batch.rows, reasons, strict=True)
+                    if reason is not None
+                )
+            yield batch, reasons
@@ -0,0 +1,380 @@
+from __future__ import annotations
+
+import heapq
+import logging
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+from bisect import bisect_left
+from collections.abc import Collection, Iterable, Iterator, Mapping
+from contextlib import ExitStack
+from dataclasses import dataclass
+from operator import itemgetter
+from pathlib import Path
+from types import TracebackType
+
+from legislative_analytics.domain.entities import VoteResult
+from legislative_analytics.repositories.sorted_runs import reduce_runs
+
+# On-disk inverted index over (validated) vote_results, read through mmap.
+#
+# Layout (little-endian, every field 8 bytes so the arrays stay aligned):
+#   magic b"LAVIDX01"
+#   i64 source size | i64 source mtime_ns          (-1 when unknown)
+#   per section: u64 key count | u64 posting count   (sections: legislators, bills)
+#   per section, CSR arrays:
+#     keys      i64[key count]        ascending entity ids
+#     offsets   i64[key count + 1]    postings of keys[i] are [offsets[i], offsets[i+1])
+#     vote_id   i64[posting count]
+#     vote_type i64[posting count]
+#     peer_id   i64[posting count]    bill_id in the legislators section,
+#                                     legislator_id in the bills section
+#
+# Postings of one entity keep file order. A lookup is a binary search over `keys`
+# plus a slice of the posting arrays: O(log n + k), no CSV parsing.
+
+MAGIC = b"LAVIDX01"
+SECTIONS = ("legislators", "bills")
+_SOURCE = struct.Struct("<qq")
+_SECTION_HEAD = struct.Struct("<QQ")
+_HEADER_SIZE = len(MAGIC) + _SOURCE.size + len(SECTIONS) * _SECTION_HEAD.size
+_ITEM = 8
+_COLUMNS = ("vote_id", "vote_type", "peer_id")
+
+# Postings buffered per sorted run, and runs merged at once (see `build_vote_index`).
+DEFAULT_RUN_ROWS = 1 << 20
+MAX_OPEN_RUNS = 64
+
+logger = logging.getLogger("legislative_analytics.index")
+
+
+class VoteIndexError(ValueError):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class IndexedVote:
+    vote_id: int
+    vote_type: int
+    # bill_id for legislator lookups, legislator_id for bill lookups.
+    peer_id: int
+
+
+def _to_disk(values: array[int]) -> bytes:
+    if sys.byteorder != "little":
+        values = array("q", values)
+        values.byteswap()
+    return values.tobytes()
+
+
+# Sorted runs hold (key, vote_id, vote_type, peer_id) records, sorted by key and, for
+# equal keys, in file order; runs are numbered in file order so a stable merge keeps it.
+_RECORD = struct.Struct("<" + "q" * (1 + len(_COLUMNS)))
+_READ_RECORDS = 1 << 14
+
+
+class _RunWriter:
+    """Buffers one section's postings in arrays and spills them as sorted runs."""
+
+    def __init__(self, work: Path, name: str, run_rows: int) -> None:
+        self._work = work
+        self._name = name
+        self._run_rows = run_rows
+        self._keys = array("q")
+        self._columns = tuple(array("q") for _ in _COLUMNS)
+        self.runs: list[Path] = []
+        self.postings = 0
+
+    def append(self, key: int, vote_id: int, vote_type: int, peer_id: int) -> None:
+        self._keys.append(key)
+        for column, value in zip(self._columns, (vote_id, vote_type, peer_id), strict=True):
+            column.append(value)
+        self.postings += 1
+        if len(self._keys) >= self._run_rows:
+            self.spill()
+
+    def spill(self) -> None:
+        if not self._keys:
+            return
+        keys, columns = self._keys, self._columns
+        # Bounded by `run_rows`; `sorted` is stable, so equal keys keep file order.
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        records = array("q")
+        for row in order:
+            records.append(keys[row])
+            records.extend(column[row] for column in columns)
+        path = self._work / f"{self._name}.run{len(self.runs)}"
+        path.write_bytes(_to_disk(records))
+        self.runs.append(path)
+        self._keys = array("q")
+        self._columns = tuple(array("q") for _ in _COLUMNS)
+
+
+def _read_records(path: Path) -> Iterator[tuple[int, ...]]:
+    with path.open("rb") as f:
+        while chunk := f.read(_RECORD.size * _READ_RECORDS):
+            yield from _RECORD.iter_unpack(chunk)
+
+
+def _merge(runs: list[Path]) -> Iterator[tuple[int, ...]]:
+    return heapq.merge(*(_read_records(path) for path in runs), key=itemgetter(0))
+
+
+def _merge_into(group: list[Path], out: Path) -> None:
+    with out.open("wb") as f:
+        batch = array("q")
+        for record in _merge(group):
+            batch.extend(record)
+            if len(batch) >= _READ_RECORDS * (1 + len(_COLUMNS)):
+                f.write(_to_disk(batch))
+                batch = array("q")
+        f.write(_to_disk(batch))
+
+
+@dataclass(frozen=True, slots=True)
+class _SectionFiles:
+    keys: array[int]
+    offsets: array[int]
+    columns: tuple[Path, ...]
+    postings: int
+
+
+def _write_section(runs: list[Path], work: Path, name: str) -> _SectionFiles:
+    """
+    Merge the sorted runs into CSR form: keys/offsets stay in memory (one entry per
+    entity), the posting columns are streamed to one file each.
+    """
+    keys = array("q")
+    offsets = array("q")
+    paths = tuple(work / f"{name}.{column}" for column in _COLUMNS)
+    buffers = tuple(array("q") for _ in _COLUMNS)
+    postings = 0
+    with ExitStack() as stack:
+        files = [stack.enter_context(path.open("wb")) for path in paths]
+        for record in _merge(reduce_runs(runs, fan_in=MAX_OPEN_RUNS, merge=_merge_into)):
+            if not keys or record[0] != keys[-1]:
+                keys.append(record[0])
+                offsets.append(postings)
+            for buffer, value in zip(buffers, record[1:], strict=True):
+                buffer.append(value)
+            postings += 1
+            if len(buffers[0]) >= _READ_RECORDS:
+                for f, buffer in zip(files, buffers, strict=True):
+                    f.write(_to_disk(buffer))
+                    del buffer[:]
+        for f, buffer in zip(files, buffers, strict=True):
+            f.write(_to_disk(buffer))
+    offsets.append(postings)
+    return _SectionFiles(keys, offsets, paths, postings)
+
+
+def build_vote_index(
+    out_path: Path,
+    *,
+    vote_results: Iterable[VoteResult],
+    vote_to_bill: Mapping[int, int],
+    bill_ids: Collection[int] | None = None,
+    source: Path | None = None,
+    run_rows: int = DEFAULT_RUN_ROWS,
+) -> None:
+    """
+    Write the index for `vote_results` (normally the validated stream). Rows whose
+    vote_id has no bill, or whose bill is not in `bill_ids` (bills.csv, when given),
+    are kept in the legislators section only, matching the bill report. `source`
+    (the vote_results file) is fingerprinted so readers can detect a stale index.
+
+    Postings are external-sorted: at most `run_rows` of them are buffered before a
+    sorted run is spilled next to `out_path`, and the runs are merged into the file,
+    which is written next to `out_path` and atomically moved into place.
+    """
+    if run_rows < 1:
+        raise ValueError(f"run_rows must be >= 1: {run_rows}")
+    size, mtime_ns = -1, -1
+    if source is not None:
+        st = source.stat()
+        size, mtime_ns = st.st_size, st.st_mtime_ns
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = out_path.with_name(out_path.name + ".tmp")
+    with tempfile.TemporaryDirectory(prefix="legislative-index-", dir=out_path.parent) as tmp:
+        work = Path(tmp)
+        by_legislator = _RunWriter(work, "legislators", run_rows)
+        by_bill = _RunWriter(work, "bills", run_rows)
+        for vr in vote_results:
+            bill = vote_to_bill.get(vr.vote_id)
+            peer = -1 if bill is None else bill
+            by_legislator.append(vr.legislator_id, vr.vote_id, vr.vote_type, peer)
+            if bill is not None and (bill_ids is None or bill in bill_ids):
+                by_bill.append(bill, vr.vote_id, vr.vote_type, vr.legislator_id)
+        sections = []
+        for name, writer in (("legislators", by_legislator), ("bills", by_bill)):
+            writer.spill()
+            sections.append(_write_section(writer.runs, work, name))
+
+        try:
+            with tmp_path.open("wb") as f:
+                f.write(MAGIC)
+                f.write(_SOURCE.pack(size, mtime_ns))
+                for section in sections:
+                    f.write(_SECTION_HEAD.pack(len(section.keys), section.postings))
+                for section in sections:
+                    f.write(_to_disk(section.keys))
+                    f.write(_to_disk(section.offsets))
+                    for path in section.columns:
+                        with path.open("rb") as column:
+                            shutil.copyfileobj(column, f)
+            os.replace(tmp_path, out_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    logger.info(
+        "index.written",
+        extra={
+            "path": str(out_path),
+            "postings": by_legislator.postings,
+            "legislators": len(sections[0].keys),
+            "bills": len(sections[1].keys),
+        },
+    )
+
+
+class IndexSection:
+    """CSR view of one section (memoryviews into the mapped file)."""
+
+    def __init__(
+        self, keys: memoryview, offsets: memoryview, columns: dict[str, memoryview]
+    ) -> None:
+        self.keys = keys
+        self._offsets = offsets
+        self._vote_id = columns["vote_id"]
+        self._vote_type = columns["vote_type"]
+        self._peer_id = columns["peer_id"]
+
+    def release(self) -> None:
+        for view in (self.keys, self._offsets, self._vote_id, self._vote_type, self._peer_id):
+            view.release()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _span(self, entity_id: int) -> tuple[int, int]:
+        i = bisect_left(self.keys, entity_id)
+        if i == len(self.keys) or self.keys[i] != entity_id:
+            return 0, 0
+        return self._offsets[i], self._offsets[i + 1]
+
+    def count(self, entity_id: int) -> int:
+        """Number of indexed vote_results of the entity (0 when absent)."""
+        lo, hi = self._span(entity_id)
+        return hi - lo
+
+    def count_by_type(self, entity_id: int, vote_type: int) -> int:
+        lo, hi = self._span(entity_id)
+        return self._vote_type[lo:hi].tolist().count(vote_type)
+
+    def support_oppose(self, entity_id: int) -> tuple[int, int]:
+        lo, hi = self._span(entity_id)
+        types = self._vote_type[lo:hi].tolist()
+        return types.count(1), types.count(2)
+
+    def lookup(self, entity_id: int) -> list[IndexedVote]:
+        """Postings of the entity, in vote_results file order."""
+        lo, hi = self._span(entity_id)
+        return [
+            IndexedVote(vote_id=v, vote_type=t, peer_id=p)
+            for v, t, p in zip(
+                self._vote_id[lo:hi].tolist(),
+                self._vote_type[lo:hi].tolist(),
+                self._peer_id[lo:hi].tolist(),
+                strict=True,
+            )
+        ]
+
+
+class VoteIndex:
+    """
+    Read-only, memory-mapped index built by `build_vote_index`.
+
+        with VoteIndex(path) as index:
+            index.legislators.support_oppose(412)
+            index.bills.lookup(2900994)
+    """
+
+    def __init__(self, path: Path) -> None:
+        if sys.byteorder != "little":
+            raise VoteIndexError("VoteIndex can only be mapped on little-endian hosts")
+        self.path = path
+        with path.open("rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < _HEADER_SIZE:
+                raise VoteIndexError(f"Not a vote index file: {path}")
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._open_sections(size)
+        except BaseException:
+            self._mm.close()
+            raise
+
+    def _open_sections(self, size: int) -> None:
+        mm = self._mm
+        if mm[: len(MAGIC)] != MAGIC:
+            raise VoteIndexError(f"Not a vote index file: {self.path}")
+        self.source_size, self.source_mtime_ns = _SOURCE.unpack_from(mm, len(MAGIC))
+
+        heads = [
+            _SECTION_HEAD.unpack_from(mm, len(MAGIC) + _SOURCE.size + i * _SECTION_HEAD.size)
+            for i in range(len(SECTIONS))
+        ]
+        expected = _HEADER_SIZE + _ITEM * sum(
+            n_keys + (n_keys + 1) + len(_COLUMNS) * n_postings for n_keys, n_postings in heads
+        )
+        if size != expected:
+            raise VoteIndexError(f"Truncated or corrupt vote index file: {self.path}")
+
+        view = memoryview(mm)
+        pos = _HEADER_SIZE
+
+        def take(n: int) -> memoryview:
+            nonlocal pos
+            chunk = view[pos : pos + n * _ITEM].cast("q")
+            pos += n * _ITEM
+            return chunk
+
+        sections = []
+        for n_keys, n_postings in heads:
+            keys = take(n_keys)
+            offsets = take(n_keys + 1)
+            columns = {name: take(n_postings) for name in _COLUMNS}
+            sections.append(IndexSection(keys, offsets, columns))
+        self._view = view
+        self.legislators, self.bills = sections
+
+    def is_current(self, source: Path) -> bool:
+        """True when `source` still has the size/mtime it had when the index was built."""
+        st = source.stat()
+        return (st.st_size, st.st_mtime_ns) == (self.source_size, self.source_mtime_ns)
+
+    def close(self) -> None:
+        if self._mm.closed:
+            return
+        # Views into the map must be released before the map itself can close.
+        self.legislators.release()
+        self.bills.release()
+        self._view.release()
+        self._mm.close()
+
+    def __enter__(self) -> VoteIndex:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
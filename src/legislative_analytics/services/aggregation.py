@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import heapq
+from array import array
+from collections.abc import Callable, Collection, Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from legislative_analytics.domain.entities import VoteResult
+
+# Declarative group-by over the joined vote_result -> vote -> bill -> sponsor rows.
+#
+# A `GroupBySpec` names its group-by keys (dimensions below) and its measures
+# (filtered counts). Any number of specs are compiled into one fused scan over
+# vote_results; each spec keeps dense accumulators (one `array('q')` per measure,
+# indexed by group ordinal).
+
+# Group-by dimensions:
+#   legislator_id   voter (must exist in legislators.csv)
+#   bill_id         bill voted on, via vote_id (must exist in bills.csv)
+#   vote_id         the vote (must exist in votes.csv)
+#   sponsor_id      sponsor of the bill voted on (bill must exist in bills.csv;
+#                   None when the bill has no sponsor)
+#   vote_type       raw vote_type (1 = support, 2 = oppose, anything else kept as-is)
+#   own_bill        True when the voter sponsors the bill
+DIMENSIONS = ("legislator_id", "bill_id", "vote_id", "sponsor_id", "vote_type", "own_bill")
+
+# Single-key specs on these dimensions are seeded with every member of the table,
+# so entities without votes still get a zero row.
+_SEEDED = ("legislator_id", "bill_id", "vote_id")
+
+Key = Any
+
+_SKIP = object()
+
+
+@dataclass(frozen=True, slots=True)
+class Count:
+    """Count rows of the group, optionally only those with one of `vote_types`."""
+
+    name: str
+    vote_types: frozenset[int] | None = None
+
+    def __post_init__(self) -> None:
+        if self.vote_types is not None:
+            object.__setattr__(self, "vote_types", frozenset(self.vote_types))
+
+
+@dataclass(frozen=True, slots=True)
+class GroupBySpec:
+    name: str
+    keys: tuple[str, ...]
+    measures: tuple[Count, ...]
+
+    def __post_init__(self) -> None:
+        if not self.keys:
+            raise ValueError(f"GroupBySpec {self.name!r} needs at least one key")
+        unknown = [k for k in self.keys if k not in DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Unknown group-by dimension(s) {unknown} in {self.name!r}")
+        if not self.measures:
+            raise ValueError(f"GroupBySpec {self.name!r} needs at least one measure")
+
+
+@dataclass(frozen=True, slots=True)
+class JoinContext:
+    """Dimension lookups for the join. Maps not needed by the specs may be left empty."""
+
+    legislator_ids: Collection[int]
+    vote_to_bill: Mapping[int, int]
+    bill_ids: Collection[int] = ()
+    sponsor_by_bill: Mapping[int, int | None] = field(default_factory=dict)
+
+
+def _sortable(value: Key) -> tuple[int, Any]:
+    return (0, 0) if value is None else (1, value)
+
+
+def _sort_key(key: Key) -> Any:
+    if isinstance(key, tuple):
+        return tuple(_sortable(v) for v in key)
+    return _sortable(key)
+
+
+class GroupByResult:
+    """Dense accumulators of one spec: `keys[i]` is the group of slot i in every column."""
+
+    def __init__(
+        self,
+        spec: GroupBySpec,
+        keys: list[Key],
+        columns: dict[str, array[int]],
+        *,
+        ordered: bool,
+    ) -> None:
+        self.spec = spec
+        self.keys = keys
+        self.columns = columns
+        self._ordered = ordered
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _slots_in_key_order(self) -> Iterable[int]:
+        if self._ordered:
+            return range(len(self.keys))
+        return sorted(range(len(self.keys)), key=lambda i: _sort_key(self.keys[i]))
+
+    def rows(self) -> Iterator[tuple[Key, tuple[int, ...]]]:
+        """(group key, measure values in spec order), ascending by key."""
+        cols = [self.columns[m.name] for m in self.spec.measures]
+        for i in self._slots_in_key_order():
+            yield self.keys[i], tuple(c[i] for c in cols)
+
+    def top(self, k: int, *, by: str) -> list[tuple[Key, tuple[int, ...]]]:
+        """
+        Heap-based top-K by one measure: O(n log k), no full sort. Ties go to the
+        smallest key so rankings stay deterministic.
+        """
+        if by not in self.columns:
+            raise ValueError(f"Unknown measure: {by!r}")
+        if k <= 0:
+            return []
+        col = self.columns[by]
+        keys = self.keys
+        slots = heapq.nsmallest(k, range(len(keys)), key=lambda i: (-col[i], _sort_key(keys[i])))
+        cols = [self.columns[m.name] for m in self.spec.measures]
+        return [(keys[i], tuple(c[i] for c in cols)) for i in slots]
+
+
+def _key_extractor(dim: str, ctx: JoinContext) -> Callable[[VoteResult, int | None], Key]:
+    legislator_ids = ctx.legislator_ids
+    bill_ids = ctx.bill_ids
+    sponsor_by_bill = ctx.sponsor_by_bill
+    vote_to_bill = ctx.vote_to_bill
+
+    if dim == "legislator_id":
+        return lambda vr, bill_id: vr.legislator_id if vr.legislator_id in legislator_ids else _SKIP
+    if dim == "bill_id":
+        return lambda vr, bill_id: bill_id if bill_id is not None and bill_id in bill_ids else _SKIP
+    if dim == "vote_id":
+        return lambda vr, bill_id: vr.vote_id if vr.vote_id in vote_to_bill else _SKIP
+    # `sponsor_by_bill` holds every bill of bills.csv, so unknown bills are skipped
+    # here just like for the bill_id dimension.
+    if dim == "sponsor_id":
+        return lambda vr, bill_id: (
+            sponsor_by_bill[bill_id] if bill_id is not None and bill_id in sponsor_by_bill
+            else _SKIP
+        )
+    if dim == "vote_type":
+        return lambda vr, bill_id: vr.vote_type
+    if dim == "own_bill":
+        return lambda vr, bill_id: (
+            vr.legislator_id == sponsor_by_bill[bill_id]
+            if bill_id is not None and bill_id in sponsor_by_bill
+            else _SKIP
+        )
+    raise ValueError(f"Unknown group-by dimension: {dim!r}")
+
+
+class _Plan:
+    """One spec compiled against a join context."""
+
+    def __init__(self, spec: GroupBySpec, ctx: JoinContext) -> None:
+        self.spec = spec
+        extractors = [_key_extractor(k, ctx) for k in spec.keys]
+        if len(extractors) == 1:
+            self.key_of = extractors[0]
+        else:
+            def key_of(vr: VoteResult, bill_id: int | None) -> Key:
+                key = tuple(e(vr, bill_id) for e in extractors)
+                return _SKIP if _SKIP in key else key
+
+            self.key_of = key_of
+
+        self.keys: list[Key] = []
+        self.index: dict[Key, int] = {}
+        self.columns: list[array[int]] = [array("q") for _ in spec.measures]
+        self.seeded = len(spec.keys) == 1 and spec.keys[0] in _SEEDED
+        if self.seeded:
+            domain = {
+                "legislator_id": ctx.legislator_ids,
+                "bill_id": ctx.bill_ids,
+                "vote_id": ctx.vote_to_bill.keys(),
+            }[spec.keys[0]]
+            for key in sorted(domain):
+                self.add(key)
+        # vote_type -> accumulators to bump, memoized per distinct vote_type.
+        self._hits: dict[int, list[array[int]]] = {}
+
+    def add(self, key: Key) -> int:
+        slot = len(self.keys)
+        self.keys.append(key)
+        self.index[key] = slot
+        for col in self.columns:
+            col.append(0)
+        return slot
+
+    def hits(self, vote_type: int) -> list[array[int]]:
+        cols = self._hits.get(vote_type)
+        if cols is None:
+            cols = [
+                col
+                for m, col in zip(self.spec.measures, self.columns, strict=True)
+                if m.vote_types is None or vote_type in m.vote_types
+            ]
+            self._hits[vote_type] = cols
+        return cols
+
+    def result(self) -> GroupByResult:
+        return GroupByResult(
+            self.spec,
+            self.keys,
+            {m.name: col for m, col in zip(self.spec.measures, self.columns, strict=True)},
+            ordered=self.seeded,
+        )
+
+
+def run_group_by(
+    specs: Iterable[GroupBySpec],
+    *,
+    vote_results: Iterable[VoteResult],
+    ctx: JoinContext,
+) -> dict[str, GroupByResult]:
+    """Evaluate every spec in a single pass over `vote_results`."""
+    plans = [_Plan(spec, ctx) for spec in specs]
+    names = [p.spec.name for p in plans]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate GroupBySpec names: {names}")
+
+    vote_to_bill = ctx.vote_to_bill
+    for vr in vote_results:
+        bill_id = vote_to_bill.get(vr.vote_id)
+        for plan in plans:
+            key = plan.key_of(vr, bill_id)
+            if key is _SKIP:
+                continue
+            slot = plan.index.get(key)
+            if slot is None:
+                if plan.seeded:
+                    continue
+                slot = plan.add(key)
+            for col in plan.hits(vr.vote_type):
+                col[slot] += 1
+
+    return {plan.spec.name: plan.result() for plan in plans}
@@ -1,13 +1,29 @@
 from __future__ import annotations
 
+from collections.abc import Callable, Collection, Iterable, Iterator, Mapping, Sequence
 from dataclasses import dataclass
+from typing import Generic, Literal, TypeVar, overload
 
+from legislative_analytics.domain.entities import OPPOSE, SUPPORT
 from legislative_analytics.repositories.interfaces import (
     IBillRepository,
     ILegislatorRepository,
     IVoteRepository,
     IVoteResultRepository,
 )
+from legislative_analytics.repositories.lookups import (
+    bill_maps,
+    legislator_name_by_id,
+    vote_id_to_bill_id,
+)
+from legislative_analytics.services.aggregation import (
+    Count,
+    GroupByResult,
+    GroupBySpec,
+    JoinContext,
+    run_group_by,
+)
+from legislative_analytics.services.batch_queries import SubsetQuery, run_subset_queries
 
 
 @dataclass(frozen=True, slots=True)
@@ -27,11 +43,124 @@ class BillVoteCount:
     opposers: int
 
 
+@dataclass(frozen=True, slots=True)
+class SubsetReport:
+    legislators: Sequence[LegislatorVoteCount]
+    bills: Sequence[BillVoteCount]
+
+
+RankBy = Literal["support", "oppose"]
+
+T = TypeVar("T")
+CountRow = tuple[int, tuple[int, ...]]
+
+
+class ReportRows(Sequence[T], Generic[T]):
+    """
+    Report rows built on access: counters are kept as (id, counts) and the DTO (with
+    its decoded name/title) is only materialized when a row is read, e.g. by a writer.
+
+    The `compute_*` methods return these instead of lists. They are read-only
+    sequences (len, indexing, slicing, iteration) that compare equal to a list or
+    tuple of the same rows; callers that mutate the result need `list(rows)`.
+    """
+
+    __slots__ = ("_items", "_make")
+
+    def __init__(self, items: Sequence[CountRow], make: Callable[[CountRow], T]) -> None:
+        self._items = items
+        self._make = make
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> ReportRows[T]: ...
+
+    def __getitem__(self, index: int | slice) -> T | ReportRows[T]:
+        if isinstance(index, slice):
+            return ReportRows(self._items[index], self._make)
+        return self._make(self._items[index])
+
+    def __iter__(self) -> Iterator[T]:
+        return map(self._make, self._items)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (ReportRows, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"ReportRows({list(self)!r})"
+
+
+def sponsor_name(
+    bill_id: int, sponsor_by_bill: Mapping[int, int | None], name_by_id: Mapping[int, str]
+) -> str:
+    sponsor_id = sponsor_by_bill.get(bill_id)
+    return name_by_id.get(sponsor_id, "Unknown") if sponsor_id is not None else "Unknown"
+
+
+def _legislator_rows(
+    rows: Iterable[CountRow], name_by_id: Mapping[int, str]
+) -> ReportRows[LegislatorVoteCount]:
+    def make(row: CountRow) -> LegislatorVoteCount:
+        leg_id, (support, oppose) = row
+        return LegislatorVoteCount(
+            legislator_id=leg_id,
+            legislator_name=name_by_id[leg_id],
+            supported_bills=support,
+            opposed_bills=oppose,
+        )
+
+    return ReportRows(list(rows), make)
+
+
+def _bill_rows(
+    rows: Iterable[CountRow],
+    name_by_id: Mapping[int, str],
+    bill_title_by_id: Mapping[int, str],
+    bill_sponsor_id_by_id: Mapping[int, int | None],
+) -> ReportRows[BillVoteCount]:
+    def make(row: CountRow) -> BillVoteCount:
+        bill_id, (supporters, opposers) = row
+        return BillVoteCount(
+            bill_id=bill_id,
+            bill_title=bill_title_by_id[bill_id],
+            sponsor_name=sponsor_name(bill_id, bill_sponsor_id_by_id, name_by_id),
+            supporters=supporters,
+            opposers=opposers,
+        )
+
+    return ReportRows(list(rows), make)
+
+
+LEGISLATOR_SUPPORT_OPPOSE = GroupBySpec(
+    name="legislator_support_oppose",
+    keys=("legislator_id",),
+    measures=(Count("support", frozenset({SUPPORT})), Count("oppose", frozenset({OPPOSE}))),
+)
+
+BILL_SUPPORT_OPPOSE = GroupBySpec(
+    name="bill_support_oppose",
+    keys=("bill_id",),
+    measures=(Count("support", frozenset({SUPPORT})), Count("oppose", frozenset({OPPOSE}))),
+)
+
+
 class AnalyticsService:
     """
     Use-case/service layer:
-    - O(N) aggregation using hash maps (dicts)
+    - O(N) aggregation: every report is a `GroupBySpec`, and any set of specs is
+      answered by one fused pass over vote_results (see `aggregation.py`)
     - no IO here (only repositories)
+    - dimension lookups (names, titles, sponsors, vote -> bill) are loaded on first
+      use and shared by every report of the service, so each table is read once
     """
 
     def __init__(
@@ -46,77 +175,128 @@ class AnalyticsService:
         self._bills = bills
         self._votes = votes
         self._vote_results = vote_results
+        self._name_by_id: Mapping[int, str] | None = None
+        self._bill_lookups: tuple[Mapping[int, str], Mapping[int, int | None]] | None = None
+        self._vote_to_bill: Mapping[int, int] | None = None
+        self._join_contexts: dict[bool, JoinContext] = {}
 
-    def compute_legislator_support_oppose(self) -> list[LegislatorVoteCount]:
-        legislator_name_by_id: dict[int, str] = {}
-        counts: dict[int, list[int]] = {}
-
-        for leg in self._legislators.iter_legislators():
-            legislator_name_by_id[leg.id] = leg.name
-            counts[leg.id] = [0, 0]  # [support, oppose]
-
-        # Single pass over vote results. No nested loops.
-        for vr in self._vote_results.iter_vote_results():
-            if vr.legislator_id not in counts:
-                # Requirement: "for every legislator" from legislators.csv.
-                # Unknown legislator_ids in vote_results are ignored.
-                continue
-            if vr.vote_type == 1:
-                counts[vr.legislator_id][0] += 1
-            elif vr.vote_type == 2:
-                counts[vr.legislator_id][1] += 1
-
-        return [
-            LegislatorVoteCount(
-                legislator_id=leg_id,
-                legislator_name=legislator_name_by_id[leg_id],
-                supported_bills=support,
-                opposed_bills=oppose,
-            )
-            for leg_id, (support, oppose) in sorted(counts.items(), key=lambda kv: kv[0])
-        ]
+    def legislator_names(self) -> Mapping[int, str]:
+        if self._name_by_id is None:
+            self._name_by_id = legislator_name_by_id(self._legislators)
+        return self._name_by_id
 
-    def compute_bill_support_oppose(self) -> list[BillVoteCount]:
-        legislator_name_by_id: dict[int, str] = {
-            leg.id: leg.name for leg in self._legislators.iter_legislators()
-        }
+    def bill_lookups(self) -> tuple[Mapping[int, str], Mapping[int, int | None]]:
+        """(bill_title_by_id, bill_sponsor_id_by_id)"""
+        if self._bill_lookups is None:
+            self._bill_lookups = bill_maps(self._bills)
+        return self._bill_lookups
 
-        bill_title_by_id: dict[int, str] = {}
-        bill_sponsor_id_by_id: dict[int, int | None] = {}
-        counts: dict[int, list[int]] = {}
-
-        for bill in self._bills.iter_bills():
-            bill_title_by_id[bill.id] = bill.title
-            bill_sponsor_id_by_id[bill.id] = bill.sponsor_id
-            counts[bill.id] = [0, 0]  # [supporters, opposers]
-
-        vote_id_to_bill_id: dict[int, int] = {v.id: v.bill_id for v in self._votes.iter_votes()}
-
-        for vr in self._vote_results.iter_vote_results():
-            bill_id = vote_id_to_bill_id.get(vr.vote_id)
-            if bill_id is None or bill_id not in counts:
-                continue
-            if vr.vote_type == 1:
-                counts[bill_id][0] += 1
-            elif vr.vote_type == 2:
-                counts[bill_id][1] += 1
-
-        result: list[BillVoteCount] = []
-        for bill_id, (supporters, opposers) in sorted(counts.items(), key=lambda kv: kv[0]):
-            sponsor_id = bill_sponsor_id_by_id.get(bill_id)
-            sponsor_name = (
-                legislator_name_by_id.get(sponsor_id, "Unknown") if sponsor_id is not None else "Unknown"
-            )
-            result.append(
-                BillVoteCount(
-                    bill_id=bill_id,
-                    bill_title=bill_title_by_id[bill_id],
-                    sponsor_name=sponsor_name,
-                    supporters=supporters,
-                    opposers=opposers,
-                )
+    def _vote_to_bill_map(self) -> Mapping[int, int]:
+        if self._vote_to_bill is None:
+            self._vote_to_bill = vote_id_to_bill_id(self._votes)
+        return self._vote_to_bill
+
+    def _join_context(self, *, with_bills: bool) -> JoinContext:
+        ctx = self._join_contexts.get(with_bills)
+        if ctx is None:
+            bill_ids: Collection[int] = ()
+            sponsor_by_bill: Mapping[int, int | None] = {}
+            if with_bills:
+                # The sponsor map holds every bill of bills.csv; its dict keys test
+                # membership faster than the encoded titles' binary search.
+                _, sponsor_by_bill = self.bill_lookups()
+                bill_ids = sponsor_by_bill.keys()
+            ctx = self._join_contexts[with_bills] = JoinContext(
+                legislator_ids=self.legislator_names().keys(),
+                vote_to_bill=self._vote_to_bill_map(),
+                bill_ids=bill_ids,
+                sponsor_by_bill=sponsor_by_bill,
             )
+        return ctx
+
+    def aggregate(self, *specs: GroupBySpec) -> dict[str, GroupByResult]:
+        """Evaluate any number of group-by specs in a single scan over vote_results."""
+        uses_bills = any(
+            k in ("bill_id", "sponsor_id", "own_bill") for spec in specs for k in spec.keys
+        )
+        return run_group_by(
+            specs,
+            vote_results=self._vote_results.iter_vote_results(),
+            ctx=self._join_context(with_bills=uses_bills),
+        )
+
+    def legislator_rows(self, rows: Iterable[CountRow]) -> ReportRows[LegislatorVoteCount]:
+        """(legislator_id, (support, oppose)) rows as lazily built report rows."""
+        return _legislator_rows(rows, self.legislator_names())
+
+    def bill_rows(self, rows: Iterable[CountRow]) -> ReportRows[BillVoteCount]:
+        """(bill_id, (supporters, opposers)) rows as lazily built report rows."""
+        return _bill_rows(rows, self.legislator_names(), *self.bill_lookups())
+
+    def compute_legislator_support_oppose(self) -> ReportRows[LegislatorVoteCount]:
+        result = self.aggregate(LEGISLATOR_SUPPORT_OPPOSE)[LEGISLATOR_SUPPORT_OPPOSE.name]
+        return self.legislator_rows(result.rows())
 
-        return result
+    def compute_top_legislators(
+        self, k: int, *, by: RankBy = "support"
+    ) -> ReportRows[LegislatorVoteCount]:
+        """
+        The `k` legislators with the most supported (or opposed) bills, highest first.
+        Only the selected rows are materialized as DTOs.
+        """
+        result = self.aggregate(LEGISLATOR_SUPPORT_OPPOSE)[LEGISLATOR_SUPPORT_OPPOSE.name]
+        return self.legislator_rows(result.top(k, by=by))
 
+    def compute_bill_support_oppose(self) -> ReportRows[BillVoteCount]:
+        result = self.aggregate(BILL_SUPPORT_OPPOSE)[BILL_SUPPORT_OPPOSE.name]
+        return self.bill_rows(result.rows())
 
+    def compute_top_bills(self, k: int, *, by: RankBy = "support") -> ReportRows[BillVoteCount]:
+        """
+        The `k` bills with the most supporters (or opposers), highest first.
+        Only the selected rows are materialized as DTOs.
+        """
+        result = self.aggregate(BILL_SUPPORT_OPPOSE)[BILL_SUPPORT_OPPOSE.name]
+        return self.bill_rows(result.top(k, by=by))
+
+    def compute_top_reports(
+        self, k: int, *, by: RankBy = "support"
+    ) -> tuple[ReportRows[LegislatorVoteCount], ReportRows[BillVoteCount]]:
+        """The top-`k` legislators and bills (ranked by the same counter) from one scan."""
+        results = self.aggregate(LEGISLATOR_SUPPORT_OPPOSE, BILL_SUPPORT_OPPOSE)
+        return (
+            self.legislator_rows(results[LEGISLATOR_SUPPORT_OPPOSE.name].top(k, by=by)),
+            self.bill_rows(results[BILL_SUPPORT_OPPOSE.name].top(k, by=by)),
+        )
+
+    def compute_support_oppose_reports(
+        self,
+    ) -> tuple[ReportRows[LegislatorVoteCount], ReportRows[BillVoteCount]]:
+        """Both reports from one scan over vote_results."""
+        results = self.aggregate(LEGISLATOR_SUPPORT_OPPOSE, BILL_SUPPORT_OPPOSE)
+        return (
+            self.legislator_rows(results[LEGISLATOR_SUPPORT_OPPOSE.name].rows()),
+            self.bill_rows(results[BILL_SUPPORT_OPPOSE.name].rows()),
+        )
+
+    def compute_subset_reports(self, queries: Iterable[SubsetQuery]) -> dict[str, SubsetReport]:
+        """
+        Answer a batch of subset queries (legislator/bill lists, vote_type filters)
+        from one shared scan over vote_results; keyed by query name.
+        """
+        name_by_id = self.legislator_names()
+        bill_title_by_id, bill_sponsor_id_by_id = self.bill_lookups()
+        counts = run_subset_queries(
+            queries,
+            vote_results=self._vote_results.iter_vote_results(),
+            legislator_ids=name_by_id.keys(),
+            bill_ids=bill_sponsor_id_by_id.keys(),
+            vote_to_bill=self._vote_to_bill_map(),
+        )
+        return {
+            name: SubsetReport(
+                legislators=_legislator_rows(c.legislators, name_by_id),
+                bills=_bill_rows(c.bills, name_by_id, bill_title_by_id, bill_sponsor_id_by_id),
+            )
+            for name, c in counts.items()
+        }
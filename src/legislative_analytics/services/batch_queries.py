@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from collections.abc import Collection, Iterable, Mapping
+from dataclasses import dataclass, field
+
+from legislative_analytics.domain.entities import OPPOSE, SUPPORT, VoteResult
+
+
+@dataclass(frozen=True, slots=True)
+class SubsetQuery:
+    """
+    One subset request. `None` means "every entity" (or every vote_type);
+    an empty set means "none" (e.g. a bills-only query passes `legislator_ids=frozenset()`).
+    """
+
+    name: str
+    legislator_ids: frozenset[int] | None = None
+    bill_ids: frozenset[int] | None = None
+    # Only votes of these types are counted (1 = support, 2 = oppose).
+    vote_types: frozenset[int] | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class SubsetCounts:
+    """Per-query `(entity id, (support, oppose))` rows, ascending by id."""
+
+    legislators: list[tuple[int, tuple[int, int]]] = field(default_factory=list)
+    bills: list[tuple[int, tuple[int, int]]] = field(default_factory=list)
+
+
+class _MembershipIndex:
+    """entity id -> bitmask of the queries interested in it (bit i = queries[i])."""
+
+    def __init__(self, selections: list[frozenset[int] | None], universe: Collection[int]) -> None:
+        self.universe = universe
+        self.all_mask = 0
+        self.masks: dict[int, int] = {}
+        for bit, ids in enumerate(selections):
+            if ids is None:
+                self.all_mask |= 1 << bit
+                continue
+            for entity_id in ids:
+                if entity_id in universe:
+                    self.masks[entity_id] = self.masks.get(entity_id, 0) | (1 << bit)
+
+    def mask(self, entity_id: int) -> int:
+        if entity_id not in self.universe:
+            return 0
+        return self.masks.get(entity_id, 0) | self.all_mask
+
+    def members(self, selection: frozenset[int] | None) -> list[int]:
+        if selection is None:
+            return sorted(self.universe)
+        return sorted(i for i in selection if i in self.universe)
+
+
+def run_subset_queries(
+    queries: Iterable[SubsetQuery],
+    *,
+    vote_results: Iterable[VoteResult],
+    legislator_ids: Collection[int],
+    bill_ids: Collection[int],
+    vote_to_bill: Mapping[int, int],
+) -> dict[str, SubsetCounts]:
+    """
+    Answer every query from one pass over `vote_results`.
+
+    The scan only does work for rows some query is interested in (non-zero mask),
+    and accumulates one shared (support, oppose) counter per entity. Each query's
+    rows are then read off the shared counters, so the cost is O(rows + output),
+    independent of the number of queries.
+    """
+    queries = list(queries)
+    names = [q.name for q in queries]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate query names: {names}")
+
+    legislators = _MembershipIndex([q.legislator_ids for q in queries], legislator_ids)
+    bills = _MembershipIndex([q.bill_ids for q in queries], bill_ids)
+    vote_type_mask = {
+        vt: sum(
+            1 << bit
+            for bit, q in enumerate(queries)
+            if q.vote_types is None or vt in q.vote_types
+        )
+        for vt in (SUPPORT, OPPOSE)
+    }
+
+    legislator_counts: dict[int, list[int]] = {}
+    bill_counts: dict[int, list[int]] = {}
+
+    for vr in vote_results:
+        vt_mask = vote_type_mask.get(vr.vote_type, 0)
+        if not vt_mask:
+            continue
+        column = 0 if vr.vote_type == SUPPORT else 1
+
+        if legislators.mask(vr.legislator_id) & vt_mask:
+            counts = legislator_counts.get(vr.legislator_id)
+            if counts is None:
+                counts = legislator_counts[vr.legislator_id] = [0, 0]
+            counts[column] += 1
+
+        bill_id = vote_to_bill.get(vr.vote_id)
+        if bill_id is not None and bills.mask(bill_id) & vt_mask:
+            counts = bill_counts.get(bill_id)
+            if counts is None:
+                counts = bill_counts[bill_id] = [0, 0]
+            counts[column] += 1
+
+    zero = (0, 0)
+    results: dict[str, SubsetCounts] = {}
+    for bit, q in enumerate(queries):
+        want_support = vote_type_mask[SUPPORT] >> bit & 1
+        want_oppose = vote_type_mask[OPPOSE] >> bit & 1
+        out = SubsetCounts()
+        for entity_id in legislators.members(q.legislator_ids):
+            s, o = legislator_counts.get(entity_id, zero)
+            out.legislators.append((entity_id, (s * want_support, o * want_oppose)))
+        for entity_id in bills.members(q.bill_ids):
+            s, o = bill_counts.get(entity_id, zero)
+            out.bills.append((entity_id, (s * want_support, o * want_oppose)))
+        results[q.name] = out
+    return results
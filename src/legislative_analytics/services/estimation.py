@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from statistics import NormalDist
+
+# Estimators for block (cluster) samples: `n` blocks drawn without replacement out
+# of `population` blocks, each block contributing one observed value per measure.
+# Intervals use the normal approximation with the finite-population correction,
+# so they shrink to the exact value when every block was read.
+
+
+@dataclass(frozen=True, slots=True)
+class Estimate:
+    value: float
+    low: float
+    high: float
+
+
+@dataclass(frozen=True, slots=True)
+class Moments:
+    """Count, sum and sum of squares of per-block values: all `estimate_total` needs."""
+
+    n: int
+    total: float = 0
+    total_sq: float = 0
+
+    @classmethod
+    def of(cls, samples: Iterable[float]) -> Moments:
+        n, total, total_sq = 0, 0.0, 0.0
+        for y in samples:
+            n += 1
+            total += y
+            total_sq += y * y
+        return cls(n, total, total_sq)
+
+
+def z_score(confidence: float) -> float:
+    if not 0 < confidence < 1:
+        raise ValueError(f"confidence must be in (0, 1): {confidence}")
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+
+def _fpc(n: int, population: int) -> float:
+    if not 0 < n <= population:
+        raise ValueError(f"need 0 < sampled blocks <= population: {n}, {population}")
+    return 1 - n / population
+
+
+def estimate_total(moments: Moments, *, population: int, z: float) -> Estimate:
+    """Population total from the moments of per-block totals: N * mean, clamped at 0 below."""
+    n = moments.n
+    fpc = _fpc(n, population)
+    mean = moments.total / n
+    value = population * mean
+    if n < 2 or fpc == 0:
+        half = 0.0 if fpc == 0 else math.inf
+    else:
+        # sum((y - mean)^2) = sum(y^2) - total * mean; max() absorbs float round-off.
+        var = max(0.0, (moments.total_sq - moments.total * mean) / (n - 1))
+        half = z * population * math.sqrt(fpc * var / n)
+    return Estimate(value=value, low=max(0.0, value - half), high=value + half)
+
+
+def estimate_ratio(
+    numerators: Sequence[float], denominators: Sequence[float], *, population: int, z: float
+) -> Estimate:
+    """Ratio estimator sum(num) / sum(den) (e.g. rejected / processed rows), clamped to [0, 1]."""
+    n = len(numerators)
+    fpc = _fpc(n, population)
+    den_total = sum(denominators)
+    if den_total == 0:
+        return Estimate(value=0.0, low=0.0, high=1.0)
+    ratio = sum(numerators) / den_total
+    if n < 2 or fpc == 0:
+        half = 0.0 if fpc == 0 else math.inf
+    else:
+        den_mean = den_total / n
+        residuals = zip(numerators, denominators, strict=True)
+        var = sum((a - ratio * b) ** 2 for a, b in residuals) / (n - 1)
+        half = z * math.sqrt(fpc * var / n) / den_mean
+    return Estimate(value=ratio, low=max(0.0, ratio - half), high=min(1.0, ratio + half))
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import Literal
+
+from legislative_analytics.services.analytics_service import BillVoteCount, LegislatorVoteCount
+
+ChangeKind = Literal["added", "removed", "changed"]
+
+_FIELD_SEP = b"\x1f"
+
+
+def _content_hash(*fields: object) -> int:
+    h = hashlib.blake2b(digest_size=8)
+    h.update(_FIELD_SEP.join(str(f).encode("utf-8") for f in fields))
+    return int.from_bytes(h.digest(), "little")
+
+
+def legislator_row_hash(row: LegislatorVoteCount) -> int:
+    return _content_hash(
+        row.legislator_id, row.legislator_name, row.supported_bills, row.opposed_bills
+    )
+
+
+def bill_row_hash(row: BillVoteCount) -> int:
+    return _content_hash(
+        row.bill_id, row.bill_title, row.sponsor_name, row.supporters, row.opposers
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class RowChange:
+    kind: ChangeKind
+    entity_id: int
+
+
+class StreamingDiff:
+    """
+    Push-based merge of the new id-ordered rows against the previous snapshot's
+    (id, hash) stream. Both sides are consumed once, front to back, so memory stays
+    O(1) regardless of report size. Rows with equal hashes are unchanged.
+    """
+
+    def __init__(self, previous: Iterable[tuple[int, int]]) -> None:
+        self._previous: Iterator[tuple[int, int]] = iter(previous)
+        self._pending: tuple[int, int] | None = next(self._previous, None)
+        self._last_id: int | None = None
+
+    def push(self, entity_id: int, content_hash: int) -> list[RowChange]:
+        if self._last_id is not None and entity_id <= self._last_id:
+            raise ValueError(
+                f"Rows must be in ascending id order: {entity_id} after {self._last_id}"
+            )
+        self._last_id = entity_id
+
+        changes: list[RowChange] = []
+        while self._pending is not None and self._pending[0] < entity_id:
+            changes.append(RowChange("removed", self._pending[0]))
+            self._pending = next(self._previous, None)
+
+        if self._pending is not None and self._pending[0] == entity_id:
+            if self._pending[1] != content_hash:
+                changes.append(RowChange("changed", entity_id))
+            self._pending = next(self._previous, None)
+        else:
+            changes.append(RowChange("added", entity_id))
+        return changes
+
+    def finish(self) -> list[RowChange]:
+        changes: list[RowChange] = []
+        while self._pending is not None:
+            changes.append(RowChange("removed", self._pending[0]))
+            self._pending = next(self._previous, None)
+        return changes
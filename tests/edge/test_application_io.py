@@ -40,3 +40,107 @@ def test_output_directory_is_created_if_missing(tmp_path: Path) -> None:
     assert (out_dir / "bills_support_oppose.csv").exists()
 
 
+@pytest.mark.edge
+def test_top_option_writes_ranked_rows(tmp_path: Path) -> None:
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+
+    (data_dir / "legislators.csv").write_text("id,name\n1,A\n2,B\n", encoding="utf-8")
+    (data_dir / "bills.csv").write_text("id,title,sponsor_id\n10,T1,1\n20,T2,2\n", encoding="utf-8")
+    (data_dir / "votes.csv").write_text("id,bill_id\n100,10\n200,20\n", encoding="utf-8")
+    (data_dir / "vote_results.csv").write_text(
+        "id,legislator_id,vote_id,vote_type\n1,1,100,2\n2,2,200,2\n3,1,200,2\n", encoding="utf-8"
+    )
+
+    out_dir = tmp_path / "out"
+    rc = main(
+        [
+            "--data-dir", str(data_dir),
+            "--out-dir", str(out_dir),
+            "--top", "1",
+            "--rank-by", "oppose",
+            "--log-level", "ERROR",
+        ]
+    )
+    assert rc == 0
+
+    legislator_lines = (
+        (out_dir / "legislators_support_oppose.csv").read_text(encoding="utf-8").splitlines()
+    )
+    bill_lines = (out_dir / "bills_support_oppose.csv").read_text(encoding="utf-8").splitlines()
+    assert legislator_lines[1:] == ["1,A,0,2"]
+    assert bill_lines[1:] == ["20,T2,0,2,B"]
+
+
+@pytest.mark.edge
+def test_corrupt_input_aborts_with_partial_scan_summary(tmp_path: Path) -> None:
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+
+    (data_dir / "legislators.csv").write_text("id,name\n1,A\n", encoding="utf-8")
+    (data_dir / "bills.csv").write_text("id,title,sponsor_id\n10,T1,1\n", encoding="utf-8")
+    (data_dir / "votes.csv").write_text("id,bill_id\n100,10\n", encoding="utf-8")
+    rows = "".join(f"{i},{500 + i},100,1\n" for i in range(1, 50))  # every legislator_id unknown
+    (data_dir / "vote_results.csv").write_text(
+        "id,legislator_id,vote_id,vote_type\n" + rows, encoding="utf-8"
+    )
+
+    out_dir = tmp_path / "out"
+    with pytest.raises(SystemExit) as excinfo:
+        main(
+            [
+                "--data-dir", str(data_dir),
+                "--out-dir", str(out_dir),
+                "--max-rejects", "5",
+                "--log-level", "CRITICAL",
+            ]
+        )
+
+    message = str(excinfo.value)
+    assert message.startswith("Ingestion aborted: rejected rows exceeded 5 after 6 rows")
+    assert "'unknown_legislator': 6" in message
+    assert not (out_dir / "legislators_support_oppose.csv").exists()
+
+
+@pytest.mark.edge
+def test_rank_by_without_top_is_rejected(tmp_path: Path) -> None:
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (data_dir / "legislators.csv").write_text("id,name\n1,A\n", encoding="utf-8")
+    (data_dir / "bills.csv").write_text("id,title,sponsor_id\n10,T1,1\n", encoding="utf-8")
+    (data_dir / "votes.csv").write_text("id,bill_id\n100,10\n", encoding="utf-8")
+    (data_dir / "vote_results.csv").write_text(
+        "id,legislator_id,vote_id,vote_type\n1,1,100,1\n", encoding="utf-8"
+    )
+
+    with pytest.raises(SystemExit) as excinfo:
+        main(
+            [
+                "--data-dir", str(data_dir),
+                "--out-dir", str(tmp_path / "out"),
+                "--rank-by", "oppose",
+            ]
+        )
+
+    assert "--rank-by requires --top" in str(excinfo.value)
+
+
+@pytest.mark.edge
+@pytest.mark.parametrize(
+    "option",
+    [
+        ["--max-rejects", "-1"],
+        ["--max-reject-ratio", "1.5"],
+        ["--max-reject-ratio", "-0.1"],
+        ["--reject-warmup-rows", "-5"],
+        ["--max-double-votes", "-2"],
+    ],
+)
+def test_circuit_breaker_options_reject_out_of_range_values(
+    tmp_path: Path, option: list[str], capsys: pytest.CaptureFixture[str]
+) -> None:
+    with pytest.raises(SystemExit) as excinfo:
+        main(["--data-dir", str(tmp_path), *option])
+
+    assert excinfo.value.code == 2  # argparse usage error, before any input is read
+    assert option[0] in capsys.readouterr().err
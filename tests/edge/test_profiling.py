@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from legislative_analytics.application.main import main
+from legislative_analytics.application.profiling import stage_for
+
+
+@pytest.mark.edge
+def test_stage_for_maps_modules_to_pipeline_stages() -> None:
+    validator = "/x/repositories/validating_vote_results.py"
+    assert stage_for("/x/repositories/csv_repositories.py", "iter_votes") == "repositories"
+    assert stage_for(validator, "iter_vote_results") == "validator"
+    assert stage_for("/x/services/analytics_service.py", "aggregate") == "service"
+    assert stage_for("/x/services/aggregation.py", "run_group_by") == "service"
+    assert stage_for("/x/repositories/validation_rules.py", "_reject_repeats") == "validator"
+    assert stage_for("/x/repositories/string_table.py", "from_items") == "repositories"
+    assert stage_for("/x/application/out_of_core.py", "_scatter") == "partitioning"
+    assert stage_for("/x/application/main.py", "_write_bill_report") == "writers"
+    assert stage_for("/x/application/main.py", "main") is None
+    assert stage_for("/usr/lib/python3.11/csv.py", "__next__") is None
+
+
+def _write_dataset(tmp_path: Path) -> Path:
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (data_dir / "legislators.csv").write_text("id,name\n1,A\n", encoding="utf-8")
+    (data_dir / "bills.csv").write_text("id,title,sponsor_id\n10,T1,1\n", encoding="utf-8")
+    (data_dir / "votes.csv").write_text("id,bill_id\n100,10\n", encoding="utf-8")
+    (data_dir / "vote_results.csv").write_text(
+        "id,legislator_id,vote_id,vote_type\n1,1,100,1\n", encoding="utf-8"
+    )
+    return data_dir
+
+
+@pytest.mark.edge
+def test_profile_option_writes_reports(tmp_path: Path) -> None:
+    data_dir = _write_dataset(tmp_path)
+
+    out_dir = tmp_path / "out"
+    rc = main(
+        [
+            "--data-dir", str(data_dir),
+            "--out-dir", str(out_dir),
+            "--profile",
+            "--profile-alloc-depth", "16",
+            "--log-level", "ERROR",
+        ]
+    )
+    assert rc == 0
+
+    profile_dir = out_dir / "profile"
+    for name in ("run.pstats", "run.collapsed", "stages.txt", "allocations.txt"):
+        assert (profile_dir / name).exists()
+    stages = (profile_dir / "stages.txt").read_text(encoding="utf-8")
+    assert "memory_snapshot after-aggregation" in stages
+    for stage in ("repositories", "validator", "service", "writers"):
+        assert stage in stages
+    assert (out_dir / "bills_support_oppose.csv").exists()
+
+
+@pytest.mark.edge
+def test_profile_skips_allocation_tracing_unless_asked(tmp_path: Path) -> None:
+    data_dir = _write_dataset(tmp_path)
+    base = ["--data-dir", str(data_dir), "--out-dir", str(tmp_path / "out"), "--log-level", "ERROR"]
+
+    assert main([*base, "--profile"]) == 0
+
+    profile_dir = tmp_path / "out" / "profile"
+    assert (profile_dir / "stages.txt").exists()
+    assert not (profile_dir / "allocations.txt").exists()
+    assert "allocation tracing off" in (profile_dir / "stages.txt").read_text(encoding="utf-8")
+    with pytest.raises(SystemExit, match="requires --profile"):
+        main([*base, "--profile-alloc-depth", "4"])
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from legislative_analytics.application.main import main
+from legislative_analytics.repositories.caching_repositories import (
+    CachingBillRepository,
+    CachingLegislatorRepository,
+    CachingVoteRepository,
+    DimensionCache,
+    approx_nbytes,
+)
+from legislative_analytics.repositories.csv_repositories import (
+    CsvBillRepository,
+    CsvLegislatorRepository,
+    CsvVoteRepository,
+    CsvVoteResultRepository,
+)
+from legislative_analytics.services.analytics_service import AnalyticsService
+
+
+def _write_dataset(d: Path) -> None:
+    (d / "legislators.csv").write_text("id,name\n1,A\n2,B\n", encoding="utf-8")
+    (d / "bills.csv").write_text("id,title,sponsor_id\n10,T1,1\n20,T2,\n", encoding="utf-8")
+    (d / "votes.csv").write_text("id,bill_id\n100,10\n200,20\n", encoding="utf-8")
+    (d / "vote_results.csv").write_text(
+        "id,legislator_id,vote_id,vote_type\n1,1,100,1\n2,2,100,2\n3,2,200,1\n", encoding="utf-8"
+    )
+
+
+def _service(d: Path, cache: DimensionCache) -> AnalyticsService:
+    return AnalyticsService(
+        legislators=CachingLegislatorRepository(
+            CsvLegislatorRepository(d / "legislators.csv"), cache
+        ),
+        bills=CachingBillRepository(CsvBillRepository(d / "bills.csv"), cache),
+        votes=CachingVoteRepository(CsvVoteRepository(d / "votes.csv"), cache),
+        vote_results=CsvVoteResultRepository(d / "vote_results.csv"),
+    )
+
+
+@pytest.mark.integration
+def test_repeated_runs_hit_the_cache_and_produce_same_reports(tmp_path: Path) -> None:
+    _write_dataset(tmp_path)
+    cache = DimensionCache()
+
+    first = _service(tmp_path, cache).compute_bill_support_oppose()
+    misses_after_first = cache.stats().misses
+    second = _service(tmp_path, cache).compute_bill_support_oppose()
+
+    assert first == second
+    assert [(r.bill_id, r.sponsor_name, r.supporters, r.opposers) for r in second] == [
+        (10, "A", 1, 1),
+        (20, "Unknown", 1, 0),
+    ]
+    stats = cache.stats()
+    assert stats.misses == misses_after_first
+    assert stats.hits > 0
+
+
+@pytest.mark.integration
+def test_changed_file_is_reparsed_and_invalidate_drops_entries(tmp_path: Path) -> None:
+    _write_dataset(tmp_path)
+    cache = DimensionCache()
+    legislators_csv = tmp_path / "legislators.csv"
+    repo = CachingLegislatorRepository(CsvLegislatorRepository(legislators_csv), cache)
+
+    assert dict(repo.legislator_name_by_id()) == {1: "A", 2: "B"}
+
+    legislators_csv.write_text("id,name\n1,A\n2,B\n3,Carol\n", encoding="utf-8")
+    st = legislators_csv.stat()
+    os.utime(legislators_csv, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    assert dict(repo.legislator_name_by_id()) == {1: "A", 2: "B", 3: "Carol"}
+    assert cache.invalidate(legislators_csv) == 1  # the name map; the stale entry is gone
+    assert cache.stats().entries == 0
+
+
+@pytest.mark.integration
+def test_lru_evicts_least_recently_used_entry(tmp_path: Path) -> None:
+    _write_dataset(tmp_path)
+    cache = DimensionCache(max_entries=2)
+    legislators = CachingLegislatorRepository(
+        CsvLegislatorRepository(tmp_path / "legislators.csv"), cache
+    )
+    votes = CachingVoteRepository(CsvVoteRepository(tmp_path / "votes.csv"), cache)
+    bills = CachingBillRepository(CsvBillRepository(tmp_path / "bills.csv"), cache)
+
+    list(legislators.iter_legislators())
+    list(votes.iter_votes())
+    list(legislators.iter_legislators())  # refresh legislators -> votes is now LRU
+    list(bills.iter_bills())
+
+    stats = cache.stats()
+    assert (stats.entries, stats.evictions) == (2, 1)
+    list(legislators.iter_legislators())
+    assert cache.stats().hits == 2
+
+
+@pytest.mark.integration
+def test_byte_bound_evicts_by_approximate_size(tmp_path: Path) -> None:
+    _write_dataset(tmp_path)
+    legislators_csv = tmp_path / "legislators.csv"
+    legislators_csv.write_text(
+        "id,name\n" + "".join(f"{i},Legislator {i}\n" for i in range(1, 2001)), encoding="utf-8"
+    )
+    sizes = [
+        approx_nbytes(tuple(CsvLegislatorRepository(legislators_csv).iter_legislators())),
+        approx_nbytes(tuple(CsvVoteRepository(tmp_path / "votes.csv").iter_votes())),
+        approx_nbytes(tuple(CsvBillRepository(tmp_path / "bills.csv").iter_bills())),
+    ]
+    assert sizes[0] > 100 * sizes[1]  # sized by content, not one unit per entry
+
+    cache = DimensionCache(max_bytes=sum(sizes) - 1)
+    legislators = CachingLegislatorRepository(CsvLegislatorRepository(legislators_csv), cache)
+    votes = CachingVoteRepository(CsvVoteRepository(tmp_path / "votes.csv"), cache)
+    bills = CachingBillRepository(CsvBillRepository(tmp_path / "bills.csv"), cache)
+
+    list(votes.iter_votes())
+    list(legislators.iter_legislators())
+    list(bills.iter_bills())  # over budget: the least recently used (votes) goes
+
+    stats = cache.stats()
+    assert (stats.entries, stats.evictions, stats.nbytes) == (2, 1, sizes[0] + sizes[2])
+
+    too_small = DimensionCache(max_bytes=sizes[1])
+    list(
+        CachingLegislatorRepository(
+            CsvLegislatorRepository(legislators_csv), too_small
+        ).iter_legislators()
+    )
+    assert too_small.stats().entries == 0  # larger than the whole budget: not cached
+
+
+@pytest.mark.integration
+def test_file_replaced_while_parsing_is_not_cached(tmp_path: Path) -> None:
+    _write_dataset(tmp_path)
+    legislators_csv = tmp_path / "legislators.csv"
+    cache = DimensionCache()
+
+    def load_then_replace() -> tuple[str, ...]:
+        loaded = ("A", "B")
+        legislators_csv.write_text("id,name\n1,A\n2,B\n3,Carol\n", encoding="utf-8")
+        return loaded
+
+    assert cache.get_or_load(legislators_csv, "names", load_then_replace) == ("A", "B")
+    assert cache.stats().entries == 0
+    assert cache.get_or_load(legislators_csv, "names", lambda: ("A", "B", "Carol")) == (
+        "A",
+        "B",
+        "Carol",
+    )
+
+
+@pytest.mark.integration
+def test_report_run_parses_each_dimension_table_once(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _write_dataset(tmp_path)
+    parses: list[str] = []
+    for cls, method in (
+        (CsvLegislatorRepository, "iter_legislators"),
+        (CsvBillRepository, "iter_bills"),
+        (CsvVoteRepository, "iter_votes"),
+    ):
+        original = getattr(cls, method)
+
+        def counting(self, _original=original, _method=method):
+            parses.append(_method)
+            return _original(self)
+
+        monkeypatch.setattr(cls, method, counting)
+
+    argv = ["--data-dir", str(tmp_path), "--out-dir", str(tmp_path / "out"), "--log-level", "ERROR"]
+    assert main(argv) == 0
+
+    assert sorted(parses) == ["iter_bills", "iter_legislators", "iter_votes"]
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import bz2
+import gzip
+import lzma
+from pathlib import Path
+
+import pytest
+
+from legislative_analytics.application.main import main
+from legislative_analytics.repositories.compressed_io import find_input, open_csv
+from legislative_analytics.repositories.csv_repositories import CsvVoteResultRepository
+
+_COMPRESSORS = {".gz": gzip.compress, ".bz2": bz2.compress, ".xz": lzma.compress}
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("suffix", sorted(_COMPRESSORS))
+def test_vote_result_repository_streams_compressed_file(tmp_path: Path, suffix: str) -> None:
+    body = "id,legislator_id,vote_id,vote_type\n" + "".join(
+        f"{i},{i % 7},{100 + i % 3},{1 + i % 2}\n" for i in range(50_000)
+    )
+    p = tmp_path / f"vote_results.csv{suffix}"
+    p.write_bytes(_COMPRESSORS[suffix](body.encode("utf-8")))
+
+    rows = list(CsvVoteResultRepository(p).iter_vote_results())
+    assert len(rows) == 50_000
+    assert (rows[-1].id, rows[-1].legislator_id, rows[-1].vote_id, rows[-1].vote_type) == (
+        49_999, 49_999 % 7, 100 + 49_999 % 3, 1 + 49_999 % 2
+    )
+
+
+@pytest.mark.integration
+def test_corrupt_compressed_input_raises_in_reader(tmp_path: Path) -> None:
+    p = tmp_path / "votes.csv.gz"
+    p.write_bytes(gzip.compress(b"id,bill_id\n1,2\n")[:-12] + b"garbage!")
+
+    with pytest.raises((OSError, EOFError)), open_csv(p) as f:
+        f.read()
+
+
+@pytest.mark.integration
+def test_early_close_stops_decompression_thread(tmp_path: Path) -> None:
+    p = tmp_path / "votes.csv.xz"
+    p.write_bytes(lzma.compress(b"id,bill_id\n" + b"1,2\n" * 2_000_000))
+
+    with open_csv(p) as f:
+        assert f.readline() == "id,bill_id\n"
+    # Leaving the block mid-stream must not hang on the producer thread.
+
+
+@pytest.mark.integration
+def test_find_input_prefers_plain_csv(tmp_path: Path) -> None:
+    (tmp_path / "bills.csv.bz2").write_bytes(b"")
+    assert find_input(tmp_path, "bills.csv") == tmp_path / "bills.csv.bz2"
+    (tmp_path / "bills.csv").write_text("", encoding="utf-8")
+    assert find_input(tmp_path, "bills.csv") == tmp_path / "bills.csv"
+    assert find_input(tmp_path, "votes.csv") is None
+
+
+@pytest.mark.edge
+def test_main_accepts_compressed_inputs(tmp_path: Path) -> None:
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (data_dir / "legislators.csv.gz").write_bytes(gzip.compress(b"id,name\n1,A\n"))
+    (data_dir / "bills.csv.xz").write_bytes(lzma.compress(b"id,title,sponsor_id\n10,T1,1\n"))
+    (data_dir / "votes.csv").write_text("id,bill_id\n100,10\n", encoding="utf-8")
+    (data_dir / "vote_results.csv.bz2").write_bytes(
+        bz2.compress(b"id,legislator_id,vote_id,vote_type\n1,1,100,1\n")
+    )
+
+    out_dir = tmp_path / "out"
+    argv = ["--data-dir", str(data_dir), "--out-dir", str(out_dir), "--log-level", "ERROR"]
+    assert main(argv) == 0
+    assert (out_dir / "bills_support_oppose.csv").read_text(encoding="utf-8").splitlines()[1:] == [
+        "10,T1,1,0,A"
+    ]
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import random
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from legislative_analytics.application.main import main
+
+_MAIN = Path(__file__).resolve().parents[2] / "src" / "main.py"
+
+
+def _write_dataset(d: Path) -> None:
+    rnd = random.Random(21)
+    (d / "legislators.csv").write_text(
+        "id,name\n" + "".join(f"{i},L{i}\n" for i in range(1, 26)), encoding="utf-8"
+    )
+    (d / "bills.csv").write_text(
+        "id,title,sponsor_id\n"
+        + "".join(f"{i},B{i},{rnd.choice(['', '3', '99'])}\n" for i in range(1, 21)),
+        encoding="utf-8",
+    )
+    # Two votes per bill, so double votes also span vote_ids (and shards).
+    (d / "votes.csv").write_text(
+        "id,bill_id\n" + "".join(f"{v},{v // 2}\n" for v in range(2, 42)), encoding="utf-8"
+    )
+    (d / "vote_results.csv").write_text(
+        "id,legislator_id,vote_id,vote_type\n"
+        + "".join(
+            f"{i},{rnd.randint(1, 27)},{rnd.randint(2, 44)},{rnd.choice([0, 1, 2])}\n"
+            for i in range(1, 1201)
+        ),
+        encoding="utf-8",
+    )
+
+
+def _map(data_dir: Path, out: Path, *extra: str) -> subprocess.Popen[bytes]:
+    return subprocess.Popen(
+        [sys.executable, str(_MAIN), "--data-dir", str(data_dir), "--log-level", "CRITICAL",
+         "--map-partial", str(out), *extra]
+    )
+
+
+def _reports(out_dir: Path) -> tuple[str, str]:
+    return (
+        (out_dir / "legislators_support_oppose.csv").read_text(encoding="utf-8"),
+        (out_dir / "bills_support_oppose.csv").read_text(encoding="utf-8"),
+    )
+
+
+@pytest.mark.integration
+def test_byte_range_map_processes_then_merge_match_single_run(tmp_path: Path) -> None:
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    _write_dataset(data_dir)
+    base = ["--data-dir", str(data_dir), "--log-level", "CRITICAL"]
+    assert main([*base, "--out-dir", str(tmp_path / "single")]) == 0
+
+    size = (data_dir / "vote_results.csv").stat().st_size
+    cuts = [0, size // 3, 2 * size // 3, size]
+    partials = [tmp_path / f"part-{i}.bin" for i in range(3)]
+    procs = [
+        _map(data_dir, partials[i], "--byte-range", f"{cuts[i]}:{cuts[i + 1]}") for i in range(3)
+    ]
+    assert [p.wait(timeout=60) for p in procs] == [0, 0, 0]
+
+    # Merge order must not matter.
+    merge = [*base, "--merge-partials", *map(str, reversed(partials))]
+    assert main([*merge, "--out-dir", str(tmp_path / "merged")]) == 0
+
+    assert _reports(tmp_path / "merged") == _reports(tmp_path / "single")
+
+
+@pytest.mark.integration
+def test_file_shards_are_ordered_by_shard_index(tmp_path: Path) -> None:
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    _write_dataset(data_dir)
+    assert main(["--data-dir", str(data_dir), "--log-level", "CRITICAL",
+                 "--out-dir", str(tmp_path / "single")]) == 0
+
+    header, *lines = (data_dir / "vote_results.csv").read_text(encoding="utf-8").splitlines(True)
+    shard_dirs = []
+    for i, chunk in enumerate((lines[:500], lines[500:])):
+        shard_dir = tmp_path / f"node-{i}"
+        shard_dir.mkdir()
+        for name in ("legislators.csv", "votes.csv", "bills.csv"):
+            shutil.copy(data_dir / name, shard_dir / name)
+        (shard_dir / "vote_results.csv").write_text(header + "".join(chunk), encoding="utf-8")
+        shard_dirs.append(shard_dir)
+
+    procs = [
+        _map(d, tmp_path / f"shard-{i}.bin", "--shard-index", str(i))
+        for i, d in enumerate(shard_dirs)
+    ]
+    assert [p.wait(timeout=60) for p in procs] == [0, 0]
+
+    assert main([
+        "--data-dir", str(data_dir), "--log-level", "CRITICAL",
+        "--out-dir", str(tmp_path / "merged"),
+        "--merge-partials", str(tmp_path / "shard-1.bin"), str(tmp_path / "shard-0.bin"),
+    ]) == 0
+    assert _reports(tmp_path / "merged") == _reports(tmp_path / "single")
+
+
+@pytest.mark.integration
+def test_overlapping_partials_are_rejected(tmp_path: Path) -> None:
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    _write_dataset(data_dir)
+    base = ["--data-dir", str(data_dir), "--log-level", "CRITICAL"]
+    assert main([*base, "--map-partial", str(tmp_path / "a.bin"), "--byte-range", "0:2000"]) == 0
+    assert main([*base, "--map-partial", str(tmp_path / "b.bin"), "--byte-range", "1000:"]) == 0
+
+    with pytest.raises(SystemExit, match="overlap"):
+        main([*base, "--out-dir", str(tmp_path / "out"),
+              "--merge-partials", str(tmp_path / "a.bin"), str(tmp_path / "b.bin")])
+
+
+@pytest.mark.integration
+def test_map_partial_rejects_profile(tmp_path: Path) -> None:
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    _write_dataset(data_dir)
+
+    with pytest.raises(SystemExit, match="--map-partial cannot be combined .* --profile"):
+        main(["--data-dir", str(data_dir), "--map-partial", str(tmp_path / "p.bin"), "--profile"])
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize(
+    ("ranges", "missing"),
+    [(["0:1000", "2000:"], r"\[1000, 2000\)"), (["0:1000", "1000:2000"], r"\[2000, \d+\)")],
+)
+def test_missing_byte_range_partials_are_rejected(
+    tmp_path: Path, ranges: list[str], missing: str
+) -> None:
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    _write_dataset(data_dir)
+    base = ["--data-dir", str(data_dir), "--log-level", "CRITICAL"]
+    partials = [str(tmp_path / f"p{i}.bin") for i in range(len(ranges))]
+    for partial, byte_range in zip(partials, ranges, strict=True):
+        assert main([*base, "--map-partial", partial, "--byte-range", byte_range]) == 0
+
+    with pytest.raises(SystemExit, match=f"Missing partial for bytes {missing}"):
+        main([*base, "--out-dir", str(tmp_path / "out"), "--merge-partials", *partials])
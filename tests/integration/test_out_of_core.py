@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import random
+from pathlib import Path
+
+import pytest
+
+from legislative_analytics.application import out_of_core
+from legislative_analytics.application.main import main
+from legislative_analytics.application.out_of_core import parse_size, plan_partitions
+from legislative_analytics.repositories.csv_repositories import (
+    CsvLegislatorRepository,
+    CsvVoteRepository,
+    CsvVoteResultRepository,
+)
+from legislative_analytics.repositories.validating_vote_results import (
+    IngestionAborted,
+    IngestionLimits,
+    ValidatingVoteResultRepository,
+)
+from legislative_analytics.repositories.validation_rules import (
+    UniqueVoteResultIdRule,
+    ordered_rules,
+)
+
+
+def _write_messy_dataset(d: Path, *, seed: int = 7) -> None:
+    rnd = random.Random(seed)
+    (d / "legislators.csv").write_text(
+        "id,name\n" + "".join(f"{i},Legislator {i}\n" for i in range(1, 31)), encoding="utf-8"
+    )
+    (d / "bills.csv").write_text(
+        "id,title,sponsor_id\n"
+        + "".join(f"{i},\"Bill {i}, amended\",{rnd.choice(['', '5', '999', str(i % 30 + 1)])}\n"
+                  for i in range(1, 41)),
+        encoding="utf-8",
+    )
+    # Two votes per bill so double votes can span vote_ids (and join partitions).
+    (d / "votes.csv").write_text(
+        "id,bill_id\n" + "".join(f"{v},{v // 2}\n" for v in range(2, 70)), encoding="utf-8"
+    )
+    (d / "vote_results.csv").write_text(
+        "id,legislator_id,vote_id,vote_type\n"
+        + "".join(
+            f"{i},{rnd.randint(1, 33)},{rnd.randint(2, 75)},{rnd.choice([0, 1, 2])}\n"
+            for i in range(1, 801)
+        ),
+        encoding="utf-8",
+    )
+
+
+@pytest.mark.integration
+def test_memory_limited_run_matches_in_memory_run(tmp_path: Path) -> None:
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    _write_messy_dataset(data_dir)
+    assert plan_partitions(data_dir / "vote_results.csv", parse_size("4K")) > 1
+
+    in_memory = tmp_path / "in_memory"
+    bounded = tmp_path / "bounded"
+    base = ["--data-dir", str(data_dir), "--log-level", "CRITICAL"]
+    assert main([*base, "--out-dir", str(in_memory)]) == 0
+    bounded_args = ["--memory-limit", "4K", "--tmp-dir", str(tmp_path)]
+    assert main([*base, "--out-dir", str(bounded), *bounded_args]) == 0
+
+    for name in ("legislators_support_oppose.csv", "bills_support_oppose.csv"):
+        expected = (in_memory / name).read_text(encoding="utf-8")
+        assert (bounded / name).read_text(encoding="utf-8") == expected
+    # Partition files are cleaned up.
+    assert not list(tmp_path.glob("legislative-ooc-*"))
+
+
+@pytest.mark.integration
+def test_partitions_beyond_the_open_file_bound_use_extra_passes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    _write_messy_dataset(data_dir)
+    # More partitions than MAX_OPEN_FILES ** 2: two spill levels and two merge passes.
+    monkeypatch.setattr(out_of_core, "MAX_OPEN_FILES", 3)
+    assert plan_partitions(data_dir / "vote_results.csv", parse_size("4K")) > 9
+
+    base = ["--data-dir", str(data_dir), "--log-level", "CRITICAL"]
+    assert main([*base, "--out-dir", str(tmp_path / "in_memory")]) == 0
+    assert main([*base, "--out-dir", str(tmp_path / "bounded"), "--memory-limit", "4K"]) == 0
+
+    for name in ("legislators_support_oppose.csv", "bills_support_oppose.csv"):
+        expected = (tmp_path / "in_memory" / name).read_text(encoding="utf-8")
+        assert (tmp_path / "bounded" / name).read_text(encoding="utf-8") == expected
+
+
+def _run_partitioned(data_dir: Path, limits: IngestionLimits) -> None:
+    out_of_core.run_partitioned(
+        legislators_csv=data_dir / "legislators.csv",
+        bills_csv=data_dir / "bills.csv",
+        votes_csv=data_dir / "votes.csv",
+        vote_results_csv=data_dir / "vote_results.csv",
+        partitions=8,
+        limits=limits,
+        write_legislators=lambda rows: None,
+        write_bills=lambda rows: None,
+    )
+
+
+@pytest.mark.integration
+def test_circuit_breakers_count_rejects_across_partitions(tmp_path: Path) -> None:
+    _write_messy_dataset(tmp_path)
+    validated = ValidatingVoteResultRepository(
+        inner=CsvVoteResultRepository(tmp_path / "vote_results.csv"),
+        legislators=CsvLegislatorRepository(tmp_path / "legislators.csv"),
+        votes=CsvVoteRepository(tmp_path / "votes.csv"),
+    )
+    accepted = sum(1 for _ in validated.iter_vote_results())
+    _run_partitioned(tmp_path, IngestionLimits(max_rejects=800 - accepted))
+
+    # One more reject than allowed overall: no single partition gets near the limit.
+    with pytest.raises(IngestionAborted, match="rejected rows exceeded") as excinfo:
+        _run_partitioned(tmp_path, IngestionLimits(max_rejects=800 - accepted - 1))
+    assert excinfo.value.summary.processed == 800
+
+
+@pytest.mark.integration
+def test_per_row_rules_trip_the_breakers_while_scattering(tmp_path: Path) -> None:
+    _write_messy_dataset(tmp_path)
+
+    with pytest.raises(IngestionAborted) as excinfo:
+        _run_partitioned(tmp_path, IngestionLimits(max_rejects=0))
+    summary = excinfo.value.summary
+    assert summary.rejected_by_reason == {"unknown_legislator": 1}
+    assert summary.processed < 800
+
+
+def test_partition_count_is_not_capped(tmp_path: Path) -> None:
+    vote_results = tmp_path / "vote_results.csv"
+    vote_results.write_bytes(b"x" * 1_000_000)
+
+    assert plan_partitions(vote_results, 1024) == 1_000_000 * 8 // 1024 + 1
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("1048576", 1048576),
+        ("512M", 512 * 1024**2),
+        ("2g", 2 * 1024**3),
+        ("1.5GiB", 3 * 1024**3 // 2),
+    ],
+)
+def test_parse_size(value: str, expected: int) -> None:
+    assert parse_size(value) == expected
+
+
+@pytest.mark.integration
+def test_duplicate_id_rule_is_rejected_under_memory_limit(tmp_path: Path) -> None:
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    _write_messy_dataset(data_dir)
+
+    with pytest.raises(SystemExit) as excinfo:
+        main(
+            [
+                "--data-dir", str(data_dir),
+                "--out-dir", str(tmp_path / "out"),
+                "--memory-limit", "4K",
+                "--reject-duplicate-ids",
+            ]
+        )
+    assert "--reject-duplicate-ids cannot be combined with --memory-limit" in str(excinfo.value)
+
+    with pytest.raises(ValueError, match="across bill partitions"):
+        out_of_core.run_partitioned(
+            legislators_csv=data_dir / "legislators.csv",
+            bills_csv=data_dir / "bills.csv",
+            votes_csv=data_dir / "votes.csv",
+            vote_results_csv=data_dir / "vote_results.csv",
+            partitions=2,
+            limits=IngestionLimits(),
+            rules=ordered_rules([UniqueVoteResultIdRule()]),
+            write_legislators=lambda rows: None,
+            write_bills=lambda rows: None,
+        )
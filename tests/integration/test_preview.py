@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import csv
+import gzip
+import random
+from pathlib import Path
+
+import pytest
+
+from legislative_analytics.application.main import main
+from legislative_analytics.repositories.csv_repositories import CsvVoteResultRepository
+from legislative_analytics.repositories.sampled_vote_results import (
+    BlockSampledVoteResultRepository,
+    block_count,
+    sample_blocks,
+)
+
+
+def _write_dataset(d: Path) -> None:
+    rnd = random.Random(11)
+    (d / "legislators.csv").write_text(
+        "id,name\n" + "".join(f"{i},L{i}\n" for i in range(1, 11)), encoding="utf-8"
+    )
+    (d / "bills.csv").write_text(
+        "id,title,sponsor_id\n" + "".join(f"{i},B{i},{i}\n" for i in range(1, 6)),
+        encoding="utf-8",
+    )
+    (d / "votes.csv").write_text(
+        "id,bill_id\n" + "".join(f"{v},{v}\n" for v in range(1, 6)), encoding="utf-8"
+    )
+    # One vote per (legislator, bill), plus rows with unknown legislators (11, 12).
+    pairs = [(leg, bill) for leg in range(1, 13) for bill in range(1, 6)]
+    rnd.shuffle(pairs)
+    (d / "vote_results.csv").write_text(
+        "id,legislator_id,vote_id,vote_type\n"
+        + "".join(
+            f"{i},{leg},{bill},{rnd.choice([1, 2])}\n" for i, (leg, bill) in enumerate(pairs, 1)
+        ),
+        encoding="utf-8",
+    )
+
+
+def _read(path: Path) -> list[dict[str, str]]:
+    with path.open(encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+@pytest.mark.integration
+def test_blocks_partition_the_file_lines(tmp_path: Path) -> None:
+    _write_dataset(tmp_path)
+    path = tmp_path / "vote_results.csv"
+    total = block_count(path.stat().st_size, 37)
+
+    every_block = BlockSampledVoteResultRepository(path, [b * 37 for b in range(total)], 37)
+
+    assert list(every_block.iter_vote_results()) == list(
+        CsvVoteResultRepository(path).iter_vote_results()
+    )
+
+    starts, population = sample_blocks(path, block_size=37, fraction=0.25, seed=5)
+    assert population == total
+    assert len(starts) == -(-total // 4)
+    assert starts == sorted(set(starts))
+
+
+@pytest.mark.integration
+def test_preview_of_every_block_is_exact(tmp_path: Path) -> None:
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    _write_dataset(data_dir)
+    out_dir = tmp_path / "out"
+    base = ["--data-dir", str(data_dir), "--out-dir", str(out_dir), "--log-level", "CRITICAL"]
+
+    assert main(base) == 0
+    assert main([*base, "--preview", "1", "--preview-block-size", "64"]) == 0
+
+    exact = _read(out_dir / "legislators_support_oppose.csv")
+    preview = _read(out_dir / "legislators_support_oppose.preview.csv")
+    assert [(r["id"], float(r["num_supported_bills"])) for r in exact] == [
+        (r["id"], float(r["num_supported_bills_low"])) for r in preview
+    ]
+    assert [r["num_opposed_bills"] for r in preview] == [
+        r["num_opposed_bills_high"] for r in preview
+    ]
+
+    summary = {r["metric"]: r for r in _read(out_dir / "preview_summary.csv")}
+    assert float(summary["vote_results"]["estimate"]) == 60
+    assert float(summary["rejection_rate"]["estimate"]) == pytest.approx(10 / 60, abs=1e-4)
+
+
+@pytest.mark.integration
+def test_preview_sample_reports_intervals(tmp_path: Path) -> None:
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    _write_dataset(data_dir)
+    out_dir = tmp_path / "out"
+
+    assert main([
+        "--data-dir", str(data_dir), "--out-dir", str(out_dir), "--log-level", "CRITICAL",
+        "--preview", "0.3", "--preview-block-size", "64", "--preview-seed", "2",
+    ]) == 0
+
+    for row in _read(out_dir / "bills_support_oppose.preview.csv"):
+        assert float(row["supporter_count_low"]) <= float(row["supporter_count"]) <= float(
+            row["supporter_count_high"]
+        )
+
+
+@pytest.mark.integration
+def test_preview_rejects_compressed_input(tmp_path: Path) -> None:
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    _write_dataset(data_dir)
+    raw = (data_dir / "vote_results.csv").read_bytes()
+    (data_dir / "vote_results.csv").unlink()
+    (data_dir / "vote_results.csv.gz").write_bytes(gzip.compress(raw))
+
+    with pytest.raises(SystemExit, match="seekable"):
+        main(["--data-dir", str(data_dir), "--preview", "0.5"])
+
+
+@pytest.mark.integration
+def test_preview_rejects_profile(tmp_path: Path) -> None:
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    _write_dataset(data_dir)
+
+    with pytest.raises(SystemExit, match="--preview cannot be combined .* --profile"):
+        main(["--data-dir", str(data_dir), "--preview", "0.5", "--profile"])
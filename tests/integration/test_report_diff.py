@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from legislative_analytics.application.main import main
+from legislative_analytics.repositories.report_state import (
+    ReportStateWriter,
+    iter_report_state,
+)
+from legislative_analytics.services.report_diff import RowChange, StreamingDiff
+
+
+def test_streaming_diff_classifies_rows() -> None:
+    diff = StreamingDiff([(1, 11), (2, 22), (4, 44)])
+
+    changes = [*diff.push(2, 22), *diff.push(3, 33), *diff.push(4, 40), *diff.finish()]
+
+    assert changes == [
+        RowChange("removed", 1),
+        RowChange("added", 3),
+        RowChange("changed", 4),
+    ]
+    with pytest.raises(ValueError):
+        diff.push(4, 0)
+
+
+@pytest.mark.integration
+def test_report_state_round_trip_and_missing_file(tmp_path: Path) -> None:
+    path = tmp_path / "state.bin"
+    with ReportStateWriter(path) as w:
+        w.begin_section("legislators")
+        w.add(1, 2**64 - 1)
+        w.add(5, 7)
+        w.begin_section("bills")
+        w.add(10, 3)
+
+    assert list(iter_report_state(path, "legislators")) == [(1, 2**64 - 1), (5, 7)]
+    assert list(iter_report_state(path, "bills")) == [(10, 3)]
+    assert list(iter_report_state(path, "other")) == []
+    assert list(iter_report_state(tmp_path / "missing.bin", "bills")) == []
+
+
+@pytest.mark.integration
+def test_diff_state_emits_only_changed_rows(tmp_path: Path) -> None:
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (data_dir / "legislators.csv").write_text("id,name\n1,A\n2,B\n", encoding="utf-8")
+    (data_dir / "bills.csv").write_text("id,title,sponsor_id\n10,T1,1\n20,T2,2\n", encoding="utf-8")
+    (data_dir / "votes.csv").write_text("id,bill_id\n100,10\n200,20\n", encoding="utf-8")
+    (data_dir / "vote_results.csv").write_text(
+        "id,legislator_id,vote_id,vote_type\n1,1,100,1\n2,2,200,2\n", encoding="utf-8"
+    )
+
+    out_dir = tmp_path / "out"
+    state = tmp_path / "state" / "reports.state"
+    argv = ["--data-dir", str(data_dir), "--out-dir", str(out_dir), "--diff-state", str(state),
+            "--log-level", "ERROR"]
+
+    assert main(argv) == 0
+    first_delta = (out_dir / "bills_support_oppose.delta.csv").read_text(encoding="utf-8")
+    assert first_delta.splitlines()[1:] == ["added,10,T1,1,0,A", "added,20,T2,0,1,B"]
+
+    # Legislator 2 disappears, bill 20 gains a supporter, bill 30 is new.
+    (data_dir / "legislators.csv").write_text("id,name\n1,A\n", encoding="utf-8")
+    (data_dir / "bills.csv").write_text(
+        "id,title,sponsor_id\n10,T1,1\n20,T2,2\n30,T3,1\n", encoding="utf-8"
+    )
+    (data_dir / "vote_results.csv").write_text(
+        "id,legislator_id,vote_id,vote_type\n1,1,100,1\n3,1,200,1\n", encoding="utf-8"
+    )
+    assert main(argv) == 0
+
+    legislator_delta = (out_dir / "legislators_support_oppose.delta.csv").read_text("utf-8")
+    bill_delta = (out_dir / "bills_support_oppose.delta.csv").read_text(encoding="utf-8")
+    assert legislator_delta.splitlines()[1:] == ["changed,1,A,2,0", "removed,2,,,"]
+    assert bill_delta.splitlines()[1:] == ["changed,20,T2,1,0,Unknown", "added,30,T3,0,0,A"]
+    # Full reports are still written.
+    assert (out_dir / "bills_support_oppose.csv").read_text(encoding="utf-8").count("\n") == 4
+
+    # Re-running on unchanged input yields empty deltas.
+    assert main(argv) == 0
+    assert (out_dir / "bills_support_oppose.delta.csv").read_text(encoding="utf-8").count("\n") == 1
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import csv
+import random
+from pathlib import Path
+
+import pytest
+
+from legislative_analytics.application.main import main
+from legislative_analytics.domain.entities import VoteResult
+from legislative_analytics.repositories import vote_index
+from legislative_analytics.repositories.vote_index import (
+    IndexedVote,
+    VoteIndex,
+    VoteIndexError,
+    build_vote_index,
+)
+
+
+@pytest.mark.integration
+def test_index_round_trip_point_lookups_and_counts(tmp_path: Path) -> None:
+    path = tmp_path / "votes.idx"
+    build_vote_index(
+        path,
+        vote_results=[
+            VoteResult(id=1, legislator_id=7, vote_id=100, vote_type=1),
+            VoteResult(id=2, legislator_id=3, vote_id=100, vote_type=2),
+            VoteResult(id=3, legislator_id=7, vote_id=200, vote_type=2),
+            VoteResult(id=4, legislator_id=7, vote_id=999, vote_type=1),  # no bill
+        ],
+        vote_to_bill={100: 10, 200: 20},
+    )
+
+    with VoteIndex(path) as index:
+        assert list(index.legislators.keys) == [3, 7]
+        assert index.legislators.lookup(7) == [
+            IndexedVote(vote_id=100, vote_type=1, peer_id=10),
+            IndexedVote(vote_id=200, vote_type=2, peer_id=20),
+            IndexedVote(vote_id=999, vote_type=1, peer_id=-1),
+        ]
+        assert index.legislators.count(7) == 3
+        assert index.legislators.support_oppose(7) == (2, 1)
+        assert index.legislators.count(5) == 0
+        assert index.legislators.lookup(5) == []
+
+        assert list(index.bills.keys) == [10, 20]
+        assert index.bills.lookup(10) == [
+            IndexedVote(vote_id=100, vote_type=1, peer_id=7),
+            IndexedVote(vote_id=100, vote_type=2, peer_id=3),
+        ]
+        assert index.bills.count_by_type(20, 2) == 1
+
+
+@pytest.mark.integration
+def test_spilled_runs_and_merge_passes_build_the_same_index(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    rnd = random.Random(5)
+    rows = [
+        VoteResult(id=i, legislator_id=rnd.randint(1, 9), vote_id=rnd.randint(1, 12), vote_type=1)
+        for i in range(200)
+    ]
+    vote_to_bill = {v: v % 5 for v in range(1, 11)}
+    build_vote_index(tmp_path / "memory.idx", vote_results=rows, vote_to_bill=vote_to_bill)
+    monkeypatch.setattr(vote_index, "MAX_OPEN_RUNS", 3)
+    build_vote_index(
+        tmp_path / "spilled.idx", vote_results=rows, vote_to_bill=vote_to_bill, run_rows=7
+    )
+
+    assert (tmp_path / "spilled.idx").read_bytes() == (tmp_path / "memory.idx").read_bytes()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["memory.idx", "spilled.idx"]
+
+
+@pytest.mark.integration
+def test_bills_missing_from_bills_csv_are_only_indexed_by_legislator(tmp_path: Path) -> None:
+    path = tmp_path / "votes.idx"
+    build_vote_index(
+        path,
+        vote_results=[
+            VoteResult(id=1, legislator_id=7, vote_id=100, vote_type=1),
+            VoteResult(id=2, legislator_id=7, vote_id=200, vote_type=2),
+        ],
+        vote_to_bill={100: 10, 200: 20},
+        bill_ids={10},
+    )
+
+    with VoteIndex(path) as index:
+        assert list(index.bills.keys) == [10]
+        assert [v.peer_id for v in index.legislators.lookup(7)] == [10, 20]
+
+
+@pytest.mark.integration
+def test_truncated_index_is_rejected(tmp_path: Path) -> None:
+    path = tmp_path / "votes.idx"
+    build_vote_index(
+        path,
+        vote_results=[VoteResult(id=1, legislator_id=1, vote_id=100, vote_type=1)],
+        vote_to_bill={100: 10},
+    )
+    path.write_bytes(path.read_bytes()[:-8])
+
+    with pytest.raises(VoteIndexError):
+        VoteIndex(path)
+
+
+def _write_dataset(d: Path) -> None:
+    rnd = random.Random(3)
+    (d / "legislators.csv").write_text(
+        "id,name\n" + "".join(f"{i},L{i}\n" for i in range(1, 21)), encoding="utf-8"
+    )
+    (d / "bills.csv").write_text(
+        "id,title,sponsor_id\n" + "".join(f"{i},B{i},{i % 20 + 1}\n" for i in range(1, 16)),
+        encoding="utf-8",
+    )
+    (d / "votes.csv").write_text(
+        # Votes 32 and 33 are on bill 16, which is missing from bills.csv.
+        "id,bill_id\n" + "".join(f"{v},{v // 2}\n" for v in range(2, 34)),
+        encoding="utf-8",
+    )
+    # Unknown legislators/votes, double votes and out-of-range types get rejected.
+    (d / "vote_results.csv").write_text(
+        "id,legislator_id,vote_id,vote_type\n"
+        + "".join(
+            f"{i},{rnd.randint(1, 22)},{rnd.randint(2, 34)},{rnd.choice([0, 1, 2])}\n"
+            for i in range(1, 401)
+        ),
+        encoding="utf-8",
+    )
+
+
+@pytest.mark.integration
+def test_build_index_cli_matches_reports(tmp_path: Path) -> None:
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    _write_dataset(data_dir)
+    out_dir = tmp_path / "out"
+    index_path = tmp_path / "votes.idx"
+
+    base = ["--data-dir", str(data_dir), "--log-level", "CRITICAL"]
+    assert main([*base, "--out-dir", str(out_dir)]) == 0
+    assert main([*base, "--build-index", str(index_path)]) == 0
+
+    with (out_dir / "legislators_support_oppose.csv").open(encoding="utf-8") as f:
+        legislators = list(csv.DictReader(f))
+    with (out_dir / "bills_support_oppose.csv").open(encoding="utf-8") as f:
+        bills = list(csv.DictReader(f))
+
+    with VoteIndex(index_path) as index:
+        assert index.is_current(data_dir / "vote_results.csv")
+        assert 16 not in list(index.bills.keys)
+        for row in legislators:
+            assert index.legislators.support_oppose(int(row["id"])) == (
+                int(row["num_supported_bills"]),
+                int(row["num_opposed_bills"]),
+            )
+        for row in bills:
+            assert index.bills.support_oppose(int(row["id"])) == (
+                int(row["supporter_count"]),
+                int(row["opposer_count"]),
+            )
+
+
+@pytest.mark.integration
+def test_build_index_rejects_profile(tmp_path: Path) -> None:
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    _write_dataset(data_dir)
+
+    with pytest.raises(SystemExit, match="--profile"):
+        main(["--data-dir", str(data_dir), "--build-index", str(tmp_path / "i"), "--profile"])
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import pytest
+
+from legislative_analytics.domain.entities import VoteResult
+from legislative_analytics.services.aggregation import (
+    Count,
+    GroupBySpec,
+    JoinContext,
+    run_group_by,
+)
+
+_CTX = JoinContext(
+    legislator_ids=frozenset({1, 2, 3}),
+    vote_to_bill={100: 10, 101: 20, 102: 30},
+    bill_ids=frozenset({10, 20, 30}),
+    sponsor_by_bill={10: 1, 20: None, 30: 2},
+)
+
+_VOTE_RESULTS = [
+    VoteResult(id=1, legislator_id=1, vote_id=100, vote_type=1),
+    VoteResult(id=2, legislator_id=2, vote_id=100, vote_type=2),
+    VoteResult(id=3, legislator_id=2, vote_id=101, vote_type=1),
+    VoteResult(id=4, legislator_id=2, vote_id=102, vote_type=3),  # abstention
+    VoteResult(id=5, legislator_id=9, vote_id=102, vote_type=1),  # unknown legislator
+    VoteResult(id=6, legislator_id=1, vote_id=999, vote_type=1),  # unknown vote
+]
+
+
+def test_many_specs_share_one_scan() -> None:
+    consumed = 0
+
+    def counting_stream():
+        nonlocal consumed
+        for vr in _VOTE_RESULTS:
+            consumed += 1
+            yield vr
+
+    specs = [
+        GroupBySpec(
+            "by_legislator", ("legislator_id",), (Count("support", {1}), Count("oppose", {2}))
+        ),
+        GroupBySpec("by_sponsor", ("sponsor_id",), (Count("support", {1}), Count("all"))),
+        GroupBySpec("by_vote_type", ("vote_type",), (Count("votes"),)),
+        GroupBySpec("own_bill", ("legislator_id", "own_bill"), (Count("support", {1}),)),
+    ]
+    results = run_group_by(specs, vote_results=counting_stream(), ctx=_CTX)
+
+    assert consumed == len(_VOTE_RESULTS)
+    # Seeded: legislator 3 has no votes but is present; unknown legislator 9 is ignored.
+    # Like the legislator report, this spec does not need the vote to resolve to a bill.
+    assert list(results["by_legislator"].rows()) == [(1, (2, 0)), (2, (1, 1)), (3, (0, 0))]
+    # Missing sponsor groups under None, ordered first; unknown vote_id rows are skipped.
+    assert list(results["by_sponsor"].rows()) == [(None, (1, 1)), (1, (1, 2)), (2, (1, 2))]
+    assert list(results["by_vote_type"].rows()) == [(1, (4,)), (2, (1,)), (3, (1,))]
+    assert list(results["own_bill"].rows()) == [
+        ((1, True), (1,)),
+        ((2, False), (1,)),
+        ((2, True), (0,)),
+    ]
+
+
+def test_sponsor_dimensions_skip_bills_missing_from_bills_csv() -> None:
+    ctx = JoinContext(
+        legislator_ids=frozenset({1, 2}),
+        vote_to_bill={100: 10, 103: 40},  # bill 40 is not in bills.csv
+        bill_ids=frozenset({10}),
+        sponsor_by_bill={10: 1},
+    )
+    rows = [
+        VoteResult(id=1, legislator_id=1, vote_id=100, vote_type=1),
+        VoteResult(id=2, legislator_id=2, vote_id=103, vote_type=1),
+    ]
+    specs = [
+        GroupBySpec("by_sponsor", ("sponsor_id",), (Count("votes"),)),
+        GroupBySpec("own_bill", ("own_bill",), (Count("votes"),)),
+    ]
+    results = run_group_by(specs, vote_results=rows, ctx=ctx)
+
+    assert list(results["by_sponsor"].rows()) == [(1, (1,))]
+    assert list(results["own_bill"].rows()) == [(True, (1,))]
+
+
+def test_top_uses_dense_columns_and_breaks_ties_by_key() -> None:
+    spec = GroupBySpec("by_bill", ("bill_id",), (Count("support", {1}), Count("oppose", {2})))
+    result = run_group_by([spec], vote_results=_VOTE_RESULTS, ctx=_CTX)["by_bill"]
+
+    assert result.top(2, by="support") == [(10, (1, 1)), (20, (1, 0))]
+    assert result.top(1, by="oppose") == [(10, (1, 1))]
+    with pytest.raises(ValueError):
+        result.top(1, by="missing")
+
+
+def test_spec_validation() -> None:
+    with pytest.raises(ValueError):
+        GroupBySpec("bad", ("party",), (Count("n"),))
+    with pytest.raises(ValueError):
+        GroupBySpec("bad", ("bill_id",), ())
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 import pytest
 
 from legislative_analytics.domain.entities import Bill, Legislator, Vote, VoteResult
 from legislative_analytics.services.analytics_service import AnalyticsService
+from legislative_analytics.services.batch_queries import SubsetQuery
 
 
 @dataclass(frozen=True)
@@ -119,3 +120,169 @@ def test_bill_support_oppose_includes_no_vote_bills_and_unknown_sponsors() -> No
     ]
 
 
+@dataclass(frozen=True)
+class _ScanCountingVoteResultsRepo(_StubVoteResultsRepo):
+    scans: list[None] = field(default_factory=list)
+
+    def iter_vote_results(self):
+        self.scans.append(None)
+        return super().iter_vote_results()
+
+
+def _ranking_service(vote_results_repo=_StubVoteResultsRepo) -> AnalyticsService:
+    return AnalyticsService(
+        legislators=_StubLegislatorsRepo(
+            [Legislator(id=1, name="A"), Legislator(id=2, name="B"), Legislator(id=3, name="C")]
+        ),
+        bills=_StubBillsRepo(
+            [
+                Bill(id=10, title="T10", sponsor_id=1),
+                Bill(id=20, title="T20", sponsor_id=None),
+                Bill(id=30, title="T30", sponsor_id=3),
+            ]
+        ),
+        votes=_StubVotesRepo(
+            [Vote(id=100, bill_id=10), Vote(id=200, bill_id=20), Vote(id=300, bill_id=30)]
+        ),
+        vote_results=vote_results_repo(
+            [
+                VoteResult(id=1, legislator_id=1, vote_id=100, vote_type=2),
+                VoteResult(id=2, legislator_id=1, vote_id=200, vote_type=2),
+                VoteResult(id=3, legislator_id=2, vote_id=200, vote_type=1),
+                VoteResult(id=4, legislator_id=3, vote_id=200, vote_type=2),
+                VoteResult(id=5, legislator_id=3, vote_id=300, vote_type=1),
+            ]
+        ),
+    )
+
+
+def test_top_legislators_ranks_by_counter_and_breaks_ties_by_id() -> None:
+    service = _ranking_service()
+
+    rows = service.compute_top_legislators(2, by="oppose")
+    assert [(r.legislator_id, r.opposed_bills) for r in rows] == [(1, 2), (3, 1)]
+    # Legislators 2 and 3 both supported one bill: the smaller id wins the tie.
+    assert [r.legislator_id for r in service.compute_top_legislators(2, by="support")] == [2, 3]
+
+
+def test_top_bills_only_materializes_k_rows() -> None:
+    service = _ranking_service()
+
+    rows = service.compute_top_bills(1, by="oppose")
+    assert [(r.bill_id, r.sponsor_name, r.supporters, r.opposers) for r in rows] == [
+        (20, "Unknown", 1, 2),
+    ]
+    assert len(service.compute_top_bills(10)) == 3
+    assert service.compute_top_bills(0) == []
+
+
+def test_top_reports_rank_both_reports_from_one_scan() -> None:
+    scans: list[None] = []
+    service = _ranking_service(
+        vote_results_repo=lambda rows: _ScanCountingVoteResultsRepo(rows, scans)
+    )
+
+    legislators, bills = service.compute_top_reports(1, by="oppose")
+
+    assert len(scans) == 1
+    assert [r.legislator_id for r in legislators] == [1]
+    assert [r.bill_id for r in bills] == [20]
+
+
+def test_subset_reports_match_rows_of_the_full_reports() -> None:
+    service = AnalyticsService(
+        legislators=_StubLegislatorsRepo([Legislator(id=1, name="A"), Legislator(id=2, name="B")]),
+        bills=_StubBillsRepo(
+            [Bill(id=10, title="T10", sponsor_id=1), Bill(id=20, title="T20", sponsor_id=None)]
+        ),
+        votes=_StubVotesRepo([Vote(id=100, bill_id=10), Vote(id=200, bill_id=20)]),
+        vote_results=_StubVoteResultsRepo(
+            [
+                VoteResult(id=1, legislator_id=1, vote_id=100, vote_type=1),
+                VoteResult(id=2, legislator_id=2, vote_id=100, vote_type=2),
+                VoteResult(id=3, legislator_id=2, vote_id=200, vote_type=1),
+            ]
+        ),
+    )
+    legislators, bills = service.compute_support_oppose_reports()
+
+    reports = service.compute_subset_reports(
+        [SubsetQuery("q", legislator_ids=frozenset({2}), bill_ids=frozenset({20}))]
+    )
+
+    assert reports["q"].legislators == [legislators[1]]
+    assert reports["q"].bills == [bills[1]]
+    assert reports["q"].bills[0].sponsor_name == "Unknown"
+
+
+@dataclass(frozen=True)
+class _IterationCountingRepo:
+    """Stub for every dimension repository; records each full iteration by table."""
+
+    rows: dict[str, list[object]]
+    iterations: list[str] = field(default_factory=list)
+
+    def _iter(self, table: str):
+        self.iterations.append(table)
+        return iter(self.rows[table])
+
+    def iter_legislators(self):
+        return self._iter("legislators")
+
+    def iter_bills(self):
+        return self._iter("bills")
+
+    def iter_votes(self):
+        return self._iter("votes")
+
+
+def test_dimension_tables_are_read_once_per_service() -> None:
+    repo = _IterationCountingRepo(
+        {
+            "legislators": [Legislator(id=1, name="A"), Legislator(id=2, name="B")],
+            "bills": [Bill(id=10, title="T10", sponsor_id=1)],
+            "votes": [Vote(id=100, bill_id=10)],
+        }
+    )
+    service = AnalyticsService(
+        legislators=repo,
+        bills=repo,
+        votes=repo,
+        vote_results=_StubVoteResultsRepo(
+            [VoteResult(id=1, legislator_id=1, vote_id=100, vote_type=1)]
+        ),
+    )
+
+    service.compute_support_oppose_reports()
+    service.compute_top_reports(1)
+    legislators, bills = service.compute_support_oppose_reports()
+    assert [r.supported_bills for r in legislators] == [1, 0]
+    assert [r.sponsor_name for r in bills] == ["A"]
+
+    assert sorted(repo.iterations) == ["bills", "legislators", "votes"]
+
+
+def test_subset_reports_read_each_dimension_table_once_for_a_batch() -> None:
+    repo = _IterationCountingRepo(
+        {
+            "legislators": [Legislator(id=1, name="A"), Legislator(id=2, name="B")],
+            "bills": [Bill(id=10, title="T10", sponsor_id=2)],
+            "votes": [Vote(id=100, bill_id=10)],
+        }
+    )
+    service = AnalyticsService(
+        legislators=repo,
+        bills=repo,
+        votes=repo,
+        vote_results=_StubVoteResultsRepo(
+            [VoteResult(id=1, legislator_id=1, vote_id=100, vote_type=1)]
+        ),
+    )
+
+    reports = service.compute_subset_reports(
+        [SubsetQuery(f"q{i}", legislator_ids=frozenset({1})) for i in range(5)]
+    )
+
+    assert [r.legislator_name for r in reports["q4"].legislators] == ["A"]
+    assert [r.sponsor_name for r in reports["q4"].bills] == ["B"]
+    assert sorted(repo.iterations) == ["bills", "legislators", "votes"]
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import pytest
+
+from legislative_analytics.domain.entities import VoteResult
+from legislative_analytics.services.batch_queries import SubsetQuery, run_subset_queries
+
+_ROWS = [
+    VoteResult(id=1, legislator_id=1, vote_id=100, vote_type=1),
+    VoteResult(id=2, legislator_id=2, vote_id=100, vote_type=2),
+    VoteResult(id=3, legislator_id=1, vote_id=200, vote_type=2),
+    VoteResult(id=4, legislator_id=3, vote_id=200, vote_type=1),
+    VoteResult(id=5, legislator_id=999, vote_id=100, vote_type=1),  # unknown legislator
+    VoteResult(id=6, legislator_id=2, vote_id=300, vote_type=1),  # unknown vote
+]
+
+
+def _run(*queries: SubsetQuery):
+    return run_subset_queries(
+        queries,
+        vote_results=iter(_ROWS),
+        legislator_ids={1, 2, 3},
+        bill_ids={10, 20},
+        vote_to_bill={100: 10, 200: 20},
+    )
+
+
+def test_each_query_gets_only_its_entities_and_vote_types_from_one_pass() -> None:
+    results = _run(
+        SubsetQuery("everything"),
+        SubsetQuery("leg_1_and_3", legislator_ids=frozenset({1, 3, 42}), bill_ids=frozenset()),
+        SubsetQuery(
+            "bill_20_support",
+            legislator_ids=frozenset(),
+            bill_ids=frozenset({20}),
+            vote_types=frozenset({1}),
+        ),
+    )
+
+    assert results["everything"].legislators == [(1, (1, 1)), (2, (1, 1)), (3, (1, 0))]
+    # The bill side does not check the voter (same as the full report; the validator does).
+    assert results["everything"].bills == [(10, (2, 1)), (20, (1, 1))]
+
+    # Ids missing from legislators.csv (42) are dropped, like in the full report.
+    assert results["leg_1_and_3"].legislators == [(1, (1, 1)), (3, (1, 0))]
+    assert results["leg_1_and_3"].bills == []
+
+    assert results["bill_20_support"].legislators == []
+    assert results["bill_20_support"].bills == [(20, (1, 0))]
+
+
+def test_answers_match_independent_single_query_runs() -> None:
+    queries = [
+        SubsetQuery("a", legislator_ids=frozenset({2}), vote_types=frozenset({2})),
+        SubsetQuery("b", legislator_ids=frozenset({1, 2}), bill_ids=frozenset({10})),
+    ]
+    batched = _run(*queries)
+    for q in queries:
+        assert batched[q.name] == _run(q)[q.name]
+
+
+def test_duplicate_query_names_are_rejected() -> None:
+    with pytest.raises(ValueError, match="Duplicate"):
+        _run(SubsetQuery("x"), SubsetQuery("x"))
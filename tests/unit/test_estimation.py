@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import math
+
+import pytest
+
+from legislative_analytics.services.estimation import (
+    Moments,
+    estimate_ratio,
+    estimate_total,
+    z_score,
+)
+
+
+def test_total_scales_block_mean_and_brackets_it() -> None:
+    e = estimate_total(Moments.of([10, 12, 8, 10]), population=40, z=z_score(0.95))
+
+    assert e.value == pytest.approx(400)
+    assert e.low < 400 < e.high
+    # fpc = 0.9, s^2 = 8/3, n = 4
+    assert e.high - e.value == pytest.approx(
+        1.959964 * 40 * math.sqrt(0.9 * (8 / 3) / 4), rel=1e-5
+    )
+
+
+def test_full_census_is_exact_and_low_bound_is_clamped() -> None:
+    exact = estimate_total(Moments.of([3, 0, 5]), population=3, z=1.96)
+    assert (exact.value, exact.low, exact.high) == (8, 8, 8)
+
+    skewed = estimate_total(Moments.of([0, 0, 0, 30]), population=100, z=1.96)
+    assert skewed.low == 0.0
+
+
+def test_moments_of_sparse_samples_match_the_explicit_samples() -> None:
+    # An entity seen in 2 of 5 blocks: unseen blocks are 0 samples, which add nothing.
+    sparse = Moments(n=5, total=3 + 4, total_sq=3 * 3 + 4 * 4)
+
+    assert sparse == Moments.of([0, 3, 0, 4, 0])
+    assert estimate_total(sparse, population=50, z=1.96) == estimate_total(
+        Moments.of([0, 3, 0, 4, 0]), population=50, z=1.96
+    )
+
+
+def test_ratio_estimator_and_bounds() -> None:
+    e = estimate_ratio([1, 3, 2], [100, 100, 100], population=30, z=1.96)
+
+    assert e.value == pytest.approx(0.02)
+    assert 0 <= e.low < 0.02 < e.high <= 1
+    assert estimate_ratio([0], [0], population=5, z=1.96).value == 0.0
+
+
+def test_confidence_must_be_a_probability() -> None:
+    with pytest.raises(ValueError):
+        z_score(1.0)
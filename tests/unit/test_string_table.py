@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+import pytest
+
+from legislative_analytics.domain.entities import Bill, Legislator
+from legislative_analytics.repositories.lookups import encode_bills
+from legislative_analytics.repositories.string_table import EncodedStrings, StringTable
+from legislative_analytics.services.analytics_service import AnalyticsService, LegislatorVoteCount
+
+
+def test_string_table_round_trips_utf8_by_ordinal() -> None:
+    table = StringTable.from_strings(["Rep. Ana", "", "Sen. José Ñúñez"])
+
+    assert len(table) == 3
+    assert [table[i] for i in range(3)] == ["Rep. Ana", "", "Sen. José Ñúñez"]
+    with pytest.raises(IndexError):
+        table[3]
+
+
+def test_encoded_strings_behaves_like_the_dict_it_replaces() -> None:
+    items = [(30, "C"), (10, "A"), (20, "B"), (10, "A2")]
+
+    encoded = EncodedStrings.from_items(items)
+
+    assert encoded == dict(items)
+    assert list(encoded) == [10, 20, 30]
+    assert encoded.ordinal(20) == 1
+    assert 20 in encoded.keys() and 99 not in encoded
+    assert encoded.get(99, "Unknown") == "Unknown"
+    with pytest.raises(KeyError):
+        encoded[99]
+
+
+def test_encoded_strings_keep_ids_sorted_in_one_array() -> None:
+    in_order = EncodedStrings.from_items([(1, "A"), (5, "É"), (9, "C")])
+    shuffled = EncodedStrings.from_items([(9, "C"), (5, "x"), (1, "A"), (5, "É")])
+
+    assert list(shuffled) == list(in_order) == [1, 5, 9]
+    assert [shuffled.table[i] for i in range(len(shuffled))] == ["A", "É", "C"]
+    assert shuffled.nbytes == in_order.nbytes
+    assert 5 in shuffled and 6 not in shuffled and "5" not in shuffled
+    with pytest.raises(ValueError):
+        EncodedStrings([2, 1], StringTable.from_strings(["b", "a"]))
+
+
+def test_bill_maps_stream_titles_and_sponsors_from_one_pass() -> None:
+    bills = iter([Bill(id=2, title="B", sponsor_id=None), Bill(id=1, title="A", sponsor_id=7)])
+
+    titles, sponsors = encode_bills(bills)
+
+    assert titles == {1: "A", 2: "B"}
+    assert sponsors == {1: 7, 2: None}
+
+
+class _RecordingNames(Mapping[int, str]):
+    """Name map recording which names were decoded."""
+
+    def __init__(self, inner: EncodedStrings) -> None:
+        self.inner = inner
+        self.decoded: list[int] = []
+
+    def __getitem__(self, key: int) -> str:
+        self.decoded.append(key)
+        return self.inner[key]
+
+    def __iter__(self):
+        return iter(self.inner)
+
+    def __len__(self) -> int:
+        return len(self.inner)
+
+    def keys(self):
+        return self.inner.keys()
+
+
+@dataclass(frozen=True)
+class _LegislatorsWithLookup:
+    names: _RecordingNames
+
+    def iter_legislators(self):
+        return iter(Legislator(id=i, name=self.names.inner[i]) for i in self.names)
+
+    def legislator_name_by_id(self) -> Mapping[int, str]:
+        return self.names
+
+
+class _Empty:
+    def iter_bills(self):
+        return iter([])
+
+    def iter_votes(self):
+        return iter([])
+
+    def iter_vote_results(self):
+        return iter([])
+
+
+def test_report_rows_decode_names_only_when_a_row_is_read() -> None:
+    names = _RecordingNames(EncodedStrings.from_items([(1, "A"), (2, "B"), (3, "C")]))
+    service = AnalyticsService(
+        legislators=_LegislatorsWithLookup(names),
+        bills=_Empty(),
+        votes=_Empty(),
+        vote_results=_Empty(),
+    )
+
+    rows = service.compute_legislator_support_oppose()
+    assert len(rows) == 3
+    assert names.decoded == []
+
+    assert rows[1] == LegislatorVoteCount(2, "B", 0, 0)
+    assert names.decoded == [2]
@@ -6,7 +6,11 @@ from dataclasses import dataclass
 import pytest
 
 from legislative_analytics.domain.entities import Legislator, Vote, VoteResult
-from legislative_analytics.repositories.validating_vote_results import ValidatingVoteResultRepository
+from legislative_analytics.repositories.validating_vote_results import (
+    IngestionAborted,
+    IngestionLimits,
+    ValidatingVoteResultRepository,
+)
 
 
 @dataclass(frozen=True)
@@ -93,3 +97,105 @@ def test_validating_repo_double_vote_is_per_bill_not_per_vote_id(caplog) -> None
     assert any(rec.message == "ingestion.validation.fail.double_vote" for rec in caplog.records)
 
 
+
+
+def _rows_with_unknown_legislators(n_ok: int, n_bad: int) -> list[VoteResult]:
+    ok = [VoteResult(id=i, legislator_id=1, vote_id=100 + i, vote_type=1) for i in range(n_ok)]
+    bad = [
+        VoteResult(id=1000 + i, legislator_id=999, vote_id=100, vote_type=1) for i in range(n_bad)
+    ]
+    return ok + bad
+
+
+@pytest.mark.parametrize(
+    ("limits", "expected_processed"),
+    [
+        (IngestionLimits(max_rejects=2), 5 + 3),
+        (IngestionLimits(max_reject_ratio=0.5, warmup_rows=4), 5 + 6),
+    ],
+)
+def test_validating_repo_aborts_when_reject_limits_are_exceeded(
+    limits: IngestionLimits, expected_processed: int
+) -> None:
+    repo = ValidatingVoteResultRepository(
+        inner=_StubVoteResultsRepo(_rows_with_unknown_legislators(5, 100)),
+        legislators=_StubLegislatorsRepo([Legislator(id=1, name="A")]),
+        votes=_StubVotesRepo([Vote(id=100 + i, bill_id=10 + i) for i in range(5)]),
+        limits=limits,
+    )
+
+    with pytest.raises(IngestionAborted) as excinfo:
+        list(repo.iter_vote_results())
+
+    summary = excinfo.value.summary
+    assert summary.processed == expected_processed
+    assert summary.accepted == 5
+    assert summary.rejected_by_reason["unknown_legislator"] == summary.rejected
+
+
+def test_validating_repo_aborts_on_double_vote_limit_and_ignores_ratio_during_warmup() -> None:
+    repo = ValidatingVoteResultRepository(
+        inner=_StubVoteResultsRepo(
+            [VoteResult(id=i, legislator_id=1, vote_id=100, vote_type=1) for i in range(5)]
+        ),
+        legislators=_StubLegislatorsRepo([Legislator(id=1, name="A")]),
+        votes=_StubVotesRepo([Vote(id=100, bill_id=10)]),
+        limits=IngestionLimits(max_reject_ratio=0.1, warmup_rows=100, max_double_votes=2),
+    )
+
+    with pytest.raises(IngestionAborted) as excinfo:
+        list(repo.iter_vote_results())
+
+    assert excinfo.value.summary.rejected_by_reason["double_vote"] == 3
+    assert "double votes exceeded 2" in str(excinfo.value)
+
+
+def test_validating_repo_checks_the_ratio_when_warmup_ends_on_an_accepted_row() -> None:
+    # Every reject happens during warm-up; the clean rows after it must not hide them.
+    rows = _rows_with_unknown_legislators(1001, 999)
+    repo = ValidatingVoteResultRepository(
+        inner=_StubVoteResultsRepo(rows[1001:] + rows[:1001]),
+        legislators=_StubLegislatorsRepo([Legislator(id=1, name="A")]),
+        votes=_StubVotesRepo([Vote(id=100 + i, bill_id=10 + i) for i in range(1001)]),
+        limits=IngestionLimits(max_reject_ratio=0.4, warmup_rows=1000),
+    )
+
+    with pytest.raises(IngestionAborted, match="reject ratio") as excinfo:
+        list(repo.iter_vote_results())
+
+    assert excinfo.value.summary.processed == 1000
+    assert excinfo.value.summary.rejected == 999
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"max_rejects": -1},
+        {"warmup_rows": -1},
+        {"max_double_votes": -1},
+        {"max_reject_ratio": -0.1},
+        {"max_reject_ratio": 1.5},
+    ],
+)
+def test_ingestion_limits_reject_out_of_range_values(kwargs: dict[str, float]) -> None:
+    with pytest.raises(ValueError):
+        IngestionLimits(**kwargs)
+
+
+def test_interleaved_scans_of_one_repo_keep_their_own_dedupe_state() -> None:
+    repo = ValidatingVoteResultRepository(
+        inner=_StubVoteResultsRepo(
+            [VoteResult(id=i, legislator_id=1, vote_id=i, vote_type=1) for i in range(1, 10_001)]
+        ),
+        legislators=_StubLegislatorsRepo([Legislator(id=1, name="A")]),
+        votes=_StubVotesRepo([Vote(id=i, bill_id=i) for i in range(1, 10_001)]),
+    )
+
+    first = iter(repo.iter_vote_results())
+    second = iter(repo.iter_vote_results())
+    rows = {"first": 0, "second": 0}
+    for name, it in [("first", first), ("second", second)] * 10_000:
+        if next(it, None) is not None:
+            rows[name] += 1
+
+    assert rows == {"first": 10_000, "second": 10_000}
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from legislative_analytics.domain.entities import VoteResult
+from legislative_analytics.repositories.validation_rules import (
+    PositiveIdsRule,
+    RuleContext,
+    RuleEngine,
+    UniqueVoteResultIdRule,
+    VoteTypeRule,
+    ordered_rules,
+)
+
+_CTX = RuleContext(legislator_ids=frozenset({1, 2}), vote_to_bill={100: 10, 101: 10, 200: 20})
+
+
+def _reasons(engine: RuleEngine, rows: list[VoteResult]) -> list[str | None]:
+    out: list[str | None] = []
+    for _, reasons in engine.run(rows, _CTX):
+        out.extend(reasons)
+    return out
+
+
+def test_rules_apply_in_precedence_order_across_batches() -> None:
+    rows = [
+        VoteResult(id=1, legislator_id=1, vote_id=100, vote_type=1),  # ok
+        VoteResult(id=2, legislator_id=9, vote_id=999, vote_type=1),  # missing vote wins
+        VoteResult(id=3, legislator_id=9, vote_id=100, vote_type=1),  # unknown legislator
+        VoteResult(id=4, legislator_id=1, vote_id=101, vote_type=7),  # bad type, keeps (1, 10)
+        VoteResult(id=1, legislator_id=2, vote_id=200, vote_type=2),  # duplicate id
+        VoteResult(id=5, legislator_id=1, vote_id=101, vote_type=2),  # double vote, later batch
+        VoteResult(id=0, legislator_id=2, vote_id=100, vote_type=1),  # non-positive id
+        VoteResult(id=6, legislator_id=2, vote_id=200, vote_type=0),  # ok
+    ]
+    engine = RuleEngine(
+        ordered_rules([UniqueVoteResultIdRule(), VoteTypeRule({0, 1, 2}), PositiveIdsRule()]),
+        batch_size=3,
+    )
+
+    assert _reasons(engine, rows) == [
+        None,
+        "missing_vote_id",
+        "unknown_legislator",
+        "vote_type_out_of_range",
+        "duplicate_vote_result_id",
+        "double_vote",
+        "non_positive_id",
+        None,
+    ]
+    assert engine.rejected == {
+        "missing_vote_id": 1,
+        "unknown_legislator": 1,
+        "vote_type_out_of_range": 1,
+        "non_positive_id": 1,
+        "duplicate_vote_result_id": 1,
+        "double_vote": 1,
+    }
+
+
+def test_double_vote_keeps_first_occurrence_within_a_batch_and_state_resets_per_scan() -> None:
+    rows = [
+        VoteResult(id=1, legislator_id=1, vote_id=100, vote_type=1),
+        VoteResult(id=2, legislator_id=1, vote_id=101, vote_type=2),
+        VoteResult(id=3, legislator_id=2, vote_id=101, vote_type=2),
+    ]
+    engine = RuleEngine(ordered_rules([]))
+
+    assert _reasons(engine, rows) == [None, "double_vote", None]
+    assert _reasons(engine, rows) == [None, "double_vote", None]
+
+
+def test_dead_letter_file_receives_rejected_rows(tmp_path: Path) -> None:
+    dead_letter = tmp_path / "rejected" / "vote_results.csv"
+    rows = [
+        VoteResult(id=1, legislator_id=1, vote_id=100, vote_type=1),
+        VoteResult(id=2, legislator_id=9, vote_id=100, vote_type=1),
+        VoteResult(id=3, legislator_id=1, vote_id=100, vote_type=2),
+    ]
+
+    with RuleEngine(ordered_rules([]), batch_size=2, dead_letter=dead_letter) as engine:
+        _reasons(engine, rows)
+
+    assert dead_letter.read_text(encoding="utf-8").splitlines() == [
+        "id,legislator_id,vote_id,vote_type,rule",
+        "2,9,100,1,unknown_legislator",
+        "3,1,100,2,double_vote",
+    ]